@@ -3,11 +3,14 @@ import subprocess
 import sys
 import configparser
 from .project import Project
-from .extension_paths_loader import load_extensions_paths
+from .extension_paths_loader import load_extensions_paths, which_tool
+from .process_runner import report_artifacts, run_streaming
 import shutil
 from pathlib import Path
 import re
 import os
+import tempfile
+import uuid
 
 
 def log_warning(log_file, msg):
@@ -139,7 +142,7 @@ class CPA0000000:
         # 2) Fallback: PATH
         if not pyinstaller_path:
             log_info(log_file, "DEBUG: Searching PyInstaller in PATH")
-            pyinstaller_path = shutil.which("pyinstaller")
+            pyinstaller_path = which_tool("pyinstaller")
             if not pyinstaller_path:
                 log_warning(log_file, "PyInstaller not found in PATH.")
 
@@ -264,26 +267,114 @@ class CPA0000000:
         return commands
 
 
+    @staticmethod
+    def _make_job_dir(output_path: Path, name: str) -> Path:
+        """
+        Private Arbeitsordner eines PyInstaller-Laufs (work/, spec/, dist/, tmp/).
+        Liegt neben dem Ausgabeordner, damit die Übernahme per os.replace auf
+        demselben Laufwerk passiert.
+        """
+        jobs_root = output_path.parent / f".{output_path.name}.jobs"
+        jobs_root.mkdir(parents=True, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name or "job")[:40]
+        job_dir = Path(tempfile.mkdtemp(prefix=f"{safe}_{os.getpid()}_", dir=jobs_root))
+        for sub in ("work", "spec", "dist", "tmp"):
+            (job_dir / sub).mkdir()
+        return job_dir
+
+    @staticmethod
+    def isolate_command(commands: list, job_dir: Path) -> list:
+        """
+        Leitet --workpath/--specpath/--distpath in den Job-Ordner um.
+        Vom Benutzer in den Optionen gesetzte Pfade und ein --specpath aus
+        spec_file bleiben unverändert.
+        """
+        def has(opt):
+            return any(c == opt or c.startswith(opt + "=") for c in commands[1:])
+
+        isolated = [c for c in commands if not c.startswith("--distpath=")]
+        if not has("--workpath"):
+            isolated.append(f"--workpath={job_dir / 'work'}")
+        if not has("--specpath"):
+            isolated.append(f"--specpath={job_dir / 'spec'}")
+        isolated.append(f"--distpath={job_dir / 'dist'}")
+        return isolated
+
+    @staticmethod
+    def _promote(staged: Path, output_path: Path, log_file) -> list[Path]:
+        """
+        Übernimmt die fertigen Artefakte atomar in den Ausgabeordner. Ein bestehender
+        Zielordner wird erst beiseite gelegt und nach dem Tausch gelöscht, sodass
+        nie ein halb geschriebenes Ergebnis im Ausgabeordner liegt. Liefert die Ziele.
+        """
+        output_path.mkdir(parents=True, exist_ok=True)
+        promoted = []
+        for item in staged.iterdir():
+            target = output_path / item.name
+            old = None
+            if target.is_dir() and not target.is_symlink():
+                old = target.with_name(f".{target.name}.old-{uuid.uuid4().hex[:8]}")
+                os.replace(target, old)
+            try:
+                os.replace(item, target)
+            except OSError:
+                if old is not None:
+                    os.replace(old, target)
+                raise
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+            log_info(log_file, f"Promoted build artifact: {target}")
+            promoted.append(target)
+        return promoted
+
+    @staticmethod
+    def _promote_spec(spec_dir: Path, dest: Path, log_file) -> None:
+        """
+        Die generierte .spec landet wie ohne Job-Ordner im Arbeitsverzeichnis (PyInstaller-
+        Default für --specpath); Script, Icon, Hooks und Daten stehen darin mit absoluten Pfaden.
+        """
+        for spec in spec_dir.glob("*.spec"):
+            target = dest / spec.name
+            shutil.move(str(spec), str(target))
+            log_info(log_file, f"Spec file: {target}")
+
     @staticmethod
     def run_pyinstaller(project: Project, log_file) -> None:
         log_info(log_file, f"Running PyInstaller for {project.name or project.script}")
         commands = CPA0000000.build_command(project, log_file)
+        output_path = Path(project.output or "dist").resolve()
+        if any(c == "--distpath" or c.startswith("--distpath=") for c in (project.options or "").split()):
+            job_dir = None  # Benutzer steuert die Ausgabe selbst
+        else:
+            job_dir = CPA0000000._make_job_dir(output_path, project.name or Path(project.script or "").stem)
+            commands = CPA0000000.isolate_command(commands, job_dir)
         final_cmd = subprocess.list2cmdline(commands)
         log_info(log_file, f"PyInstaller command: {final_cmd}")
+        env = None
+        if job_dir is not None:
+            tmp = str(job_dir / "tmp")
+            env = dict(os.environ, TMP=tmp, TEMP=tmp, TMPDIR=tmp)
         try:
-            result = subprocess.run(
-                commands,
-                check=True,
-                text=True,
-                capture_output=True,
-                timeout=600,
-            )
-            log_info(log_file, f"PyInstaller stdout: {result.stdout}")
-            log_info(log_file, f"PyInstaller stderr: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            log_error(log_file, "PyInstaller timed out after 600 seconds")
+            result = run_streaming(commands, log_file, env=env, check=True, backend="pyinstaller")
+            log_info(log_file, f"PyInstaller finished: {result.line_count} output lines in {result.duration:.1f}s")
+            if job_dir is not None:
+                # genau die Ergebnisse dieses Jobs (dist/ teilen sich mehrere Projekte)
+                report_artifacts("pyinstaller", *CPA0000000._promote(job_dir / "dist", output_path, log_file))
+        except subprocess.TimeoutExpired as e:
+            log_error(log_file, f"PyInstaller timed out after {e.timeout:.0f} seconds")
             raise
         except subprocess.CalledProcessError as e:
             log_error(log_file, f"PyInstaller failed: {e}")
-            log_error(log_file, f"PyInstaller stderr: {e.stderr}")
+            log_error(log_file, f"PyInstaller stderr (tail): {e.stderr}")
             raise
+        finally:
+            if job_dir is not None:
+                try:
+                    CPA0000000._promote_spec(job_dir / "spec", Path.cwd(), log_file)  # auch nach Fehlern
+                except OSError as e:
+                    log_warning(log_file, f"Spec file could not be moved: {e}")
+                shutil.rmtree(job_dir, ignore_errors=True)
+                try:
+                    job_dir.parent.rmdir()  # nur wenn kein anderer Job mehr läuft
+                except OSError:
+                    pass
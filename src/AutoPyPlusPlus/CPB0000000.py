@@ -2,11 +2,13 @@ from __future__ import annotations
 import subprocess
 from pathlib import Path
 import sys
-import shutil
 import shlex
 import os
 
 from .project import Project
+from .extension_paths_loader import which_tool
+from .probecache import module_version, python_info
+from .process_runner import report_artifacts, run_streaming
 
 
 def log_warning(log_file, msg):
@@ -63,40 +65,38 @@ def _strip_pack_options(args: list[str]) -> list[str]:
     return out
 
 
+def _output_dir(opts: list[str], project: Project) -> Path:
+    """Ausgabeordner von 'pyarmor gen' (--output/-O, sonst dist)."""
+    for i, tok in enumerate(opts):
+        if tok in ("--output", "-O") and i + 1 < len(opts):
+            return Path(opts[i + 1].strip('"'))
+        if tok.startswith("--output="):
+            return Path(tok.split("=", 1)[1].strip('"'))
+    return Path(getattr(project, "pyarmor_dist_dir", "") or "dist")
+
+
 def _probe_python_and_pyarmor(pyexe: str, log_file) -> bool:
-    try:
-        p = subprocess.run(
-            [pyexe, "-c",
-             "import sys,platform; "
-             "print(platform.python_version()); "
-             "print(platform.architecture()[0]); "
-             "print(sys.executable)"],
-            capture_output=True, text=True, check=True
-        )
-        lines = [ln.strip() for ln in (p.stdout or "").splitlines() if ln.strip()]
-        if len(lines) >= 3:
-            log_info(log_file, f"Python probe → version={lines[0]}, arch={lines[1]}, exe={lines[2]}")
-        else:
-            log_info(log_file, f"Python probe raw output:\n{p.stdout}")
-    except Exception as e:
-        log_warning(log_file, f"Python probe failed for {pyexe}: {e}")
-
-    try:
-        p = subprocess.run([pyexe, "-m", "pyarmor.cli", "--version"],
-                           capture_output=True, text=True, check=True)
-        msg = (p.stdout or p.stderr or "").strip()
-        log_info(log_file, f"PyArmor --version (module) → {msg}")
+    # Ergebnisse kommen aus dem persistenten Probe-Cache, solange sich der Interpreter nicht ändert
+    info, cached = python_info(pyexe)
+    src = " (cached)" if cached else ""
+    if "version" in info:
+        log_info(log_file, f"Python probe{src} → version={info['version']}, arch={info['arch']}, exe={info['executable']}")
+    elif "raw" in info:
+        log_info(log_file, f"Python probe raw output:\n{info['raw']}")
+    else:
+        log_warning(log_file, f"Python probe failed for {pyexe}: {info.get('error')}")
+
+    result, cached = module_version(pyexe, "pyarmor.cli")
+    if result["ok"]:
+        src = " (cached)" if cached else ""
+        log_info(log_file, f"PyArmor --version (module){src} → {result['stdout'] or result['stderr']}")
         return True
-    except subprocess.CalledProcessError as e:
-        log_warning(log_file, "PyArmor is not available in this interpreter (python -m pyarmor.cli --version failed).")
-        if e.stdout:
-            log_warning(log_file, f"STDOUT:\n{e.stdout}")
-        if e.stderr:
-            log_warning(log_file, f"STDERR:\n{e.stderr}")
-        return False
-    except Exception as e:
-        log_warning(log_file, f"PyArmor module probe raised: {e}")
-        return False
+    log_warning(log_file, "PyArmor is not available in this interpreter (python -m pyarmor.cli --version failed).")
+    if result["stdout"]:
+        log_warning(log_file, f"STDOUT:\n{result['stdout']}")
+    if result["stderr"]:
+        log_warning(log_file, f"STDERR:\n{result['stderr']}")
+    return False
 
 
 class CPB0000000:
@@ -129,7 +129,7 @@ class CPB0000000:
         if not module_ok:
             pyarmor_path = getattr(project, "pyarmor_path", None)
             if not pyarmor_path:
-                pyarmor_path = shutil.which("pyarmor")
+                pyarmor_path = which_tool("pyarmor")
                 if pyarmor_path:
                     log_info(log_file, f"Found pyarmor in PATH: {pyarmor_path}")
             if not pyarmor_path:
@@ -171,15 +171,15 @@ class CPB0000000:
         log_info(log_file, f"Running PyArmor command: {' '.join(str(x) for x in cmd)}")
 
         try:
-            res = subprocess.run(cmd, capture_output=True, text=True)
+            res = run_streaming(cmd, log_file, backend="pyarmor")
             log_info(log_file, f"PyArmor return code: {res.returncode}")
-            if res.stdout:
-                log_info(log_file, f"STDOUT:\n{res.stdout}")
-            if res.stderr:
-                log_warning(log_file, f"STDERR:\n{res.stderr}")
 
             if res.returncode != 0:
                 raise subprocess.CalledProcessError(res.returncode, cmd, output=res.stdout, stderr=res.stderr)
+            # obfuskiertes Script + Runtime-Paket; der Ordner (dist) ist mit anderen Projekten geteilt
+            if project.script:
+                out_dir = _output_dir(sanitized_opts, project)
+                report_artifacts("pyarmor", out_dir / Path(project.script).name, *out_dir.glob("pyarmor_runtime_*"))
         except subprocess.CalledProcessError as e:
             log_error(log_file, f"PyArmor failed (returncode {e.returncode})")
             if e.output:
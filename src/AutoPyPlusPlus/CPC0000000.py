@@ -1,10 +1,12 @@
 import subprocess
 import sys
 from pathlib import Path
-import shutil
 import os
 
-from .extension_paths_loader import load_extensions_paths
+from .compilercache import nuitka_env
+from .extension_paths_loader import load_extensions_paths, which_tool
+from .probecache import module_version
+from .process_runner import report_artifacts, run_streaming
 
 def log_warning(log_file, msg):
     border = "-" * 50
@@ -31,7 +33,8 @@ class CPC0000000:
     """Kompilierklasse für Nuitka."""
 
     @staticmethod
-    def run_nuitka(project, log_file) -> None:
+    def build_command(project, log_file) -> tuple[list[str], str, bool]:
+        """Baut den Nuitka-Befehl. Rückgabe: (Befehl, Ausgabeordner, python_like)."""
         if not project.script:
             log_error(log_file, "Kein Skript angegeben.")
             raise ValueError("Kein Skript angegeben.")
@@ -55,7 +58,7 @@ class CPC0000000:
 
         # 3. Fallback: PATH
         if not nuitka_path:
-            nuitka_path = shutil.which("nuitka")
+            nuitka_path = which_tool("nuitka")
             if nuitka_path:
                 log_info(log_file, f"Found nuitka in PATH: {nuitka_path}")
 
@@ -132,6 +135,12 @@ class CPC0000000:
 
         # Letzter Parameter ist das Skript selbst
         nuitka_cmd.append(str(script_path))
+        return nuitka_cmd, output_dir, python_like
+
+    @staticmethod
+    def run_nuitka(project, log_file) -> None:
+        nuitka_cmd, output_dir, python_like = CPC0000000.build_command(project, log_file)
+        script_path = Path(project.script).resolve()
 
         # Logging
         log_info(log_file, "Nuitka-Befehl wird ausgeführt:")
@@ -140,34 +149,28 @@ class CPC0000000:
 
         if python_like:
             try:
-                check_cmd = list(nuitka_cmd[:2]) + ["-m", "nuitka", "--version"]
-                check = subprocess.run(
-                    check_cmd,
-                    capture_output=True,
-                    text=True
-                )
-                if "No module named nuitka" in check.stderr:
+                # python -m nuitka --version, pro Interpreter persistent gecacht
+                check, cached = module_version(nuitka_cmd[0], "nuitka")
+                if "No module named nuitka" in check["stderr"]:
                     log_error(log_file, f"Nuitka ist NICHT installiert in: {nuitka_cmd[0]}. Bitte dort zuerst `pip install nuitka` ausführen!")
                     raise RuntimeError(f"Nuitka fehlt in Interpreter: {nuitka_cmd[0]}")
+                if check["ok"]:
+                    log_info(log_file, f"Nuitka-Version{' (cached)' if cached else ''}: {check['version']}")
             except Exception as e:
                 log_error(log_file, f"Fehler beim Nuitka-Prüfaufruf: {e}")
                 raise
 
+        # Compiler-Cache: Nuitka steuert ccache selbst (NUITKA_CCACHE_BINARY / --disable-ccache)
+        env, cache_opts = nuitka_env(project, log_file)
+        if cache_opts:
+            nuitka_cmd = nuitka_cmd[:-1] + cache_opts + nuitka_cmd[-1:]
+
         try:
-            result = subprocess.run(
-                nuitka_cmd,
-                cwd=str(script_path.parent),
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            log_info(log_file, result.stdout)
-            if result.stderr:
-                log_warning(log_file, result.stderr)
+            result = run_streaming(nuitka_cmd, log_file, cwd=str(script_path.parent), check=True, backend="nuitka", env=env)
+            log_info(log_file, f"Nuitka beendet: {result.line_count} Ausgabezeilen in {result.duration:.1f}s")
         except subprocess.CalledProcessError as e:
-            log_error(log_file, "Nuitka failed:")
-            log_error(log_file, e.stdout)
-            log_error(log_file, e.stderr)
+            log_error(log_file, f"Nuitka failed (returncode {e.returncode}), letzte Ausgabe:")
+            log_error(log_file, e.stderr or e.stdout)
             raise
         except Exception as e:
             log_error(log_file, f"Unerwarteter Fehler bei der Nuitka-Ausführung: {e}")
@@ -178,16 +181,7 @@ class CPC0000000:
         if nuitka_run_path.is_file():
             try:
                 log_info(log_file, f"Starte nuitka-run: {nuitka_run_path}")
-                run_result = subprocess.run(
-                    [str(nuitka_run_path)],
-                    cwd=output_dir,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                log_info(log_file, run_result.stdout)
-                if run_result.stderr:
-                    log_warning(log_file, run_result.stderr)
+                run_streaming([str(nuitka_run_path)], log_file, cwd=output_dir, check=True, backend="nuitka")
             except Exception as e:
                 log_error(log_file, f"Fehler beim Start von nuitka-run.bat: {e}")
         else:
@@ -201,6 +195,7 @@ class CPC0000000:
                 log_error(log_file, f"Die EXE wurde NICHT erstellt: {exe_path}")
                 raise FileNotFoundError(f"Die EXE wurde NICHT erstellt: {exe_path}")
             log_info(log_file, f"Fertig. EXE-Datei (Onefile): {exe_path}")
+            report_artifacts("nuitka", exe_path)
         else:
 
             dist_dir = Path(output_dir) / (script_path.stem + ".dist")
@@ -208,3 +203,4 @@ class CPC0000000:
                 log_error(log_file, f"Das Ausgabeverzeichnis wurde NICHT erstellt: {dist_dir}")
                 raise FileNotFoundError(f"Das Ausgabeverzeichnis wurde NICHT erstellt: {dist_dir}")
             log_info(log_file, f"Fertig. Ordner mit EXE: {dist_dir}")
+            report_artifacts("nuitka", dist_dir)
@@ -1,9 +1,17 @@
+import hashlib
+import io
+import json
+import os
+import re
 import subprocess
 import sys
-import shutil
+import sysconfig
 from pathlib import Path
 
-from .extension_paths_loader import load_extensions_paths
+from .compilercache import compiler_env
+from .extension_paths_loader import load_extensions_paths, which_tool
+from .probecache import module_version
+from .process_runner import current_context, fan_out, report_artifacts, run_streaming, report_progress
 
 def log_warning(log_file, msg):
     border = "-" * 50
@@ -26,22 +34,254 @@ def log_info(log_file, msg):
     log_file.write(f"{border}\n")
     log_file.flush()
 
+# ---------------------------------------------------------------------
+#   Abhängigkeiten (.pyx/.pxd/.pxi, cimport) für inkrementelle Builds
+# ---------------------------------------------------------------------
+_CIMPORT_RX = re.compile(r"^\s*cimport\s+(.+)$", re.MULTILINE)
+_FROM_CIMPORT_RX = re.compile(r"^\s*from\s+(\.*[\w.]*)\s+cimport\s+(.+)$", re.MULTILINE)
+_INCLUDE_RX = re.compile(r"^\s*include\s+[\"']([^\"']+)[\"']", re.MULTILINE)
+
+
+def _package_root(path: Path) -> Path:
+    """Oberster Ordner oberhalb einer Paket-Kette (__init__.py/.pxd), für absolute cimports."""
+    root = path.parent
+    while any((root / f"__init__{ext}").is_file() for ext in (".py", ".pxd", ".pyx")):
+        root = root.parent
+    return root
+
+
+def _resolve_module(name: str, search_dirs: list[Path]) -> Path | None:
+    rel = Path(*name.split("."))
+    for base in search_dirs:
+        for cand in (base / rel.with_suffix(".pxd"), base / rel / "__init__.pxd"):
+            if cand.is_file():
+                return cand.resolve()
+    return None
+
+
+def _direct_deps(path: Path, include_dirs: list[Path]) -> set[Path]:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return set()
+    deps: set[Path] = set()
+    search = [path.parent, _package_root(path), *include_dirs]
+
+    for m in _INCLUDE_RX.finditer(text):
+        for base in (path.parent, *include_dirs):
+            cand = base / m.group(1)
+            if cand.is_file():
+                deps.add(cand.resolve())
+                break
+
+    names: list[tuple[str, list[Path]]] = []
+    for m in _CIMPORT_RX.finditer(text):
+        for part in m.group(1).split(","):
+            mod = part.split()[0] if part.split() else ""
+            names.append((mod, search))
+    for m in _FROM_CIMPORT_RX.finditer(text):
+        mod, members = m.group(1), m.group(2).strip("() \\")
+        dots = len(mod) - len(mod.lstrip("."))
+        mod = mod.lstrip(".")
+        if dots:
+            base = path.parent
+            for _ in range(dots - 1):
+                base = base.parent
+            dirs = [base]
+        else:
+            dirs = search
+        # "from pkg cimport sub" kann auch das Modul pkg/sub.pxd meinen
+        for member in members.split(","):
+            member = member.split()[0] if member.split() else ""
+            if member and member != "*":
+                names.append((f"{mod}.{member}" if mod else member, dirs))
+        if mod:
+            names.append((mod, dirs))
+
+    for mod, dirs in names:
+        if not mod:
+            continue
+        found = _resolve_module(mod, dirs)
+        if found is not None:
+            deps.add(found)
+    return deps
+
+
+def cython_dependencies(source: Path, include_dirs: list[str] | None = None) -> list[Path]:
+    """
+    Alle Dateien, von denen die Übersetzung von source abhängt: die Quelle selbst, die
+    gleichnamige .pxd, per include eingebundene .pxi und (transitiv) alle cimportierten
+    .pxd im Projekt. Module aus Cython/numpy usw. werden nicht gefunden und ignoriert;
+    deren Änderungen deckt der Tool-Fingerprint ab.
+    """
+    source = source.resolve()
+    incs = [Path(d).resolve() for d in (include_dirs or [])]
+    seen: set[Path] = {source}
+    todo = [source]
+    own_pxd = source.with_suffix(".pxd")
+    if source.suffix != ".pxd" and own_pxd.is_file():
+        seen.add(own_pxd)
+        todo.append(own_pxd)
+    while todo:
+        for dep in _direct_deps(todo.pop(), incs):
+            if dep not in seen:
+                seen.add(dep)
+                todo.append(dep)
+    return sorted(seen)
+
+
+# Felder ohne Einfluss auf die erzeugte .c/.cpp. cython_jobs setzt _applied_grant je nach
+# Parallelität bei jedem Lauf neu, cython_package_dir steckt schon im Modulpfad des Befehls.
+_FINGERPRINT_IGNORED = ("cython_incremental", "cython_keep_pyx", "cython_jobs", "cython_package_dir")
+
+
+def _ext_suffix() -> str:
+    return sysconfig.get_config_var("EXT_SUFFIX") or (".pyd" if os.name == "nt" else ".so")
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class CythonStamp:
+    """
+    <ausgabe>.deps.json neben der erzeugten .c/.cpp: Fingerprint (Befehl, cython_*-Felder,
+    Cython-Version) und Zustand aller Abhängigkeiten des letzten erfolgreichen Laufs.
+    """
+
+    def __init__(self, output_file: Path, fingerprint: str) -> None:
+        self.path = output_file.with_name(output_file.name + ".deps.json")
+        self.output_file = output_file
+        self.fingerprint = fingerprint
+        try:
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.data = {}
+
+    def why_stale(self, deps: list[Path]) -> str | None:
+        """None, wenn alles aktuell ist, sonst eine kurze Begründung fürs Log."""
+        if not self.output_file.is_file():
+            return f"{self.output_file.name} missing"
+        if self.data.get("fingerprint") != self.fingerprint:
+            return "command, directives or Cython version changed" if self.data else "no previous build"
+        recorded = self.data.get("deps") or {}
+        if set(recorded) != {str(d) for d in deps}:
+            return "dependency set changed"
+        for dep in deps:
+            entry = recorded[str(dep)]
+            try:
+                st = dep.stat()
+            except OSError:
+                return f"{dep.name} missing"
+            if [st.st_mtime_ns, st.st_size] == entry[:2]:
+                continue
+            if _sha256_file(dep) != entry[2]:
+                return f"{dep.name} changed"
+        return None
+
+    def record(self, deps: list[Path]) -> None:
+        state = {}
+        for dep in deps:
+            st = dep.stat()
+            state[str(dep)] = [st.st_mtime_ns, st.st_size, _sha256_file(dep)]
+        data = {"fingerprint": self.fingerprint, "deps": state}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def invalidate(self) -> None:
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+# Build-Skript für den Paket-Modus (läuft im Interpreter von AutoPy++)
+_BUILD_SCRIPT = """\
+import json
+from setuptools import setup, Extension
+
+with open({spec!r}, encoding="utf-8") as f:
+    spec = json.load(f)
+
+include_dirs = list(spec["include_dirs"])
+try:
+    import numpy
+    include_dirs.append(numpy.get_include())
+except ImportError:
+    pass
+
+setup(
+    name="apy-cython-package",
+    ext_modules=[
+        Extension(m["name"], [m["source"]], include_dirs=include_dirs, language=spec["language"])
+        for m in spec["modules"]
+    ],
+    script_args=["build_ext", "--inplace", "--parallel", str(spec["jobs"]), "--build-temp", spec["build_temp"],
+                 "--build-lib", spec["build_lib"]],
+)
+"""
+
+
 class CPD0000000:
     """Kompilierklasse für Cython."""
 
     @staticmethod
-    def run_cython(project, log_file) -> None:
-        if not project.script:
+    def fingerprint(project, cython_cmd: list[str]) -> str:
+        """Befehl (inkl. Direktiven), alle cython_*-Felder und die Identität des Cython-Tools."""
+        fields = {
+            k: v for k, v in sorted(vars(project).items())
+            if k.startswith("cython_") and k not in _FINGERPRINT_IGNORED
+        }
+        try:
+            st = Path(cython_cmd[0]).stat()
+            tool = [cython_cmd[0], st.st_mtime_ns, st.st_size]
+        except OSError:
+            tool = [cython_cmd[0]]
+        if cython_cmd[1:3] == ["-m", "cython"]:
+            # Interpreter-Datei ändert sich bei pip install nicht -> Version explizit (gecacht)
+            tool.append(module_version(cython_cmd[0], "cython")[0].get("version", ""))
+        payload = json.dumps([cython_cmd, fields, tool], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _extension_current(script_path: Path, output_file: Path) -> bool:
+        """Gibt es eine gebaute .so/.pyd, die neuer als die .c/.cpp und setup.py ist?"""
+        try:
+            newest_input = max(output_file.stat().st_mtime, (script_path.parent / "setup.py").stat().st_mtime)
+        except OSError:
+            return False
+        for pattern in (f"{script_path.stem}*.so", f"{script_path.stem}*.pyd"):
+            for ext in script_path.parent.glob(pattern):
+                if ext.stat().st_mtime >= newest_input:
+                    return True
+        return False
+
+    @staticmethod
+    def build_command(project, log_file, script: str | None = None, output_dir: str | None = None) -> tuple[list[str], Path]:
+        """
+        Baut den Cython-Befehl. Rückgabe: (Befehl, erzeugte .c/.cpp-Datei).
+        script/output_dir überschreiben project.script/cython_output_dir (Paket-Modus).
+        """
+        script = script or project.script
+        if not script:
             log_error(log_file, "Kein Skript angegeben.")
             raise ValueError("Kein Skript angegeben.")
 
-        script_path = Path(project.script).resolve()
+        script_path = Path(script).resolve()
         if not script_path.is_file():
-            log_error(log_file, f"Skript {project.script} nicht gefunden.")
-            raise FileNotFoundError(f"Skript {project.script} nicht gefunden.")
+            log_error(log_file, f"Skript {script} nicht gefunden.")
+            raise FileNotFoundError(f"Skript {script} nicht gefunden.")
 
         # Zielverzeichnis für Ausgabe bestimmen
-        output_dir = project.cython_output_dir or str(script_path.parent)
+        output_dir = output_dir or project.cython_output_dir or str(script_path.parent)
 
         # 1. Expliziter Pfad im Project
         cython_path = getattr(project, "cython_path", None)
@@ -57,7 +297,7 @@ class CPD0000000:
 
         # 3. Im PATH suchen
         if not cython_path:
-            cython_path = shutil.which("cython")
+            cython_path = which_tool("cython")
             if cython_path:
                 log_info(log_file, f"Found cython in PATH: {cython_path}")
 
@@ -132,46 +372,265 @@ class CPD0000000:
 
         # Zu kompilierende Datei
         cython_cmd.append(str(script_path))
+        return cython_cmd, output_file
 
-        log_info(log_file, "Cython-Befehl wird ausgeführt:")
-        log_info(log_file, " ".join(map(str, cython_cmd)))
+    # -----------------------------------------------------------------
+    #   Paket-Modus: ganzer Ordner, paralleles cythonize + gemeinsamer C-Build
+    # -----------------------------------------------------------------
+    @staticmethod
+    def package_modules(project, log_file) -> tuple[Path, list[tuple[str, Path]]]:
+        """
+        (Import-Wurzel, [(Modulname, .pyx)]) für cython_package_dir. Ist der Ordner selbst ein
+        Paket (__init__.py), beginnen die Modulnamen beim obersten Paket darüber.
+        """
+        base = Path(str(project.cython_package_dir)).resolve()
+        if not base.is_dir():
+            log_error(log_file, f"cython_package_dir nicht gefunden: {base}")
+            raise FileNotFoundError(f"cython_package_dir nicht gefunden: {base}")
+        root = _package_root(base / "__init__.py") if (base / "__init__.py").is_file() else base
+
+        modules = []
+        for pyx in sorted(base.rglob("*.pyx")):
+            rel = pyx.relative_to(root)
+            if any(part in ("build", "__pycache__") or part.startswith(".") for part in rel.parts[:-1]):
+                continue
+            modules.append((".".join(rel.with_suffix("").parts), pyx))
+        return root, modules
+
+    @staticmethod
+    def package_commands(project, log_file) -> tuple[Path, list[tuple[str, Path, list[str], Path]]]:
+        """(Import-Wurzel, [(Modulname, .pyx, Cython-Befehl, .c/.cpp)]) für alle Module des Pakets."""
+        root, modules = CPD0000000.package_modules(project, log_file)
+        out_base = Path(project.cython_output_dir).resolve() if project.cython_output_dir else None
+        result = []
+        for i, (name, pyx) in enumerate(modules):
+            out_dir = out_base / pyx.parent.relative_to(root) if out_base else pyx.parent
+            # Tool-Auflösung nur beim ersten Modul ins Log
+            cmd, output_file = CPD0000000.build_command(
+                project, log_file if i == 0 else io.StringIO(), script=str(pyx), output_dir=str(out_dir)
+            )
+            # absolute cimports relativ zur Paketwurzel
+            cmd = cmd[:-1] + ["-I", str(root)] + cmd[-1:]
+            result.append((name, pyx, cmd, output_file))
+        return root, result
 
+    @staticmethod
+    def _worker_count(project, n: int) -> int:
+        """cython_jobs (0 = alle Kerne), begrenzt auf die Zahl der Module."""
         try:
-            result = subprocess.run(
-                cython_cmd,
-                cwd=str(script_path.parent),
-                capture_output=True,
-                text=True,
-                check=True
+            jobs = int(getattr(project, "cython_jobs", 0) or 0)
+        except (TypeError, ValueError):
+            jobs = 0
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        return max(1, min(jobs, n))
+
+    @staticmethod
+    def _raise_module_errors(what: str, failures: list[tuple[str, Exception]], total: int, log_file) -> None:
+        lines = []
+        for name, e in failures:
+            if isinstance(e, subprocess.CalledProcessError):
+                detail = [l for l in (e.stderr or e.stdout or "").strip().splitlines() if l.strip()]
+                lines.append(f"  {name}: rc={e.returncode}" + (f" - {detail[-1].strip()}" if detail else ""))
+            else:
+                lines.append(f"  {name}: {type(e).__name__}: {e}")
+        log_error(log_file, f"{what} failed for {len(failures)} of {total} module(s):\n" + "\n".join(lines))
+        first = failures[0][1]
+        if not isinstance(first, subprocess.CalledProcessError):
+            raise first
+        stderr = "\n".join(e.stderr or "" for _, e in failures if isinstance(e, subprocess.CalledProcessError))
+        raise subprocess.CalledProcessError(first.returncode, first.cmd, output=first.output, stderr=stderr)
+
+    @staticmethod
+    def _build_extensions(project, root: Path, targets: list[tuple[str, Path]], workers: int, log_file) -> None:
+        """
+        Baut alle Erweiterungen in EINEM setuptools-Lauf (build_ext --inplace --parallel N):
+        die C-Dateien aller Module teilen sich einen Compiler-Pool, Objektdateien bleiben
+        in build/apy-cython für spätere Läufe liegen.
+        """
+        build_dir = root / "build" / "apy-cython"
+        build_dir.mkdir(parents=True, exist_ok=True)
+        spec_path = build_dir / "extensions.json"
+        script_path = build_dir / "build_extensions.py"
+        spec = {
+            "modules": [{"name": name, "source": str(src)} for name, src in targets],
+            "language": "c++" if getattr(project, "cython_language", "c") in ("cpp", "c++") else "c",
+            "include_dirs": [str(root)] + [str(Path(d).resolve()) for d in (getattr(project, "cython_include_dirs", None) or [])],
+            "jobs": workers,
+            "build_temp": str(build_dir / "temp"),
+            "build_lib": str(build_dir / "lib"),
+        }
+        spec_path.write_text(json.dumps(spec, indent=1), encoding="utf-8")
+        script_path.write_text(_BUILD_SCRIPT.format(spec=str(spec_path)), encoding="utf-8")
+
+        total = len(targets)
+        started: list[str] = []
+        progress = current_context().get("progress")
+        building_rx = re.compile(r"building '([\w.]+)' extension")
+
+        def on_line(line: str) -> None:
+            # läuft im Lese-Thread: Fortschritt direkt an den Callback des Projekts
+            m = building_rx.search(line)
+            if m and progress is not None:
+                started.append(m.group(1))
+                progress(0.5 + 0.5 * len(started) / max(1, total))
+
+        cmd = [sys.executable, str(script_path)]
+        log_info(log_file, f"C-Build: {total} Erweiterung(en), {workers} parallel: {' '.join(cmd)}")
+        try:
+            run_streaming(
+                cmd, log_file, cwd=str(root), check=True, backend="cython", on_line=on_line,
+                env=compiler_env(project, log_file),
             )
-            log_info(log_file, result.stdout)
-            if result.stderr:
-                log_warning(log_file, result.stderr)
         except subprocess.CalledProcessError as e:
-            log_error(log_file, "Cython failed:")
-            log_error(log_file, e.stdout)
-            log_error(log_file, e.stderr)
-            raise
-        except Exception as e:
-            log_error(log_file, f"Unerwarteter Fehler bei der Cython-Ausführung: {e}")
+            # Fehlerzeilen den Modulen zuordnen
+            by_source = {str(src): name for name, src in targets}
+            failed: dict[str, str] = {}
+            for line in f"{e.stdout or ''}\n{e.stderr or ''}".splitlines():
+                if "error" not in line.lower():
+                    continue
+                for src, name in by_source.items():
+                    if src in line or Path(src).name in line:
+                        failed.setdefault(name, line.strip())
+            if failed:
+                log_error(
+                    log_file,
+                    f"C-Build failed for {len(failed)} of {total} module(s):\n"
+                    + "\n".join(f"  {name}: {msg}" for name, msg in failed.items()),
+                )
             raise
 
+    @staticmethod
+    def run_cython_package(project, log_file) -> None:
+        root, entries = CPD0000000.package_commands(project, log_file)
+        if not entries:
+            log_warning(log_file, f"Keine .pyx-Dateien in {project.cython_package_dir} gefunden.")
+            return
+        incremental = getattr(project, "cython_incremental", True)
+        include_dirs = list(getattr(project, "cython_include_dirs", None) or []) + [str(root)]
+
+        stale = []
+        for name, pyx, cmd, output_file in entries:
+            if incremental:
+                deps = cython_dependencies(pyx, include_dirs)
+                stamp = CythonStamp(output_file, CPD0000000.fingerprint(project, cmd))
+                if stamp.why_stale(deps) is None:
+                    continue
+            else:
+                deps, stamp = [], None
+            stale.append((name, pyx, cmd, output_file, deps, stamp))
+
+        workers = CPD0000000._worker_count(project, max(1, len(stale)))
+        log_info(
+            log_file,
+            f"Cython-Paket {root}: {len(entries)} Modul(e), {len(stale)} zu übersetzen, {workers} parallel",
+        )
+
+        # Phase 1: cythonize parallel
+        def task(job, buf):
+            name, pyx, cmd, output_file, deps, stamp = job
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            log_info(buf, f"cythonize {name}: {' '.join(map(str, cmd))}")
+            if stamp is not None:
+                stamp.invalidate()
+            run_streaming(cmd, buf, cwd=str(pyx.parent), check=True, backend="cython")
+
+        failures: list[tuple[str, Exception]] = []
+        done = 0
+        for job, text, error in fan_out(stale, task, workers, name="cython"):
+            log_file.write(text)
+            name, _, _, _, deps, stamp = job
+            if error is None:
+                if stamp is not None:
+                    stamp.record(deps)
+            else:
+                failures.append((name, error))
+            done += 1
+            report_progress(0.5 * done / max(1, len(stale)))
+        if failures:
+            CPD0000000._raise_module_errors("cythonize", failures, len(stale), log_file)
+
+        report_artifacts("cython", *(entry[3] for entry in entries))
+
+        # Phase 2: gemeinsamer, paralleler C-Build für alle Module ohne aktuelle Erweiterung
+        if not getattr(project, "cython_build_with_setup", True):
+            log_warning(log_file, "build_with_setup deaktiviert, kein Build der .so/.pyd-Dateien!")
+            return
+        ext_suffix = _ext_suffix()
+        rebuilt = {job[0] for job in stale}
+        targets = []
+        for name, pyx, cmd, output_file in entries:
+            ext = root.joinpath(*name.split(".")).with_suffix(ext_suffix)
+            try:
+                current = ext.stat().st_mtime >= output_file.stat().st_mtime
+            except OSError:
+                current = False
+            if name in rebuilt or not current:
+                targets.append((name, output_file))
+        if not targets:
+            log_info(log_file, "Alle Erweiterungen sind aktuell, C-Build wird übersprungen.")
+        else:
+            CPD0000000._build_extensions(
+                project, root, targets, CPD0000000._worker_count(project, len(targets)), log_file
+            )
+        report_artifacts("cython", *(root.joinpath(*name.split(".")).with_suffix(ext_suffix) for name, *_ in entries))
+        report_progress(1.0)
+        log_info(log_file, f"Fertig. Cython-Paket {root}: {len(stale)} übersetzt, {len(targets)} Erweiterung(en) gebaut.")
+
+    @staticmethod
+    def run_cython(project, log_file) -> None:
+        if getattr(project, "cython_package_dir", ""):
+            CPD0000000.run_cython_package(project, log_file)
+            return
+
+        cython_cmd, output_file = CPD0000000.build_command(project, log_file)
+        script_path = Path(project.script).resolve()
+
+        stamp = None
+        stale = "incremental build disabled"
+        if getattr(project, "cython_incremental", True):
+            deps = cython_dependencies(script_path, getattr(project, "cython_include_dirs", None))
+            stamp = CythonStamp(output_file, CPD0000000.fingerprint(project, cython_cmd))
+            stale = stamp.why_stale(deps)
+
+        if stale is None:
+            log_info(log_file, f"Cython: {output_file.name} is up to date ({len(deps)} dependencies unchanged), skipping cythonize.")
+        else:
+            log_info(log_file, "Cython-Befehl wird ausgeführt:")
+            log_info(log_file, f"Grund: {stale}")
+            log_info(log_file, " ".join(map(str, cython_cmd)))
+
+            try:
+                if stamp is not None:
+                    stamp.invalidate()
+                run_streaming(cython_cmd, log_file, cwd=str(script_path.parent), check=True, backend="cython")
+            except subprocess.CalledProcessError as e:
+                log_error(log_file, f"Cython failed (returncode {e.returncode}), letzte Ausgabe:")
+                log_error(log_file, e.stderr or e.stdout)
+                raise
+            except Exception as e:
+                log_error(log_file, f"Unerwarteter Fehler bei der Cython-Ausführung: {e}")
+                raise
+            if stamp is not None:
+                stamp.record(deps)
+
         # Build (gcc oder setup.py)
         try:
             setup_path = Path(script_path.parent) / "setup.py"
-            if setup_path.is_file() and getattr(project, "cython_build_with_setup", True):
+            if (
+                stale is None
+                and setup_path.is_file()
+                and getattr(project, "cython_build_with_setup", True)
+                and CPD0000000._extension_current(script_path, output_file)
+            ):
+                log_info(log_file, "Extension ist aktuell, setup.py build_ext wird übersprungen.")
+            elif setup_path.is_file() and getattr(project, "cython_build_with_setup", True):
                 build_cmd = [sys.executable, str(setup_path), "build_ext", "--inplace"]
                 log_info(log_file, f"Starte Build mit setup.py: {' '.join(build_cmd)}")
-                build_result = subprocess.run(
-                    build_cmd,
-                    cwd=str(script_path.parent),
-                    capture_output=True,
-                    text=True,
-                    check=True
+                run_streaming(
+                    build_cmd, log_file, cwd=str(script_path.parent), check=True, backend="cython",
+                    env=compiler_env(project, log_file),
                 )
-                log_info(log_file, build_result.stdout)
-                if build_result.stderr:
-                    log_warning(log_file, build_result.stderr)
             else:
                 log_warning(log_file, "Kein setup.py gefunden oder build_with_setup deaktiviert, kein automatischer Build der .so/.pyd-Datei!")
         except Exception as e:
@@ -184,4 +643,6 @@ class CPD0000000:
             except Exception as e:
                 log_warning(log_file, f"Fehler beim Löschen der .pyx-Datei: {e}")
 
+        # build_ext --inplace legt <name><EXT_SUFFIX> neben das Script
+        report_artifacts("cython", output_file, script_path.parent / (script_path.stem + _ext_suffix()))
         log_info(log_file, f"Fertig. Cython-Kompilierung für {script_path} abgeschlossen.")
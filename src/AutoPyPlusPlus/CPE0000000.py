@@ -1,10 +1,17 @@
 import subprocess
 import sys
-import shutil
 import re
+import os
+import json
+import hashlib
 from pathlib import Path
 
-from .extension_paths_loader import load_extensions_paths
+from .compilercache import object_cache, resolve_mode
+from .extension_paths_loader import load_extensions_paths, which_tool
+from .process_runner import fan_out, report_artifacts, report_progress, run_streaming
+
+OBJ_MANIFEST = "objects.json"
+_OBJ_MANIFEST_VERSION = 1
 
 def log_warning(log_file, msg):
     border = "-" * 50
@@ -81,6 +88,104 @@ def file_contains_main(file_path, log_file=None):
             print(msg)
     return False
 
+def parse_depfile(text):
+    """
+    Abhängigkeiten aus einer -MMD/-MF-Depfile (Make-Regel "obj: src hdr1 hdr2 \\").
+    Nur die erste Regel zählt; die Phony-Regeln von -MP werden ignoriert.
+    """
+    text = text.replace("\\\r\n", " ").replace("\\\n", " ")
+    for line in text.splitlines():
+        # "C:\x.o: ..." -> erster Doppelpunkt mit folgendem Leerzeichen trennt Ziel und Quellen
+        _, sep, rest = line.partition(": ")
+        if not sep:
+            continue
+        deps = []
+        for token in re.split(r"(?<!\\)\s+", rest.strip()):
+            if token:
+                deps.append(token.replace("\\ ", " ").replace("$$", "$"))
+        return deps
+    return []
+
+
+def parse_msvc_dependencies(text):
+    """Abhängigkeiten aus cl.exe /sourceDependencies (JSON: Data.Source + Data.Includes)."""
+    try:
+        data = json.loads(text).get("Data") or {}
+    except (ValueError, AttributeError):
+        return []
+    deps = [data["Source"]] if data.get("Source") else []
+    return deps + [str(d) for d in data.get("Includes") or []]
+
+
+class ObjectManifest:
+    """
+    <obj_dir>/objects.json: pro Objektdatei der Hash des Compile-Befehls und die
+    Abhängigkeiten aus der Depfile, dazu der Hash des letzten Link-Befehls.
+
+    Ein Objekt ist aktuell, wenn es existiert, mit demselben Befehl gebaut wurde und
+    keine Abhängigkeit fehlt oder neuer ist als das Objekt.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.objects = {}
+        self.link = None
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == _OBJ_MANIFEST_VERSION:
+                self.objects = dict(data.get("objects") or {})
+                self.link = data.get("link")
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def command_hash(cmd):
+        return hashlib.sha1(json.dumps([str(c) for c in cmd]).encode("utf-8")).hexdigest()
+
+    def why_stale(self, obj, cmd_hash):
+        """None wenn aktuell, sonst der Grund."""
+        entry = self.objects.get(str(obj))
+        try:
+            obj_mtime = Path(obj).stat().st_mtime_ns
+        except OSError:
+            return "no object"
+        if not entry or entry.get("cmd") != cmd_hash:
+            return "flags changed"
+        for dep in entry.get("deps") or []:
+            try:
+                if Path(dep).stat().st_mtime_ns > obj_mtime:
+                    return f"{dep} changed"
+            except OSError:
+                return f"{dep} missing"
+        return None
+
+    def record(self, obj, cmd_hash, deps):
+        self.objects[str(obj)] = {"cmd": cmd_hash, "deps": list(deps)}
+        self.dirty = True
+
+    def forget(self, obj):
+        if self.objects.pop(str(obj), None) is not None:
+            self.dirty = True
+
+    def set_link(self, link_hash):
+        if self.link != link_hash:
+            self.link = link_hash
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": _OBJ_MANIFEST_VERSION, "link": self.link, "objects": self.objects}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
 class CPE0000000:
     """Kompilierklasse für C++."""
 
@@ -121,7 +226,7 @@ class CPE0000000:
                 setattr(project, "cpp_path", cpp_candidate)
                 log_info(log_file, f"Set cpp_path from extensions: {cpp_candidate}")
         if not cpp_path or cpp_path.lower() in ("g++", "cl.exe"):
-            cpp_path = shutil.which("cl.exe") or shutil.which("x86_64-w64-mingw32-g++") or shutil.which("g++")
+            cpp_path = which_tool("cl.exe", "x86_64-w64-mingw32-g++", "g++")
             if cpp_path:
                 log_info(log_file, f"Found compiler in PATH: {cpp_path}")
         if not cpp_path:
@@ -142,6 +247,13 @@ class CPE0000000:
             exe_ext = get_extension_for_target(target_type, sys.platform)
         output_file = str(Path(output_dir) / f"{exe_name}{exe_ext}")
 
+        if getattr(project, "cpp_incremental", False):
+            CPE0000000.run_incremental(project, log_file, cpp_path, abs_source_files, output_file)
+            report_artifacts("cpp", output_file)
+            return
+        if getattr(project, "cpp_pch_header", ""):
+            log_warning(log_file, "cpp_pch_header wird nur im inkrementellen Modus (cpp_incremental) verwendet.")
+
         if is_msvc:
             cmd = [cpp_path]
             cmd.extend([str(Path(f)) for f in abs_source_files])
@@ -265,24 +377,368 @@ class CPE0000000:
         log_info(log_file, " ".join(cmd))
 
         try:
-            result = subprocess.run(
+            run_streaming(
                 cmd,
-                capture_output=True,
-                text=True,
+                log_file,
                 check=True,
-                encoding="mbcs",
-                errors="replace"
+                encoding="mbcs" if os.name == "nt" else None,
+                errors="replace",
+                backend="cpp",
             )
-            log_info(log_file, result.stdout)
-            if result.stderr:
-                log_warning(log_file, result.stderr)
         except subprocess.CalledProcessError as e:
-            log_error(log_file, "C++-Build failed:")
-            log_error(log_file, e.stdout)
-            log_error(log_file, e.stderr)
+            log_error(log_file, f"C++-Build failed (returncode {e.returncode}), letzte Ausgabe:")
+            log_error(log_file, e.stderr or e.stdout)
             raise
         except Exception as e:
             log_error(log_file, f"Unerwarteter Fehler bei der C++-Kompilierung: {e}")
             raise
 
         log_info(log_file, f"Fertig. Ausgabedatei: {output_file}")
+        report_artifacts("cpp", output_file)
+
+    # ---------------------------------------------------------------------
+    #  Inkrementeller Modus: eine Objektdatei pro Übersetzungseinheit
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def compile_flags(project, is_msvc):
+        """Flags für den Compile-Schritt (-c) ohne Quelle/Ausgabe."""
+        target_type = getattr(project, "cpp_target_type", "Executable")
+        build_type = getattr(project, "cpp_build_type", "").lower()
+        cpp_std = getattr(project, "cpp_standard", None)
+        flags = []
+        if is_msvc:
+            flags.append("/nologo")
+            flags.append("/Zi" if build_type == "debug" else "/O2")
+            std_map = {"c++11": "c++11", "c++14": "c++14", "c++17": "c++17", "c++20": "c++20", "c++23": "c++latest"}
+            if cpp_std and std_map.get(cpp_std):
+                flags.append(f"/std:{std_map[cpp_std]}")
+            for inc in getattr(project, "cpp_include_dirs", []):
+                flags.append(f"/I{inc}")
+            for define in getattr(project, "cpp_defines", []):
+                if define:
+                    flags.append(f"/D{define}")
+        else:
+            if build_type == "debug":
+                flags.append("-g")
+            elif build_type == "release":
+                flags.append("-O2")
+            if cpp_std and cpp_std.startswith("c++"):
+                flags.append(f"-std={cpp_std}")
+            if target_type in ("Python Extension", "Shared Library") and sys.platform != "win32":
+                flags.append("-fPIC")
+            for inc in getattr(project, "cpp_include_dirs", []):
+                flags.extend(["-I", str(inc)])
+            for define in getattr(project, "cpp_defines", []):
+                if define:
+                    flags.append(f"-D{define}")
+        if getattr(project, "cpp_compiler_flags", None):
+            flags.extend(str(project.cpp_compiler_flags).split())
+        return flags
+
+    @staticmethod
+    def object_command(cpp_path, flags, is_msvc, src, obj, dep):
+        """Compile-Befehl für eine Übersetzungseinheit inkl. Header-Abhängigkeiten (dep)."""
+        if is_msvc:
+            return [cpp_path, *flags, "/c", str(src), f"/Fo{obj}", "/sourceDependencies", str(dep)]
+        return [cpp_path, *flags, "-c", str(src), "-o", str(obj), "-MMD", "-MF", str(dep)]
+
+    @staticmethod
+    def link_command(project, cpp_path, is_msvc, objects, output_file):
+        """Link-Befehl (bzw. Archiv für Static Library) aus den Objektdateien."""
+        target_type = getattr(project, "cpp_target_type", "Executable")
+        build_type = getattr(project, "cpp_build_type", "").lower()
+        linker_flags = str(getattr(project, "cpp_linker_flags", "") or "").split()
+
+        if target_type == "Static Library":
+            if is_msvc:
+                lib_exe = Path(cpp_path).with_name("lib.exe")
+                return [str(lib_exe) if lib_exe.is_file() else "lib.exe", "/nologo", f"/OUT:{output_file}", *map(str, objects)]
+            # x86_64-w64-mingw32-g++ -> x86_64-w64-mingw32-ar
+            compiler = Path(cpp_path)
+            ar_name = compiler.name.replace("g++", "ar") if "g++" in compiler.name else "ar"
+            sibling = compiler.with_name(ar_name)
+            ar = str(sibling) if sibling.is_file() else (which_tool(ar_name, "ar") or "ar")
+            return [ar, "rcs", output_file, *map(str, objects)]
+
+        if is_msvc:
+            cmd = [cpp_path, "/nologo", *map(str, objects), f"/Fe{output_file}"]
+            if target_type in ("Python Extension", "Shared Library"):
+                cmd.append("/LD")
+            link_args = []
+            if getattr(project, "cpp_windowed", False):
+                link_args.append("/SUBSYSTEM:WINDOWS")
+            if build_type == "debug":
+                link_args.append("/DEBUG")
+            for lib_dir in getattr(project, "cpp_lib_dirs", []):
+                link_args.append(f"/LIBPATH:{lib_dir}")
+            for lib in getattr(project, "cpp_libraries", []):
+                if lib:
+                    link_args.append(lib if lib.lower().endswith(".lib") else f"{lib}.lib")
+            link_args.extend(linker_flags)
+            if link_args:
+                cmd.append("/link")
+                cmd.extend(link_args)
+            return cmd
+
+        cmd = [cpp_path]
+        if build_type == "debug":
+            cmd.append("-g")
+        elif build_type == "release":
+            cmd.append("-O2")
+        if target_type in ("Python Extension", "Shared Library"):
+            cmd.append("-shared")
+        # Compiler-Flags wie -pthread/-fsanitize wirken auch beim Linken
+        if getattr(project, "cpp_compiler_flags", None):
+            cmd.extend(str(project.cpp_compiler_flags).split())
+        if sys.platform == "win32" and getattr(project, "cpp_windowed", False):
+            cmd.append("-mwindows")
+        cmd.extend(["-o", output_file])
+        cmd.extend(map(str, objects))
+        for lib_dir in getattr(project, "cpp_lib_dirs", []):
+            cmd.extend(["-L", str(lib_dir)])
+        for lib in getattr(project, "cpp_libraries", []):
+            if lib:
+                cmd.append(f"-l{lib}")
+        cmd.extend(linker_flags)
+        return cmd
+
+    @staticmethod
+    def object_dir(project, output_file):
+        """<output_dir>/build/apy-cpp/<name> (build/ wird vom Build-Cache ignoriert)."""
+        return Path(output_file).parent / "build" / "apy-cpp" / Path(output_file).stem
+
+    @staticmethod
+    def object_paths(obj_dir, src, is_msvc):
+        """(obj, dep) je Quelle; der Pfad-Hash trennt gleichnamige Dateien aus verschiedenen Ordnern."""
+        digest = hashlib.sha1(os.path.normcase(str(src)).encode("utf-8")).hexdigest()[:8]
+        base = obj_dir / f"{Path(src).stem}-{digest}"
+        if is_msvc:
+            return base.with_suffix(".obj"), base.with_suffix(".json")
+        return base.with_suffix(".o"), base.with_suffix(".d")
+
+    @staticmethod
+    def _worker_count(project, n_files):
+        """cpp_jobs (0 = alle Kerne), begrenzt auf die Zahl der Dateien."""
+        try:
+            jobs = int(getattr(project, "cpp_jobs", 0) or 0)
+        except (TypeError, ValueError):
+            jobs = 0
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        return max(1, min(jobs, n_files))
+
+    @staticmethod
+    def _raise_aggregated(failures, total, log_file):
+        lines = []
+        for src, e in failures:
+            if isinstance(e, subprocess.CalledProcessError):
+                detail = (e.stderr or "").strip().splitlines()
+                lines.append(f"  {src}: rc={e.returncode}" + (f" - {detail[-1]}" if detail else ""))
+            else:
+                lines.append(f"  {src}: {type(e).__name__}: {e}")
+        log_error(log_file, f"C++ compile failed for {len(failures)} of {total} file(s):\n" + "\n".join(lines))
+
+        first = failures[0][1]
+        if not isinstance(first, subprocess.CalledProcessError):
+            raise first
+        stderr = "\n".join(
+            (e.stderr or "") for _, e in failures if isinstance(e, subprocess.CalledProcessError)
+        )
+        raise subprocess.CalledProcessError(first.returncode, first.cmd, output=first.output, stderr=stderr)
+
+    @staticmethod
+    def run_incremental(project, log_file, cpp_path, abs_source_files, output_file):
+        """
+        Übersetzt jede Quelle einzeln (-c, parallel über cpp_jobs) nach build/apy-cpp/<name>,
+        verfolgt Header über -MMD-Depfiles bzw. /sourceDependencies und baut nur veraltete
+        Objekte neu. Gelinkt wird nur, wenn sich ein Objekt, der Link-Befehl oder die
+        Ausgabedatei geändert hat.
+        """
+        is_msvc = str(cpp_path).lower().endswith("cl.exe")
+        encoding = "mbcs" if os.name == "nt" else None
+        obj_dir = CPE0000000.object_dir(project, output_file)
+        obj_dir.mkdir(parents=True, exist_ok=True)
+        manifest = ObjectManifest(obj_dir / OBJ_MANIFEST)
+        flags = CPE0000000.compile_flags(project, is_msvc)
+
+        # Precompiled Header: einmal pro Flag-Satz bauen und in jede Übersetzungseinheit einbinden
+        pch_file, pch_objects = None, []
+        if getattr(project, "cpp_pch_header", ""):
+            pch_file, pch_flags, pch_objects = CPE0000000.build_pch(
+                project, log_file, cpp_path, flags, is_msvc, obj_dir, manifest, encoding
+            )
+            flags = flags + pch_flags
+
+        units = []
+        for src in abs_source_files:
+            obj, dep = CPE0000000.object_paths(obj_dir, src, is_msvc)
+            cmd = CPE0000000.object_command(cpp_path, flags, is_msvc, src, obj, dep)
+            units.append((src, obj, dep, cmd, ObjectManifest.command_hash(cmd)))
+
+        stale = []
+        for unit in units:
+            why = manifest.why_stale(unit[1], unit[4])
+            if why:
+                stale.append(unit)
+                log_info(log_file, f"C++ stale: {Path(unit[0]).name} ({why})")
+        log_info(log_file, f"C++ incremental: {len(stale)} of {len(units)} translation unit(s) out of date")
+
+        workers = CPE0000000._worker_count(project, len(stale))
+        cache_mode, cache_exe = resolve_mode(project)
+        if stale:
+            log_info(log_file, f"C++ compile: {len(stale)} file(s) on {workers} worker(s), compiler cache: {cache_exe or cache_mode}")
+        # lokaler Cache versteht nur GCC/Clang-Kommandozeilen, cl.exe läuft direkt
+        use_local = cache_mode == "local" and not is_msvc
+
+        def task(unit, buf):
+            src, obj, dep, cmd, _ = unit
+            if cache_mode == "ccache":
+                cmd = [cache_exe, *cmd]
+            log_info(buf, f"Compiling: {src}")
+            log_info(buf, " ".join(map(str, cmd)))
+            compile_cmd = lambda c: run_streaming(c, buf, encoding=encoding, errors="replace", backend="cpp")
+            if use_local:
+                res = object_cache().compile(cmd, run=compile_cmd, log_file=buf)
+            else:
+                res = compile_cmd(cmd)
+            if res.returncode != 0:
+                raise subprocess.CalledProcessError(res.returncode, cmd, output=res.stdout, stderr=res.stderr)
+
+        compiled = 0
+        failures = []
+        try:
+            for (src, obj, dep, cmd, cmd_hash), text, error in fan_out(stale, task, workers, name="cpp"):
+                log_file.write(text)
+                if error is None:
+                    compiled += 1
+                    try:
+                        raw = Path(dep).read_text(encoding="utf-8", errors="replace")
+                        deps = parse_msvc_dependencies(raw) if is_msvc else parse_depfile(raw)
+                    except OSError:
+                        deps = []
+                    deps = deps or [src]
+                    if pch_file is not None and str(pch_file) not in deps:
+                        # neu gebauter PCH -> alle Objekte veraltet
+                        deps.append(str(pch_file))
+                    manifest.record(obj, cmd_hash, deps)
+                else:
+                    manifest.forget(obj)
+                    failures.append((src, error))
+                # Linken zählt als letzter Schritt
+                report_progress((compiled + len(failures)) / (len(stale) + 1))
+        finally:
+            manifest.save()
+
+        if failures:
+            CPE0000000._raise_aggregated(failures, len(stale), log_file)
+
+        objects = [unit[1] for unit in units] + pch_objects
+        link_cmd = CPE0000000.link_command(project, cpp_path, is_msvc, objects, output_file)
+        link_hash = ObjectManifest.command_hash(link_cmd)
+        try:
+            out_mtime = Path(output_file).stat().st_mtime_ns
+            newest = max(Path(o).stat().st_mtime_ns for o in objects)
+            up_to_date = manifest.link == link_hash and out_mtime >= newest
+        except OSError:
+            up_to_date = False
+
+        if up_to_date:
+            log_info(log_file, f"Link up to date, skipped: {output_file}")
+        else:
+            if getattr(project, "cpp_target_type", "Executable") == "Static Library":
+                # ar rcs ergänzt nur, entfernte Objekte blieben sonst im Archiv
+                try:
+                    Path(output_file).unlink()
+                except OSError:
+                    pass
+            log_info(log_file, "C++-Link-Befehl wird ausgeführt:")
+            log_info(log_file, " ".join(map(str, link_cmd)))
+            try:
+                run_streaming(link_cmd, log_file, check=True, encoding=encoding, errors="replace", backend="cpp")
+            except subprocess.CalledProcessError as e:
+                log_error(log_file, f"C++-Link failed (returncode {e.returncode}), letzte Ausgabe:")
+                log_error(log_file, e.stderr or e.stdout)
+                manifest.set_link(None)
+                manifest.save()
+                raise
+            manifest.set_link(link_hash)
+            manifest.save()
+        report_progress(1.0)
+
+        log_info(
+            log_file,
+            f"Fertig. Ausgabedatei: {output_file} ({compiled} compiled, {len(units) - len(stale)} up to date)",
+        )
+
+    @staticmethod
+    def pch_paths(obj_dir, cpp_path, flags, header, is_msvc):
+        """
+        (pch_dir, stub, pch_file) für einen Flag-Satz: build/apy-cpp/<name>/pch/<hash>/.
+        Der Stub-Header bindet den echten Header ein; ohne gültigen PCH kompiliert er normal.
+        """
+        key = ObjectManifest.command_hash([cpp_path, *flags, str(header)])[:12]
+        pch_dir = obj_dir / "pch" / key
+        stub = pch_dir / Path(header).name
+        pch_file = pch_dir / (stub.name + (".pch" if is_msvc else ".gch"))
+        return pch_dir, stub, pch_file
+
+    @staticmethod
+    def build_pch(project, log_file, cpp_path, flags, is_msvc, obj_dir, manifest, encoding):
+        """
+        Baut den Precompiled Header aus project.cpp_pch_header, falls er fehlt oder der Header,
+        einer seiner Includes oder die Flags sich geändert haben.
+        Liefert (pch_file, zusätzliche Compile-Flags, zusätzliche Objekte zum Linken).
+        """
+        header = Path(str(project.cpp_pch_header)).resolve()
+        if not header.is_file():
+            log_error(log_file, f"Precompiled Header {header} nicht gefunden.")
+            raise FileNotFoundError(f"Precompiled Header {header} nicht gefunden.")
+
+        pch_dir, stub, pch_file = CPE0000000.pch_paths(obj_dir, cpp_path, flags, header, is_msvc)
+        pch_dir.mkdir(parents=True, exist_ok=True)
+        stub_text = f'#include "{header.as_posix()}"\n'
+        if not stub.is_file() or stub.read_text(encoding="utf-8") != stub_text:
+            stub.write_text(stub_text, encoding="utf-8")
+
+        if is_msvc:
+            # cl.exe: /Yc erzeugt .pch + pch.obj (muss mitgelinkt werden), /Yu + /FI in jeder Einheit
+            src = pch_dir / "pch.cpp"
+            if not src.is_file():
+                src.write_text(f'#include "{stub.name}"\n', encoding="utf-8")
+            obj, dep = pch_dir / "pch.obj", pch_dir / "pch.json"
+            cmd = [cpp_path, *flags, "/c", str(src), f"/I{pch_dir}", f"/Yc{stub.name}", f"/Fp{pch_file}",
+                   f"/Fo{obj}", "/sourceDependencies", str(dep)]
+            use_flags = [f"/I{pch_dir}", f"/Yu{stub.name}", f"/FI{stub.name}", f"/Fp{pch_file}"]
+            extra_objects = [obj]
+        else:
+            lang = "c-header" if getattr(project, "cpp_language", "cpp") == "c" else "c++-header"
+            dep = pch_dir / (stub.name + ".d")
+            cmd = [cpp_path, *flags, "-x", lang, str(stub), "-o", str(pch_file), "-MMD", "-MF", str(dep)]
+            # GCC sucht <stub>.gch vor <stub>; -Winvalid-pch meldet unbrauchbare PCHs
+            use_flags = ["-include", str(stub), "-Winvalid-pch"]
+            extra_objects = []
+
+        cmd_hash = ObjectManifest.command_hash(cmd)
+        why = manifest.why_stale(pch_file, cmd_hash)
+        if why is None:
+            log_info(log_file, f"Precompiled Header aktuell: {pch_file}")
+            return pch_file, use_flags, extra_objects
+
+        log_info(log_file, f"Precompiled Header wird gebaut ({why}):")
+        log_info(log_file, " ".join(map(str, cmd)))
+        try:
+            run_streaming(cmd, log_file, check=True, encoding=encoding, errors="replace", backend="cpp")
+        except subprocess.CalledProcessError as e:
+            manifest.forget(pch_file)
+            manifest.save()
+            log_error(log_file, f"Precompiled Header failed (returncode {e.returncode}), letzte Ausgabe:")
+            log_error(log_file, e.stderr or e.stdout)
+            raise
+        try:
+            raw = dep.read_text(encoding="utf-8", errors="replace")
+            deps = parse_msvc_dependencies(raw) if is_msvc else parse_depfile(raw)
+        except OSError:
+            deps = []
+        manifest.record(pch_file, cmd_hash, deps or [str(header)])
+        manifest.save()
+        return pch_file, use_flags, extra_objects
@@ -1,14 +1,18 @@
-import subprocess
 import sys
 import shutil
 from pathlib import Path
 
+from .process_runner import run_streaming
+
 try:
-    from .extension_paths_loader import load_extensions_paths
+    from .extension_paths_loader import load_extensions_paths, which_tool
 except ImportError:
     def load_extensions_paths(log_file):
         return {}
 
+    def which_tool(*names):
+        return next(filter(None, map(shutil.which, names)), None)
+
 def log_warning(log_file, msg):
     border = "-" * 50
     log_file.write(f"{border}\n!!! WARNING: {msg}\n{border}\n")
@@ -56,7 +60,7 @@ class CPF0000000:
                 setattr(project, "pytest_path", pytest_candidate)
                 log_info(log_file, f"Set pytest_path from extensions: {pytest_candidate}")
         if not pytest_path:
-            pytest_path = shutil.which("pytest")
+            pytest_path = which_tool("pytest")
             if pytest_path:
                 log_info(log_file, f"Found pytest in PATH: {pytest_path}")
         if pytest_path:
@@ -103,18 +107,12 @@ class CPF0000000:
         log_info(log_file, " ".join(map(str, pytest_cmd)))
 
         try:
-            result = subprocess.run(
+            result = run_streaming(
                 pytest_cmd,
+                log_file,
                 cwd=str(target_path.parent if target_path.is_file() else target_path),
-                capture_output=True,
-                text=True,
-                check=False
+                backend="pytest",
             )
-            log_info(log_file, "Pytest-stdout:")
-            log_info(log_file, result.stdout)
-            if result.stderr:
-                log_warning(log_file, "Pytest-stderr:")
-                log_warning(log_file, result.stderr)
             if result.returncode != 0:
                 log_warning(log_file, f"Pytest beendete sich mit Rückgabewert {result.returncode}")
         except Exception as e:
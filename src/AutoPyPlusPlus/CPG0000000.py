@@ -1,11 +1,13 @@
 import subprocess
-import shutil
 from pathlib import Path
 import sys
 import os
 import shlex
 import importlib.util
 
+from .extension_paths_loader import which_tool
+from .process_runner import run_streaming
+
 def _ensure_log_handle(log_file):
     """Nimmt Pfad oder File-Objekt. Gibt (handle, must_close) zurück."""
     if hasattr(log_file, "write"):  # bereits ein offenes File-Objekt
@@ -100,7 +102,7 @@ class CPG0000000:
                         sphinx_cmd = [str(P)]
                         log_info(log_file, f"Nutze spezifisches sphinx-build: {P}")
                 else:
-                    found = shutil.which(cleaned)
+                    found = which_tool(cleaned)
                     if found:
                         sphinx_cmd = [found]
                         log_info(log_file, f"Gefunden per PATH-Auflösung: {found}")
@@ -113,7 +115,7 @@ class CPG0000000:
                 else:
                     # Fallback: PATH
                     for cand in ("sphinx-build", "sphinx-build.exe", "sphinx-build-3", "sphinx-build3"):
-                        p = shutil.which(cand)
+                        p = which_tool(cand)
                         if p:
                             sphinx_cmd = [p]
                             log_info(log_file, f"Found sphinx-build in PATH: {p}")
@@ -213,54 +215,33 @@ class CPG0000000:
             except Exception as e:
                 log_warning(log_file, f"CMD-Line-Sidecar konnte nicht geschrieben werden: {e}")
 
-            # 6. Timeout (Standard 600s, über project.sphinx_timeout konfigurierbar)
+            # 6. Timeout: project.sphinx_timeout, sonst Backend-Timeout "sphinx" (Standard 600s)
             timeout_s = getattr(project, "sphinx_timeout", None)
             if not isinstance(timeout_s, (int, float)) or timeout_s <= 0:
-                timeout_s = 600
+                timeout_s = None
 
             # stdout/stderr zusätzlich spiegeln
             stdout_file = build_path.parent / "sphinx_stdout.log"
             stderr_file = build_path.parent / "sphinx_stderr.log"
 
             try:
-                result = subprocess.run(
+                # Ausgabe wird live ins Log und in die Sidecar-Dateien geschrieben
+                result = run_streaming(
                     sphinx_cmd,
+                    log_file,
                     cwd=str(source_path),
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                    timeout=timeout_s
+                    timeout=timeout_s,
+                    backend="sphinx",
+                    stdout_file=stdout_file,
+                    stderr_file=stderr_file,
                 )
-                log_info(log_file, "Sphinx stdout:")
-                log_info(log_file, result.stdout if result.stdout else "(kein stdout)")
-                log_warning(log_file, "Sphinx stderr:")
-                log_warning(log_file, result.stderr if result.stderr else "(kein stderr)")
-
-                # Sidecar-Logs schreiben
-                try:
-                    stdout_file.write_text(result.stdout or "", encoding="utf-8")
-                    stderr_file.write_text(result.stderr or "", encoding="utf-8")
-                except Exception as e:
-                    log_warning(log_file, f"stdout/stderr Sidecar konnte nicht geschrieben werden: {e}")
 
                 if result.returncode != 0:
                     log_error(log_file, f"Sphinx-Build fehlgeschlagen (rc={result.returncode})")
                     raise RuntimeError(f"sphinx-build failed (rc={result.returncode})")
 
             except subprocess.TimeoutExpired as e:
-                log_error(log_file, f"Sphinx-Build Timeout nach {timeout_s} Sekunden.")
-                if e.stdout:
-                    log_warning(log_file, "Partielles stdout (Timeout):")
-                    log_warning(log_file, e.stdout)
-                if e.stderr:
-                    log_warning(log_file, "Partielles stderr (Timeout):")
-                    log_warning(log_file, e.stderr)
-                # Sidecar auch bei Timeout
-                try:
-                    stdout_file.write_text(e.stdout or "", encoding="utf-8")
-                    stderr_file.write_text(e.stderr or "", encoding="utf-8")
-                except Exception:
-                    pass
+                log_error(log_file, f"Sphinx-Build Timeout nach {e.timeout:.0f} Sekunden.")
                 raise
 
             except Exception as e:
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import sys
-import shutil
 import subprocess
 from pathlib import Path
 import shlex
 
-from .extension_paths_loader import load_extensions_paths
+from .extension_paths_loader import load_extensions_paths, which_tool
 from .project import Project
+from .process_runner import fan_out, report_artifacts, run_streaming, report_progress
 
 
 def log_warning(log_file, msg):
@@ -36,6 +38,87 @@ def _format_cmd(cmd: list[str]) -> str:
     return shlex.join(list(map(str, cmd)))
 
 
+MANIFEST_NAME = ".mpycross-manifest.json"
+_MANIFEST_VERSION = 1
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class MpyManifest:
+    """
+    Merkt sich pro Quelle (mtime_ns, size, sha256) des letzten erfolgreichen mpy-cross-Laufs.
+
+    Eine .mpy gilt als aktuell, wenn sie existiert, die Flags (mpy-cross, -march, -O, Extra-Optionen)
+    gleich geblieben sind und die Quelle unverändert ist. mtime/size sind der schnelle Pfad,
+    bei Abweichung entscheidet der Hash (z. B. nach git checkout mit neuer mtime).
+    """
+
+    def __init__(self, path: Path, flags: str) -> None:
+        self.path = path
+        self.flags = flags
+        self.files: dict[str, dict] = {}
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == _MANIFEST_VERSION and data.get("flags") == flags:
+                self.files = dict(data.get("files") or {})
+            else:
+                self.dirty = True  # Flags geändert -> alles neu
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def is_current(self, src: Path, target: Path) -> bool:
+        entry = self.files.get(str(src))
+        if not entry or entry.get("target") != str(target) or not target.is_file():
+            return False
+        try:
+            st = src.stat()
+        except OSError:
+            return False
+        if entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            return True
+        if entry.get("sha256") == _sha256_file(src):
+            # nur die mtime hat sich geändert
+            entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+            self.dirty = True
+            return True
+        return False
+
+    def record(self, src: Path, target: Path) -> None:
+        st = src.stat()
+        self.files[str(src)] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": _sha256_file(src),
+            "target": str(target),
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        # Einträge gelöschter Quellen entfernen
+        dropped = [k for k in self.files if not Path(k).is_file()]
+        for k in dropped:
+            del self.files[k]
+        self.dirty = self.dirty or bool(dropped)
+        if not self.dirty:
+            return
+        data = {"version": _MANIFEST_VERSION, "flags": self.flags, "files": self.files}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
 class CPH0000000:
     """
     MicroPython mpy-cross Stage.
@@ -85,7 +168,7 @@ class CPH0000000:
             log_warning(log_file, f"extensions_paths mpy-cross invalid: {cand}")
 
         # 3) PATH
-        which = shutil.which("mpy-cross")
+        which = which_tool("mpy-cross")
         if which:
             log_info(log_file, f"Found mpy-cross in PATH: {which}")
             return which
@@ -114,7 +197,7 @@ class CPH0000000:
                 log_error(log_file, f"mpy_compile_dir is not a directory: {base}")
                 raise NotADirectoryError(f"mpy_compile_dir is not a directory: {base}")
 
-            for py in base.rglob("*.py"):
+            for py in sorted(base.rglob("*.py")):
                 if exclude_glob and py.match(exclude_glob):
                     continue
                 yield py, base
@@ -132,6 +215,88 @@ class CPH0000000:
 
         yield p, p.parent
 
+    @staticmethod
+    def _target_for(src: Path, base_dir: Path, out_dir: Path | None) -> Path:
+        # default output: neben src oder in output_dir (mit Struktur)
+        if out_dir:
+            return (out_dir / src.relative_to(base_dir)).with_suffix(".mpy")
+        return src.with_suffix(".mpy")
+
+    @staticmethod
+    def _command(mpy_cross: str, arch, opt, extra_opts: list[str], src: Path, target_path: Path) -> list[str]:
+        cmd: list[str] = [mpy_cross]
+
+        if arch:
+            cmd.append(f"-march={arch}")
+
+        if isinstance(opt, int):
+            # mpy-cross akzeptiert üblicherweise -O0..-O3
+            cmd.append(f"-O{max(0, min(3, opt))}")
+
+        # Output file
+        cmd += ["-o", str(target_path)]
+
+        # Extra opts (unvalidated passthrough)
+        cmd += extra_opts
+
+        # Source file
+        cmd.append(str(src))
+        return cmd
+
+    @staticmethod
+    def _flags_fingerprint(mpy_cross: str, arch, opt, extra_opts: list[str]) -> str:
+        """Alles, was den Inhalt der .mpy beeinflusst, außer der Quelle selbst."""
+        try:
+            st = Path(mpy_cross).stat()
+            tool = [str(Path(mpy_cross).resolve()), st.st_size, st.st_mtime_ns]
+        except OSError:
+            tool = [mpy_cross]
+        opt_flag = max(0, min(3, opt)) if isinstance(opt, int) else None
+        return json.dumps([tool, arch or "", opt_flag, list(extra_opts)])
+
+    @staticmethod
+    def _worker_count(project: Project, n_files: int) -> int:
+        """mpy_jobs (0 = alle Kerne), begrenzt auf die Zahl der Dateien."""
+        try:
+            jobs = int(getattr(project, "mpy_jobs", 0) or 0)
+        except (TypeError, ValueError):
+            jobs = 0
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        return max(1, min(jobs, n_files))
+
+    @staticmethod
+    def _compile_one(cmd: list[str], src: Path, target_path: Path, log) -> None:
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        log_info(log, f"mpy-cross compiling: {src}")
+        log_info(log, f"Command: {_format_cmd(cmd)}")
+
+        # mpy-cross schreibt gerne alles nach stderr; landet im Puffer der Datei
+        res = run_streaming(cmd, log, cwd=str(src.parent), backend="mpy")
+        if res.returncode != 0:
+            log_error(log, f"mpy-cross failed (rc={res.returncode}) for: {src}")
+            raise subprocess.CalledProcessError(res.returncode, cmd, output=res.stdout, stderr=res.stderr)
+        log_info(log, f"OK: {target_path}")
+
+    @staticmethod
+    def _raise_aggregated(failures: list[tuple[Path, Exception]], total: int, log_file) -> None:
+        lines = []
+        for src, e in failures:
+            if isinstance(e, subprocess.CalledProcessError):
+                detail = (e.stderr or "").strip().splitlines()
+                lines.append(f"  {src}: rc={e.returncode}" + (f" - {detail[-1]}" if detail else ""))
+            else:
+                lines.append(f"  {src}: {type(e).__name__}: {e}")
+        log_error(log_file, f"mpy-cross failed for {len(failures)} of {total} file(s):\n" + "\n".join(lines))
+
+        first = failures[0][1]
+        if not isinstance(first, subprocess.CalledProcessError):
+            raise first
+        stderr = "\n".join(
+            (e.stderr or "") for _, e in failures if isinstance(e, subprocess.CalledProcessError)
+        )
+        raise subprocess.CalledProcessError(first.returncode, first.cmd, output=first.output, stderr=stderr)
+
     @staticmethod
     def run_mpycross(project: Project, log_file) -> None:
         mpy_cross = CPH0000000._resolve_mpy_cross(project, log_file)
@@ -150,61 +315,53 @@ class CPH0000000:
         except Exception:
             extra_opts = extra.split() if extra else []
 
-        compiled = 0
-
-        for src, base_dir in CPH0000000._iter_sources(project, log_file):
-            # default output: neben src oder in output_dir (mit Struktur)
-            if out_dir:
-                rel = src.relative_to(base_dir)
-                target_path = (out_dir / rel).with_suffix(".mpy")
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-            else:
-                target_path = src.with_suffix(".mpy")
-
-            cmd: list[str] = [mpy_cross]
-
-            if arch:
-                cmd.append(f"-march={arch}")
+        sources = list(CPH0000000._iter_sources(project, log_file))
+        jobs = [(src, CPH0000000._target_for(src, base_dir, out_dir)) for src, base_dir in sources]
+
+        manifest = None
+        if getattr(project, "mpy_incremental", True) and jobs:
+            manifest_dir = out_dir or sources[0][1]
+            manifest = MpyManifest(
+                manifest_dir / MANIFEST_NAME,
+                CPH0000000._flags_fingerprint(mpy_cross, arch, opt, extra_opts),
+            )
+            stale = [(src, target) for src, target in jobs if not manifest.is_current(src, target)]
+            log_info(log_file, f"mpy-cross incremental: {len(stale)} of {len(jobs)} file(s) out of date")
+        else:
+            stale = jobs
+
+        workers = CPH0000000._worker_count(project, len(stale))
+        if stale:
+            log_info(log_file, f"mpy-cross: {len(stale)} file(s) on {workers} worker(s)")
 
-            if isinstance(opt, int):
-                # mpy-cross akzeptiert üblicherweise -O0..-O3
-                cmd.append(f"-O{max(0, min(3, opt))}")
-
-            # Output file
-            cmd += ["-o", str(target_path)]
-
-            # Extra opts (unvalidated passthrough)
-            cmd += extra_opts
-
-            # Source file
-            cmd.append(str(src))
-
-            log_info(log_file, f"mpy-cross compiling: {src}")
-            log_info(log_file, f"Command: {_format_cmd(cmd)}")
-
-            try:
-                res = subprocess.run(
-                    cmd,
-                    cwd=str(src.parent),
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                if res.stdout:
-                    log_info(log_file, f"stdout:\n{res.stdout}")
-                if res.stderr:
-                    # mpy-cross schreibt gerne alles nach stderr; daher WARNING statt ERROR
-                    log_warning(log_file, f"stderr:\n{res.stderr}")
-
-                if res.returncode != 0:
-                    log_error(log_file, f"mpy-cross failed (rc={res.returncode}) for: {src}")
-                    raise subprocess.CalledProcessError(res.returncode, cmd, output=res.stdout, stderr=res.stderr)
-
-                compiled += 1
-                log_info(log_file, f"OK: {target_path}")
-
-            except Exception as e:
-                log_error(log_file, f"Unexpected error during mpy-cross: {e}")
-                raise
-
-        log_info(log_file, f"Finished. Compiled {compiled} file(s) with mpy-cross.")
+        compiled = 0
+        failures: list[tuple[Path, Exception]] = []
+        try:
+            def task(job, buf):
+                src, target_path = job
+                cmd = CPH0000000._command(mpy_cross, arch, opt, extra_opts, src, target_path)
+                CPH0000000._compile_one(cmd, src, target_path, buf)
+
+            for (src, target_path), text, error in fan_out(stale, task, workers, name="mpy-cross"):
+                # Ausgabe je Datei in Quellreihenfolge, unabhängig von der Fertigstellung
+                log_file.write(text)
+                if error is None:
+                    compiled += 1
+                    if manifest is not None:
+                        manifest.record(src, target_path)
+                else:
+                    failures.append((src, error))
+                report_progress((compiled + len(failures)) / max(1, len(stale)))
+        finally:
+            # auch nach einem Fehler: erfolgreich übersetzte Dateien nicht erneut bauen
+            if manifest is not None:
+                manifest.save()
+
+        if failures:
+            CPH0000000._raise_aggregated(failures, len(stale), log_file)
+        report_artifacts("mpy", *(target for _, target in jobs))
+
+        log_info(
+            log_file,
+            f"Finished. Compiled {compiled} file(s) with mpy-cross, {len(jobs) - len(stale)} up to date.",
+        )
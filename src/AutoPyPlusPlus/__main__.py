@@ -1,5 +1,10 @@
 # __main__.py
-from .main import main
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Headless: python -m AutoPyPlusPlus build <file.apyscript> ... (ohne tkinter)
+        from .cli import main as cli_main
+        sys.exit(cli_main())
+    from .main import main
     main()
\ No newline at end of file
@@ -0,0 +1,372 @@
+# buildcache.py
+from __future__ import annotations
+
+import ast
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import site
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .project import Project
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_MB = 2048
+
+# Project fields that do not influence the build result
+_VOLATILE_FIELDS = {
+    "compile_selected", "compile_a_selected", "compile_b_selected", "compile_c_selected",
+    "is_divider", "divider_label", "display_script", "depends_on",
+    # parallelism/timeouts only, do not change the artifacts
+    "nuitka_jobs", "sphinx_parallel", "build_timeout_s", "mpy_incremental", "mpy_jobs", "cython_incremental", "cython_jobs",
+    "cpp_jobs", "compiler_cache",
+}
+
+_SOURCE_SUFFIXES = (".py", ".pyw", ".pyx", ".pxd", ".pxi")
+
+
+def default_cache_dir() -> Path:
+    """%LOCALAPPDATA%\\AutoPyPlusPlus\\buildcache (Windows) or ~/.cache/AutoPyPlusPlus/buildcache."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "AutoPyPlusPlus" / "buildcache"
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(path: str | Path | None) -> str:
+    """Cheap identity of an executable/interpreter: path + size + mtime."""
+    if not path:
+        return ""
+    try:
+        st = Path(path).stat()
+        return f"{Path(path)}|{st.st_size}|{st.st_mtime_ns}"
+    except OSError:
+        return f"{path}|missing"
+
+
+# =====================================================================
+#                     Source tree fingerprint
+# =====================================================================
+
+def _local_imports(py_file: Path, root: Path) -> List[Path]:
+    """Resolves imports of py_file that point to modules inside root."""
+    try:
+        tree = ast.parse(py_file.read_text(encoding="utf-8", errors="replace"))
+    except (SyntaxError, ValueError, OSError):
+        return []
+
+    names: List[Tuple[str, int]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend((a.name, 0) for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            mod = node.module or ""
+            names.append((mod, node.level))
+            names.extend((f"{mod}.{a.name}" if mod else a.name, node.level) for a in node.names)
+
+    found: List[Path] = []
+    for name, level in names:
+        base = root if level == 0 else py_file.parent
+        for _ in range(max(0, level - 1)):
+            base = base.parent
+        rel = Path(*name.split(".")) if name else Path()
+        for cand in (base / rel.with_suffix(".py") if name else None, base / rel / "__init__.py"):
+            if cand is not None and cand.is_file():
+                found.append(cand.resolve())
+                break
+    return found
+
+
+def _iter_tree_files(path: Path) -> Iterable[Path]:
+    if path.is_file():
+        yield path
+    elif path.is_dir():
+        for p in sorted(path.rglob("*")):
+            if p.is_file() and "__pycache__" not in p.parts:
+                yield p
+
+
+def source_files(project: Project) -> List[Path]:
+    """Script + local import closure + every input file referenced by the project."""
+    files: Dict[str, Path] = {}
+
+    def add(p) -> None:
+        if not p:
+            return
+        for f in _iter_tree_files(Path(str(p))):
+            files.setdefault(str(f.resolve()), f.resolve())
+
+    script = Path(project.script).resolve() if project.script else None
+    if script and script.is_file():
+        root = script.parent
+        queue = [script]
+        while queue:
+            cur = queue.pop()
+            if str(cur) in files:
+                continue
+            files[str(cur)] = cur
+            if cur.suffix in (".py", ".pyw"):
+                queue.extend(_local_imports(cur, root))
+        if script.suffix in (".pyx", ".pxd"):
+            for f in root.iterdir():
+                if f.suffix in (".pxd", ".pxi"):
+                    add(f)
+        setup_py = root / "setup.py"
+        if getattr(project, "use_cython", False) and setup_py.is_file():
+            add(setup_py)
+
+    if getattr(project, "use_cython", False) and getattr(project, "cython_package_dir", ""):
+        add(project.cython_package_dir)
+
+    for attr in ("icon", "version", "runtime_hook", "splash", "spec_file",
+                 "nuitka_windows_icon", "nuitka_windows_splash", "cpp_pch_header"):
+        value = getattr(project, attr, "")
+        if value and Path(str(value)).is_file():
+            add(value)
+
+    for token in re.split(r"[;\r\n]+", str(getattr(project, "add_data", "") or "")):
+        t = token.strip().strip('"').strip("'")
+        if ":" in t and not t.endswith(":"):
+            t = t.rsplit(":", 1)[0]
+        if t and Path(t).exists():
+            add(t)
+
+    for f in getattr(project, "cpp_compile_files", None) or []:
+        add(f)
+    for f in getattr(project, "additional_files", None) or []:
+        add(f)
+    if getattr(project, "use_mpycross", False) and getattr(project, "mpy_compile_dir", ""):
+        for f in _iter_tree_files(Path(project.mpy_compile_dir)):
+            if f.suffix == ".py":
+                add(f)
+    if getattr(project, "include_pyarmor_runtime", False):
+        add(getattr(project, "pyarmor_runtime_dir", ""))
+
+    return [files[k] for k in sorted(files)]
+
+
+def _site_packages_fingerprint() -> List[str]:
+    """Directory mtimes of site-packages change whenever packages are (un)installed."""
+    dirs: List[str] = []
+    try:
+        dirs.extend(site.getsitepackages())
+    except Exception:
+        pass
+    try:
+        dirs.append(site.getusersitepackages())
+    except Exception:
+        pass
+    return [file_fingerprint(d) for d in sorted(set(dirs)) if Path(d).is_dir()]
+
+
+def _tool_fingerprint(cmd: List[str]) -> List[str]:
+    if not cmd:
+        return []
+    parts = [file_fingerprint(cmd[0])]
+    # python -m <tool>: identify the module installation as well
+    if len(cmd) >= 3 and cmd[1] == "-m":
+        try:
+            if Path(cmd[0]).resolve() == Path(sys.executable).resolve():
+                import importlib.util
+                spec = importlib.util.find_spec(cmd[2].split(".")[0])
+                if spec and spec.origin:
+                    parts.append(file_fingerprint(Path(spec.origin).parent))
+        except Exception:
+            pass
+    return parts
+
+
+def compute_cache_key(project: Project, routes: List[str], commands: Dict[str, List[str]]) -> str:
+    """
+    Content hash over everything that determines the build result:
+    source files, project options, resolved command lines, tool/interpreter identity.
+    """
+    h = hashlib.sha256()
+
+    def feed(obj) -> None:
+        h.update(json.dumps(obj, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+
+    feed({"format": CACHE_FORMAT, "routes": routes, "platform": sys.platform})
+    options = project.to_dict() if hasattr(project, "to_dict") else dict(vars(project))
+    feed({k: v for k, v in options.items() if k not in _VOLATILE_FIELDS})
+    for route in sorted(commands):
+        cmd = [str(c) for c in commands[route] if not str(c).startswith("--jobs")]
+        feed({"route": route, "cmd": cmd})
+        feed(_tool_fingerprint(commands[route]))
+    feed([file_fingerprint(sys.executable), getattr(project, "python_exec_path", "") or ""])
+    feed(_site_packages_fingerprint())
+    for f in source_files(project):
+        try:
+            feed([str(f), _sha256_file(f)])
+        except OSError:
+            feed([str(f), "unreadable"])
+    return h.hexdigest()
+
+
+# =====================================================================
+#                     Content-addressed store with LRU
+# =====================================================================
+
+class BuildCache:
+    """
+    Local content-addressed artifact cache.
+
+    Layout:
+        <root>/objects/ab/abcdef...   file blobs (sha256 of content)
+        <root>/index.json             {entries: {key: {...}}, blobs: {sha: size}}
+
+    Entries are evicted least-recently-used until the blob store fits max_bytes.
+    Thread-safe for the worker threads of one compile_projects() run.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_mb: int = DEFAULT_MAX_MB) -> None:
+        self.root = Path(root) if root else default_cache_dir()
+        self.max_bytes = max(1, int(max_mb)) * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: Optional[dict] = None
+
+    # ---------------- index ----------------
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _load(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+            self._index.setdefault("entries", {})
+            self._index.setdefault("blobs", {})
+        return self._index
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(self._load()["blobs"].values())
+
+    # ---------------- public API ----------------
+    def restore(self, key: str, log_write: Callable[[str], None] = lambda s: None) -> bool:
+        """Copies the artifacts of key back to their original location. False on miss."""
+        with self._lock:
+            entry = self._load()["entries"].get(key)
+            if entry is None:
+                self.misses += 1
+                return False
+            files = dict(entry["files"])
+        try:
+            for dest, digest in files.items():
+                blob = self._blob_path(digest)
+                dest_path = Path(dest)
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dest_path.with_name(dest_path.name + ".apycache.tmp")
+                shutil.copy2(blob, tmp)
+                os.replace(tmp, dest_path)
+        except OSError as e:
+            log_write(f"--- WARNING: Build cache entry {key[:12]} unusable ({e}), rebuilding\n")
+            with self._lock:
+                self._load()["entries"].pop(key, None)
+                self.misses += 1
+                self._save()
+            return False
+        with self._lock:
+            index = self._load()
+            if key in index["entries"]:
+                index["entries"][key]["last_used"] = time.time()
+            self.hits += 1
+            self._save()
+        log_write(f"--- INFO: Build cache hit {key[:12]}: restored {len(files)} file(s)\n")
+        return True
+
+    def store(self, key: str, files: List[Path], log_write: Callable[[str], None] = lambda s: None) -> None:
+        blobs: Dict[str, int] = {}
+        mapping: Dict[str, str] = {}
+        for f in files:
+            try:
+                digest = _sha256_file(f)
+                blob = self._blob_path(digest)
+                if not blob.exists():
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = blob.with_suffix(".tmp")
+                    shutil.copy2(f, tmp)
+                    os.replace(tmp, blob)
+                blobs[digest] = f.stat().st_size
+                mapping[str(f.resolve())] = digest
+            except OSError as e:
+                log_write(f"--- WARNING: Build cache could not store {f}: {e}\n")
+                return
+        with self._lock:
+            index = self._load()
+            index["blobs"].update(blobs)
+            now = time.time()
+            index["entries"][key] = {
+                "files": mapping,
+                "size": sum(blobs.values()),
+                "created": now,
+                "last_used": now,
+            }
+            self._evict(keep=key)
+            self._save()
+        log_write(f"--- INFO: Build cache stored {key[:12]}: {len(mapping)} file(s)\n")
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._index = None
+
+    # ---------------- eviction ----------------
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """LRU eviction; caller holds the lock."""
+        index = self._index
+        entries, blobs = index["entries"], index["blobs"]
+        total = sum(blobs.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entries.pop(key)
+            referenced = {d for e in entries.values() for d in e["files"].values()}
+            for digest in [d for d in blobs if d not in referenced]:
+                try:
+                    self._blob_path(digest).unlink()
+                except OSError:
+                    pass
+                total -= blobs.pop(digest)
+
+
+# =====================================================================
+#                     Helpers for compile_single()
+# =====================================================================
+
+def quiet_log() -> io.StringIO:
+    """Throw-away log handle for command resolution during key computation."""
+    return io.StringIO()
@@ -0,0 +1,321 @@
+# buildlog.py
+from __future__ import annotations
+
+import json
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .logindex import SIDECAR_SUFFIX, SidecarWriter
+
+# Zeilen der log_info/log_warning/log_error-Helfer in den CP*-Modulen
+_LEVEL_RX = re.compile(r"^(?:\[\d\d:\d\d:\d\d\] )?(?:\[[^\]]*\] )?(?:stderr: )?(--- INFO|!!! WARNING|### ERROR):\s?(.*)$")
+_LEVELS = {"--- INFO": "info", "!!! WARNING": "warning", "### ERROR": "error"}
+
+_INDEX_INTERVAL_S = 0.5     # Log-Index (<log>.idx) höchstens so oft nachführen
+
+# Queue-Nachrichten: (kind, project, payload)
+_WRITE, _BEGIN, _END, _EVENT, _SYNC, _STOP = range(6)
+
+
+class ProjectLogSink:
+    """
+    File-ähnliches Objekt für ein Projekt. write() legt den Text nur in die Queue
+    des LogHub, flush() ist ein No-op: kein Lock und kein I/O im Worker-Thread.
+    """
+
+    queued = True  # run_streaming schreibt ohne eigenen Lock/flush()
+
+    def __init__(self, hub: "LogHub", project: Optional[str]) -> None:
+        self._hub = hub
+        self.project = project
+        self.name = hub.name
+
+    def write(self, s: str) -> int:
+        if s:
+            self._hub._queue.put((_WRITE, self.project, s))
+        return len(s)
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    def event(self, kind: str, **data) -> None:
+        self._hub.event(self.project, kind, **data)
+
+
+class _ProjectStream:
+    """Laufende Ausgabe eines Projekts: Zeilenrest bis zum nächsten "\n", Projektdatei, Stages."""
+
+    def __init__(self, project: str, path: Optional[Path]) -> None:
+        self.tag = f"[{project}] "
+        # Tool-Zeilen aus run_streaming tragen das Präfix schon ("[12:00:00] [name] ...")
+        self._tagged = re.compile(r"^(?:\[\d\d:\d\d:\d\d\] )?" + re.escape(self.tag))
+        self.partial = ""
+        self.start = 0                  # Zeile des Startmarkers im Haupt-Log (1-basiert)
+        self.stages: list[list] = []    # [[Stage, Zeile im Haupt-Log], ...]
+        self.pending: list[str] = []    # Stages, deren erste Zeile noch aussteht
+        self.file = None
+        if path is not None:
+            try:
+                path.parent.mkdir(exist_ok=True)
+                self.file = open(path, "a", encoding="utf-8")
+            except OSError:
+                self.file = None
+
+    def complete_lines(self, s: str) -> str:
+        """Abgeschlossene Zeilen aus Zeilenrest + s; der neue Rest wartet auf sein "\n"."""
+        text = self.partial + s
+        cut = text.rfind("\n") + 1
+        self.partial = text[cut:]
+        return text[:cut]
+
+    def prefixed(self, text: str) -> str:
+        """Zeilen mit Projekt-Präfix fürs Haupt-Log (text endet mit "\n")."""
+        return "".join(l if self._tagged.match(l) else self.tag + l for l in text.splitlines(True))
+
+    def close(self) -> None:
+        if self.file is not None:
+            try:
+                self.file.close()
+            except Exception:
+                pass
+            self.file = None
+
+
+class LogHub:
+    """
+    Hintergrund-Writer für compile_projects().
+
+    - sink(name) liefert einen ProjectLogSink; jede abgeschlossene Zeile landet sofort mit
+      Präfix "[name] " im Haupt-Log (parallele Projekte wechseln sich zeilenweise ab) und
+      unverändert in <log>.projects/<name>.log, der zusammenhängenden Sicht pro Projekt.
+    - main ist der Sink ohne Projekt (direkt, in Reihenfolge ins Haupt-Log).
+    - events_path (optional): JSON-Lines-Ereignisstrom (start/end, Warnungen, Fehler).
+    - index_path (optional): Log-Index für den Debug-Inspector (logindex.SidecarWriter:
+      Zeilen-Offsets, Fehler-/Warnzeilen, Projekt- und Stage-Grenzen), laufend nachgeführt.
+
+    Nur der Writer-Thread schreibt in log_file.
+    """
+
+    def __init__(self, log_file, events_path: Optional[str] = None, index_path: Optional[str] = None) -> None:
+        self.log_file = log_file
+        self.name = getattr(log_file, "name", None)
+        self.events_path = events_path
+        self.projects_dir = projects_dir_for(log_file)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._streams: Dict[str, _ProjectStream] = {}
+        self._events = None
+        if events_path:
+            try:
+                self._events = open(events_path, "a", encoding="utf-8")
+            except OSError:
+                self._events = None
+        self._sidecar: Optional[SidecarWriter] = None
+        self._indexed_at = 0.0
+        self._lines = 0  # abgeschlossene Zeilen im Haupt-Log (für Projekt-/Stage-Grenzen im Index)
+        if index_path and self.name:
+            try:
+                log_file.flush()
+                self._sidecar = SidecarWriter(self.name, index_path)
+                self._lines = self._sidecar.update()
+            except Exception:
+                self._sidecar = None
+        self.main = ProjectLogSink(self, None)
+        self._thread = threading.Thread(target=self._run, name="LogHub", daemon=True)
+        self._thread.start()
+
+    # ---------------- API (beliebige Threads) ----------------
+    def sink(self, project: str) -> ProjectLogSink:
+        return ProjectLogSink(self, project)
+
+    def begin(self, project: str) -> None:
+        self._queue.put((_BEGIN, project, time.time()))
+
+    def end(self, project: str, **data) -> None:
+        self._queue.put((_END, project, data))
+
+    def event(self, project: Optional[str], kind: str, **data) -> None:
+        self._queue.put((_EVENT, project, dict(data, kind=kind)))
+
+    def sync(self, timeout: Optional[float] = None) -> None:
+        """Wartet, bis alles bis hierher Eingereihte geschrieben ist."""
+        done = threading.Event()
+        self._queue.put((_SYNC, None, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put((_STOP, None, None))
+            self._thread.join()
+
+    # ---------------- Writer-Thread ----------------
+    def _emit(self, project: Optional[str], data: dict) -> None:
+        if self._events is None:
+            return
+        rec = {"ts": round(time.time(), 3), "project": project}
+        rec.update(data)
+        self._events.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+
+    def _scan_levels(self, project: Optional[str], text: str) -> None:
+        """Erkennt INFO/WARNING/ERROR-Zeilen der Log-Helfer für den Ereignisstrom."""
+        if self._events is None:
+            return
+        for line in text.split("\n"):
+            m = _LEVEL_RX.match(line)
+            if m and _LEVELS[m.group(1)] != "info":
+                self._emit(project, {"kind": _LEVELS[m.group(1)], "message": m.group(2)[:2000]})
+
+    def _update_index(self, force: bool = False) -> None:
+        """Log-Index bis zum (geflushten) Dateiende nachführen."""
+        if self._sidecar is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._indexed_at < _INDEX_INTERVAL_S:
+            return
+        self._indexed_at = now
+        try:
+            self._sidecar.update()
+        except Exception:
+            # ohne Index öffnet der Inspector das Log wie bisher per Scan
+            self._close_index()
+
+    def _close_index(self) -> None:
+        if self._sidecar is not None:
+            try:
+                self._sidecar.close()
+            except Exception:
+                pass
+            self._sidecar = None
+
+    def _write(self, text: str) -> None:
+        self.log_file.write(text)
+        self._lines += text.count("\n")
+
+    def _write_project(self, project: str, stream: _ProjectStream, s: str) -> None:
+        if stream.file is not None:
+            stream.file.write(s)
+        text = stream.complete_lines(s)
+        if not text:
+            return
+        if stream.pending:
+            # Stage beginnt mit der nächsten Zeile dieses Projekts
+            stream.stages.extend([name, self._lines + 1] for name in stream.pending)
+            stream.pending.clear()
+        self._write(stream.prefixed(text))
+        self._scan_levels(project, text)
+
+    def _begin(self, project: str) -> _ProjectStream:
+        path = None
+        if self.projects_dir is not None:
+            path = self.projects_dir / (re.sub(r"[^\w.-]+", "_", project) + ".log")
+        stream = self._streams[project] = _ProjectStream(project, path)
+        stream.start = self._lines + 1
+        self._write(f"===== [{project}] =====\n")
+        return stream
+
+    def _end(self, project: str, stream: _ProjectStream, marker: str, **data) -> None:
+        """Zeilenrest ausgeben, Endmarker schreiben und das Projekt im Log-Index festhalten."""
+        if stream.partial:
+            self._write_project(project, stream, "\n")
+        self._write(f"===== [{project}] {marker} =====\n")
+        stream.close()
+        if self._sidecar is not None:
+            self._flush()
+            self._update_index(force=True)
+            try:
+                self._sidecar.section(project, stream.start, self._lines, stages=stream.stages, **data)
+            except Exception:
+                self._close_index()
+
+    def _run(self) -> None:
+        while True:
+            kind, project, payload = self._queue.get()
+            try:
+                if kind == _WRITE:
+                    if project is None:
+                        self._write(payload)
+                        self._scan_levels(None, payload)
+                    else:
+                        stream = self._streams.get(project) or self._begin(project)
+                        self._write_project(project, stream, payload)
+                elif kind == _BEGIN:
+                    if project not in self._streams:
+                        self._begin(project)
+                    self._emit(project, {"kind": "start"})
+                elif kind == _END:
+                    stream = self._streams.pop(project, None)
+                    if stream is not None:
+                        self._end(project, stream, "end", state=payload.get("state"))
+                    self._emit(project, dict(payload, kind="end"))
+                elif kind == _EVENT:
+                    if payload.get("kind") == "stage" and project in self._streams:
+                        self._streams[project].pending.append(str(payload.get("stage")))
+                    self._emit(project, payload)
+                elif kind == _SYNC:
+                    self._flush()
+                    self._update_index(force=True)
+                    payload.set()
+                elif kind == _STOP:
+                    # Projekte ohne end() (z. B. Abbruch) abschließen
+                    for name, stream in list(self._streams.items()):
+                        self._end(name, stream, "incomplete", state="incomplete")
+                    self._streams.clear()
+                    self._flush()
+                    self._update_index(force=True)
+                    self._close_index()
+                    if self._events is not None:
+                        self._events.close()
+                        self._events = None
+                    return
+                if self._queue.empty():
+                    self._flush()
+                    self._update_index()
+            except Exception:
+                # Logging darf den Build nie abbrechen
+                pass
+
+    def _flush(self) -> None:
+        for f in (self.log_file, self._events, *(st.file for st in self._streams.values())):
+            try:
+                if f is not None:
+                    f.flush()
+            except Exception:
+                pass
+
+
+def events_path_for(log_file) -> Optional[str]:
+    """<log>.events.jsonl neben einem echten Log-File, sonst None."""
+    name = getattr(log_file, "name", None)
+    if isinstance(name, str) and name and not name.startswith("<"):
+        return name + ".events.jsonl"
+    return None
+
+
+def index_path_for(log_file) -> Optional[str]:
+    """<log>.idx (Log-Index für den Debug-Inspector) neben einem echten Log-File, sonst None."""
+    name = getattr(log_file, "name", None)
+    if isinstance(name, str) and name and not name.startswith("<"):
+        return name + SIDECAR_SUFFIX
+    return None
+
+
+def projects_dir_for(log_file) -> Optional[Path]:
+    """<log>.projects/ (Ausgabe je Projekt) neben einem echten Log-File, sonst None."""
+    name = getattr(log_file, "name", None)
+    if isinstance(name, str) and name and not name.startswith("<"):
+        return Path(name + ".projects")
+    return None
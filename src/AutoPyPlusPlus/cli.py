@@ -0,0 +1,221 @@
+# cli.py
+"""
+Headless Build ohne Tk (CI-Worker ohne Display, Shards):
+
+    python -m AutoPyPlusPlus build projects.apyscript --mode A --jobs 4
+    python -m AutoPyPlusPlus build projects.apyscript --mode B --no-cache --summary build.json
+
+Lädt die Projekte über core.load_projects und startet compiler.compile_projects.
+Am Ende steht eine JSON-Zusammenfassung auf stdout (oder in --summary), Statusmeldungen
+gehen nach stderr. Exit-Codes: siehe EXIT_*.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+EXIT_OK = 0          # alle ausgewählten Projekte gebaut
+EXIT_FAILED = 1      # mindestens ein Projekt fehlgeschlagen/übersprungen
+EXIT_USAGE = 2       # falsche Argumente, Projektdatei nicht lesbar, Abhängigkeitsfehler
+EXIT_NOTHING = 3     # keine Projekte im gewählten Modus ausgewählt
+EXIT_CANCELLED = 130  # Ctrl+C / SIGTERM
+
+COMPILERS = ("auto", "pyinstaller", "pyarmor", "nuitka", "cython", "mpy", "both")
+
+
+def _selected(projects, mode: str) -> list:
+    flag = {"A": "compile_a_selected", "B": "compile_b_selected", "C": "compile_c_selected"}[mode]
+    return [p for p in projects if not getattr(p, "is_divider", False) and getattr(p, flag, False)]
+
+
+def auto_compiler(selected) -> str:
+    """Wie GUI.compile_all: einheitlicher Compiler nur, wenn alle Projekte gleich konfiguriert sind."""
+    def only(attr):
+        return all(
+            getattr(p, attr, False)
+            and not any(getattr(p, o, False) for o in ("use_pyarmor", "use_nuitka", "use_cython") if o != attr)
+            for p in selected
+        )
+    for name in ("pyarmor", "nuitka", "cython"):
+        if only(f"use_{name}"):
+            return name
+    if all(getattr(p, "use_mpycross", False) for p in selected):
+        return "mpy"
+    return "pyinstaller"
+
+
+def _log_path(selected, log_dir: Path) -> Path:
+    first_name = selected[0].name.replace(" ", "_")
+    suffix = f"_and_{len(selected) - 1}_more" if len(selected) > 1 else ""
+    return log_dir / f"compile_{first_name}{suffix}_{datetime.now().strftime('%Y%m%d_%H%M')}.log"
+
+
+def _thread_count(requested: Optional[int], config: dict) -> int:
+    cpu_max = max(1, os.cpu_count() or 1)
+    try:
+        value = int(requested if requested is not None else config.get("thread_count", cpu_max))
+    except (TypeError, ValueError):
+        value = cpu_max
+    return max(1, value)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m AutoPyPlusPlus", description="autoPy++ headless build")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="compile the projects of an .apyscript file")
+    b.add_argument("apyscript", type=Path, help="project file (.apyscript)")
+    b.add_argument("--mode", choices=("A", "B", "C"), default="A", type=str.upper, help="project selection (default: A)")
+    b.add_argument("--jobs", "-j", type=int, default=None, help="CPU budget / parallel builds (default: thread_count from config.json or all cores)")
+    b.add_argument("--compiler", choices=COMPILERS, default="auto", help="backend selection as in the GUI (default: auto)")
+    b.add_argument("--no-cache", action="store_true", help="disable the build cache (full rebuild)")
+    b.add_argument("--cache-max-mb", type=int, default=None, help="build cache size limit")
+    b.add_argument("--fail-fast", action="store_true", help="cancel all builds on the first failure")
+    b.add_argument("--log-dir", type=Path, default=Path.cwd(), help="directory for compile_*.log (default: CWD)")
+    b.add_argument("--summary", default="-", help="write the JSON summary to this file ('-' = stdout)")
+    b.add_argument("--no-config", action="store_true", help="ignore config.json (backend slots, timeouts, retries)")
+    b.add_argument("--quiet", "-q", action="store_true", help="no status lines on stderr")
+    return ap
+
+
+def run_build(args: argparse.Namespace) -> int:
+    # Bewusst hier importiert: "python -m AutoPyPlusPlus --help" bleibt schnell
+    from .config import load_config
+    from .core import load_projects
+    from .compiler import compile_projects
+    from .process_runner import CancelToken
+    from .retry import RetryPolicy
+
+    def status(msg: str) -> None:
+        if not args.quiet and msg:
+            print(msg, file=sys.stderr, flush=True)
+
+    summary = {
+        "apyscript": str(args.apyscript),
+        "mode": args.mode,
+        "compiler": args.compiler,
+        "projects": [],
+        "errors": [],
+        "report": None,
+        "log": None,
+        "events": None,
+        "cancelled": False,
+        "exit_code": EXIT_OK,
+    }
+
+    def finish(code: int) -> int:
+        summary["exit_code"] = code
+        text = json.dumps(summary, indent=2, ensure_ascii=False)
+        if args.summary == "-":
+            print(text)
+        else:
+            Path(args.summary).write_text(text + "\n", encoding="utf-8")
+        return code
+
+    try:
+        projects = load_projects(args.apyscript)
+    except (OSError, ValueError) as e:
+        summary["errors"].append(f"Cannot load {args.apyscript}: {e}")
+        status(summary["errors"][-1])
+        return finish(EXIT_USAGE)
+
+    config = {} if args.no_config else load_config()
+    selected = _selected(projects, args.mode)
+    summary["projects"] = [p.name for p in selected]
+    if not selected:
+        status(f"No projects selected for mode {args.mode}")
+        return finish(EXIT_NOTHING)
+
+    compiler = auto_compiler(selected) if args.compiler == "auto" else args.compiler
+    threads = _thread_count(args.jobs, config)
+    use_cache = not args.no_cache and bool(config.get("build_cache_enabled", True))
+    cache_max_mb = args.cache_max_mb or int(config.get("build_cache_max_mb", 2048) or 2048)
+    summary.update(compiler=compiler, jobs=threads, use_cache=use_cache)
+
+    log_dir = Path(args.log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = _log_path(selected, log_dir)
+
+    cancel_token = CancelToken()
+
+    def on_signal(signum, _frame):
+        cancel_token.cancel(f"interrupted ({signal.Signals(signum).name})")
+        status("Cancelling build …")
+
+    handlers = {}
+    for sig in (signal.SIGINT, getattr(signal, "SIGTERM", None)):
+        if sig is not None:
+            try:
+                handlers[sig] = signal.signal(sig, on_signal)
+            except ValueError:  # nicht im Hauptthread
+                pass
+
+    report_holder = []
+    progress_state = {"done": -1}
+
+    def progress(done: float, total: int) -> None:
+        if int(done) != progress_state["done"]:
+            progress_state["done"] = int(done)
+            status(f"[{int(done)}/{total}]")
+
+    status(f"Compile Projects: {len(selected)} projects, thread_count={threads}, mode={args.mode}, compiler={compiler}")
+    t0 = time.perf_counter()
+    try:
+        with open(log_path, "a", encoding="utf-8") as run_log:
+            run_log.write(f"Starting headless compilation at {datetime.now()}\n")
+            errors = compile_projects(
+                projects,
+                thread_count=threads,
+                log_file=run_log,
+                status_callback=status,
+                progress_callback=progress,
+                mode=args.mode,
+                compiler=compiler,
+                report_callback=report_holder.append,
+                use_cache=use_cache,
+                cache_max_mb=cache_max_mb,
+                backend_slots=config.get("backend_slots") or None,
+                memory_budget_mb=config.get("memory_budget_mb") or None,
+                cancel_token=cancel_token,
+                fail_fast=args.fail_fast or bool(config.get("fail_fast", False)),
+                backend_timeouts=config.get("backend_timeouts") or None,
+                retry_policy=RetryPolicy.from_config(config),
+            )
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+
+    summary["wall_time_s"] = round(time.perf_counter() - t0, 3)
+    summary["errors"] = list(errors)
+    summary["cancelled"] = cancel_token.cancelled
+    if report_holder:
+        summary["report"] = report_holder[-1].to_dict()
+    # compile_projects löscht das Log bei Erfolg (außer bei debug-Projekten)
+    if log_path.exists():
+        summary["log"] = str(log_path)
+        events = Path(str(log_path) + ".events.jsonl")
+        summary["events"] = str(events) if events.exists() else None
+
+    if cancel_token.cancelled:
+        return finish(EXIT_CANCELLED)
+    if errors and summary["report"] is None:
+        return finish(EXIT_USAGE)  # z. B. Zyklus in depends_on: kein Projekt gestartet
+    return finish(EXIT_FAILED if errors else EXIT_OK)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "build":
+        return run_build(args)
+    return EXIT_USAGE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
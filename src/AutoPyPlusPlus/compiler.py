@@ -2,20 +2,31 @@ from __future__ import annotations
 import os
 import re
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import threading
 import time
-from typing import List, Callable
+from typing import List, Callable, Optional
 import shutil
 
 from .project import Project
-from .CPA0000000 import CPA0000000  # PyInstaller
-from .CPB0000000 import CPB0000000  # PyArmor
-from .CPC0000000 import CPC0000000  # Nuitka
-from .CPD0000000 import CPD0000000  # Cython
-from .CPE0000000 import CPE0000000  # C++ Compiler
-from .CPF0000000 import CPF0000000  # Pytest
-from .CPG0000000 import CPG0000000  # Sphinx
-from .CPH0000000 import CPH0000000  # mpy-cross (MicroPython)
+from .lazy import lazy
+# Backends are imported when a project first uses them
+CPA0000000 = lazy(".CPA0000000", "CPA0000000")  # PyInstaller
+CPB0000000 = lazy(".CPB0000000", "CPB0000000")  # PyArmor
+CPC0000000 = lazy(".CPC0000000", "CPC0000000")  # Nuitka
+CPD0000000 = lazy(".CPD0000000", "CPD0000000")  # Cython
+CPE0000000 = lazy(".CPE0000000", "CPE0000000")  # C++ Compiler
+CPF0000000 = lazy(".CPF0000000", "CPF0000000")  # Pytest
+CPG0000000 = lazy(".CPG0000000", "CPG0000000")  # Sphinx
+CPH0000000 = lazy(".CPH0000000", "CPH0000000")  # mpy-cross (MicroPython)
+from .scheduler import DagScheduler, BuildReport, build_project_graph, SKIPPED, CANCELLED
+from .resources import ResourceBudget
+from .process_runner import CancelToken, build_context, collect_artifacts
+from .buildlog import LogHub, events_path_for, index_path_for
+from .retry import RetryPolicy, run_with_retry
+from .extension_paths_loader import which_tool
+from .buildcache import BuildCache, compute_cache_key, quiet_log
+from .compilercache import CompilerCacheSession
 
 
 # =====================================================================
@@ -138,7 +149,205 @@ def _prepare_add_data_for_pyinstaller(project: Project, log_write: Callable[[str
 #                         Build-Pipeline
 # =====================================================================
 
-def compile_single(project: Project, log_file, compiler: str = "both") -> str:
+@contextmanager
+def _timed(timings: Optional[dict], stage: str):
+    """Misst die Dauer einer Stage (für Scheduler-Report / kritischen Pfad)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - t0)
+
+
+def _mark_stage(log_file, stage: str) -> None:
+    """Stage-Beginn an den LogHub melden (Ereignisstrom und Log-Index); echte Dateien ignorieren."""
+    event = getattr(log_file, "event", None)
+    if event is not None:
+        event("stage", stage=stage)
+
+
+def _active_routes(project: Project, compiler: str) -> list[str]:
+    """Build-Routen, die _run_compile_stages() für dieses Projekt ausführen würde."""
+    routes: list[str] = []
+    if compiler in ("mpy", "both") and getattr(project, "use_mpycross", False):
+        routes.append("mpy")
+    if compiler in ("pyarmor", "both") and project.use_pyarmor:
+        routes.append("pyarmor")
+    if compiler in ("nuitka", "both") and project.use_nuitka:
+        routes.append("nuitka")
+    if compiler in ("cython", "both") and project.use_cython:
+        routes.append("cython")
+        if project.use_cpp:
+            routes.append("cpp")
+    if (
+        compiler in ("pyinstaller", "both")
+        and not project.use_pyarmor
+        and not project.use_nuitka
+        and not project.use_cython
+        and not getattr(project, "use_mpycross", False)
+    ):
+        routes.append("pyinstaller")
+    return routes
+
+
+def _job_backends(project: Project, compiler: str) -> list[str]:
+    """Alle Backends, die ein Projekt belegt (für ResourceBudget), inkl. Pytest/Sphinx."""
+    backends: list[str] = []
+    if getattr(project, "use_pytest", False):
+        backends.append("pytest")
+    if getattr(project, "use_sphinx", False):
+        backends.append("sphinx")
+    if getattr(project, "use_pytest_standalone", False) or getattr(project, "use_sphinx_standalone", False):
+        return backends
+    return backends + _active_routes(project, compiler)
+
+
+@contextmanager
+def _applied_grant(project: Project, grant: dict):
+    """Setzt die vom ResourceBudget zugeteilten Job-Zahlen temporär (nuitka_jobs, sphinx_parallel, mpy_jobs)."""
+    backup = {attr: getattr(project, attr, None) for attr in grant}
+    try:
+        for attr, value in grant.items():
+            setattr(project, attr, value)
+        yield
+    finally:
+        for attr, value in backup.items():
+            setattr(project, attr, value)
+
+
+def _cache_key(project: Project, routes: list[str]) -> Optional[str]:
+    """
+    Cache-Key aus Quellen, Optionen und den aufgelösten Kommandozeilen.
+    None, wenn ein Kommando nicht aufgelöst werden kann (dann baut die Route normal und meldet den Fehler).
+    """
+    quiet = quiet_log()
+    commands: dict[str, list[str]] = {}
+    try:
+        if "pyinstaller" in routes:
+            backup_add_data, prepared = _prepare_add_data_for_pyinstaller(project, quiet.write)
+            try:
+                project.add_data = prepared
+                commands["pyinstaller"] = CPA0000000.build_command(project, quiet)
+            finally:
+                project.add_data = backup_add_data
+        if "nuitka" in routes:
+            commands["nuitka"] = CPC0000000.build_command(project, quiet)[0]
+        if "cython" in routes:
+            if getattr(project, "cython_package_dir", ""):
+                entries = CPD0000000.package_commands(project, quiet)[1]
+                commands["cython"] = [arg for entry in entries for arg in entry[2]]
+            else:
+                commands["cython"] = CPD0000000.build_command(project, quiet)[0]
+        if "pyarmor" in routes:
+            commands["pyarmor"] = [getattr(project, "pyarmor_path", "") or which_tool("pyarmor") or "pyarmor"]
+        if "cpp" in routes:
+            commands["cpp"] = [project.cpp_compiler_path or which_tool("cl.exe") or "g++"]
+        if "mpy" in routes:
+            commands["mpy"] = [getattr(project, "mpy_cross_path", "") or which_tool("mpy-cross") or "mpy-cross"]
+    except Exception:
+        return None
+    return compute_cache_key(project, routes, commands)
+
+
+def _run_compile_stages(
+    project: Project,
+    log_file,
+    compiler: str,
+    timings: Optional[dict],
+    retry: Optional[RetryPolicy] = None,
+    attempts: Optional[dict] = None,
+) -> bool:
+    """
+    Führt die gewählten Build-Routen aus. True, wenn mindestens ein Compiler lief.
+    Vorübergehende Fehler (retry.RetryPolicy) wiederholen nur die betroffene Stage.
+    """
+    compiled = False
+
+    def stage(name: str, fn) -> None:
+        _mark_stage(log_file, name)
+        with _timed(timings, name):
+            run_with_retry(name, fn, retry, lambda s: log_file.write(s), attempts)
+
+    # --- mpy-cross (MicroPython .mpy) ---
+    if compiler in ("mpy", "both") and getattr(project, "use_mpycross", False):
+        stage("mpy-cross", lambda: CPH0000000.run_mpycross(project, log_file))
+        compiled = True
+    else:
+        pass
+
+    # --- PyArmor ---
+    if compiler in ("pyarmor", "both") and project.use_pyarmor:
+        stage("pyarmor", lambda: CPB0000000.run_pyarmor(project, log_file))
+        compiled = True
+
+    # --- Nuitka ---
+    if compiler in ("nuitka", "both") and project.use_nuitka:
+        stage("nuitka", lambda: CPC0000000.run_nuitka(project, log_file))
+        compiled = True
+    else:
+        pass
+
+    # --- Cython (+ optional C++) ---
+    if compiler in ("cython", "both") and project.use_cython:
+        stage("cython", lambda: CPD0000000.run_cython(project, log_file))
+        compiled = True
+
+        if project.use_cpp:
+            if not project.cpp_compiler_path or project.cpp_compiler_path.lower() == "g++":
+                msvc_path = which_tool("cl.exe")
+                project.cpp_compiler_path = msvc_path if msvc_path else "g++"
+            stage("cpp", lambda: CPE0000000.run_cpp(project, log_file))
+    else:
+        pass
+
+    # --- PyInstaller (nur wenn keine der obigen Routen aktiv ist oder explizit gewählt) ---
+    if (
+        compiler in ("pyinstaller", "both")
+        and not project.use_pyarmor
+        and not project.use_nuitka
+        and not project.use_cython
+        and not getattr(project, "use_mpycross", False)
+    ):
+        # >>> Add-Data sicher und plattformrichtig aufbereiten
+        backup_add_data, prepared = _prepare_add_data_for_pyinstaller(project, lambda s: log_file.write(s))
+        try:
+            # Temporär ersetzen (zeilenweise, damit CPA sauber splitten kann)
+            project.add_data = prepared
+            stage("pyinstaller", lambda: CPA0000000.run_pyinstaller(project, log_file))
+        finally:
+            # Ursprungswert wiederherstellen
+            project.add_data = backup_add_data
+        compiled = True
+    else:
+        pass
+
+    return compiled
+
+
+def _retry_note(attempts: dict) -> str:
+    retried = {k: v for k, v in attempts.items() if v > 1}
+    if not retried:
+        return ""
+    return " (attempts: " + ", ".join(f"{k}={v}" for k, v in retried.items()) + ")"
+
+
+def compile_single(
+    project: Project,
+    log_file,
+    compiler: str = "both",
+    timings: Optional[dict] = None,
+    cache: Optional[BuildCache] = None,
+    retry: Optional[RetryPolicy] = None,
+    attempts: Optional[dict] = None,
+) -> str:
+    """
+    Baut ein Projekt. Mit cache (BuildCache) werden die Artefakte content-addressed
+    abgelegt; ist der Key bekannt, werden sie wiederhergestellt statt neu zu bauen.
+    Pytest/Sphinx laufen immer.
+    retry: Wiederholungen bei vorübergehenden Fehlern; attempts erhält die Versuche je Stage.
+    """
+    attempts = {} if attempts is None else attempts
     try:
         log_file.write(f"--- compile_single() START for {project.name or project.script} (compiler={compiler}) ---\n")
         log_file.flush()
@@ -151,11 +360,13 @@ def compile_single(project: Project, log_file, compiler: str = "both") -> str:
 
         # --- 1. Pytest vor der Kompilation ---
         if getattr(project, "use_pytest", False):
+            _mark_stage(log_file, "pytest")
             log_file.write("Running pytest before compilation...\n")
             log_file.flush()
             if getattr(project, "use_pytest_standalone", False):
                 try:
-                    result = CPF0000000.run_pytest(project, log_file)
+                    with _timed(timings, "pytest"):
+                        result = CPF0000000.run_pytest(project, log_file)
                     return f"Pytest Standalone: {result}"
                 except Exception as e:
                     err = f"Pytest Standalone failed: {e}"
@@ -164,7 +375,8 @@ def compile_single(project: Project, log_file, compiler: str = "both") -> str:
                     return err
             else:
                 try:
-                    CPF0000000.run_pytest(project, log_file)
+                    with _timed(timings, "pytest"):
+                        CPF0000000.run_pytest(project, log_file)
                 except Exception as e:
                     err = f"Pytest failed for {project.name or project.script}: {e}"
                     log_file.write(err + "\n")
@@ -173,11 +385,13 @@ def compile_single(project: Project, log_file, compiler: str = "both") -> str:
 
         # --- 2. Sphinx vor der Kompilation ---
         if getattr(project, "use_sphinx", False):
+            _mark_stage(log_file, "sphinx")
             log_file.write("Running sphinx before compilation...\n")
             log_file.flush()
             if getattr(project, "use_sphinx_standalone", False):
                 try:
-                    result = CPG0000000.run_sphinx(project, log_file)
+                    with _timed(timings, "sphinx"):
+                        result = CPG0000000.run_sphinx(project, log_file)
                     return f"Sphinx Standalone: {result}"
                 except Exception as e:
                     err = f"Sphinx Standalone failed: {e}"
@@ -186,66 +400,40 @@ def compile_single(project: Project, log_file, compiler: str = "both") -> str:
                     return err
             else:
                 try:
-                    CPG0000000.run_sphinx(project, log_file)
+                    with _timed(timings, "sphinx"):
+                        CPG0000000.run_sphinx(project, log_file)
                 except Exception as e:
                     err = f"Sphinx build failed for {project.name or project.script}: {e}"
                     log_file.write(err + "\n")
                     log_file.flush()
 
-        compiled = False
-
-        # --- mpy-cross (MicroPython .mpy) ---
-        if compiler in ("mpy", "both") and getattr(project, "use_mpycross", False):
-            CPH0000000.run_mpycross(project, log_file)
+        routes = _active_routes(project, compiler)
+        key = None
+        if cache is not None and routes:
+            key = _cache_key(project, routes)
+            if key is None:
+                log_file.write("--- INFO: Build cache skipped (command could not be resolved)\n")
+
+        cached = False
+        if key is not None:
+            with _timed(timings, "cache"):
+                cached = cache.restore(key, lambda s: log_file.write(s))
+        if cached:
             compiled = True
+        elif key is not None:
+            # Nur, was die Backends selbst als Ergebnis melden: parallele Projekte schreiben
+            # in dieselben Ordner (dist, Skriptordner), ein Ordner-Diff fände auch deren Dateien
+            with collect_artifacts() as reported:
+                compiled = _run_compile_stages(project, log_file, compiler, timings, retry, attempts)
+            if compiled:
+                unknown = [r for r in routes if not reported.get(r)]
+                if unknown:
+                    log_file.write(f"--- INFO: Build cache not stored (outputs unknown for: {', '.join(unknown)})\n")
+                else:
+                    produced = {str(f.resolve()): f for r in routes for f in reported[r]}
+                    cache.store(key, list(produced.values()), lambda s: log_file.write(s))
         else:
-            pass
-
-        # --- PyArmor ---
-        if compiler in ("pyarmor", "both") and project.use_pyarmor:
-            CPB0000000.run_pyarmor(project, log_file)
-            compiled = True
-
-        # --- Nuitka ---
-        if compiler in ("nuitka", "both") and project.use_nuitka:
-            CPC0000000.run_nuitka(project, log_file)
-            compiled = True
-        else:
-            pass
-
-        # --- Cython (+ optional C++) ---
-        if compiler in ("cython", "both") and project.use_cython:
-            CPD0000000.run_cython(project, log_file)
-            compiled = True
-
-            if project.use_cpp:
-                if not project.cpp_compiler_path or project.cpp_compiler_path.lower() == "g++":
-                    msvc_path = shutil.which("cl.exe")
-                    project.cpp_compiler_path = msvc_path if msvc_path else "g++"
-                CPE0000000.run_cpp(project, log_file)
-        else:
-            pass
-
-        # --- PyInstaller (nur wenn keine der obigen Routen aktiv ist oder explizit gewählt) ---
-        if (
-            compiler in ("pyinstaller", "both")
-            and not project.use_pyarmor
-            and not project.use_nuitka
-            and not project.use_cython
-            and not getattr(project, "use_mpycross", False)
-        ):
-            # >>> Add-Data sicher und plattformrichtig aufbereiten
-            backup_add_data, prepared = _prepare_add_data_for_pyinstaller(project, lambda s: log_file.write(s))
-            try:
-                # Temporär ersetzen (zeilenweise, damit CPA sauber splitten kann)
-                project.add_data = prepared
-                CPA0000000.run_pyinstaller(project, log_file)
-            finally:
-                # Ursprungswert wiederherstellen
-                project.add_data = backup_add_data
-            compiled = True
-        else:
-            pass
+            compiled = _run_compile_stages(project, log_file, compiler, timings, retry, attempts)
 
         if not compiled:
             msg = (
@@ -278,28 +466,78 @@ def compile_single(project: Project, log_file, compiler: str = "both") -> str:
             log_file.write(f"Error copying additional files: {e}\n")
             log_file.flush()
 
-        return f"{project.name or Path(project.script).stem} done"
+        return f"{project.name or Path(project.script).stem} done" + (" (cached)" if cached else "") + _retry_note(attempts)
 
     except Exception as e:
-        msg = f"Error with {project.name or project.script}: {e}"
+        msg = f"Error with {project.name or project.script}: {e}" + _retry_note(attempts)
         log_file.write(f"{msg}\n")
         log_file.flush()
         return msg
 
 
+def _log_build_report(report: BuildReport, log_file) -> None:
+    """Schreibt Zeiten pro Projekt und den kritischen Pfad ins Log."""
+    log_file.write("--- Build report (per project) ---\n")
+    for node in sorted(report.nodes, key=lambda n: n.duration, reverse=True):
+        stages = ", ".join(f"{k}={v:.1f}s" for k, v in node.stage_timings.items())
+        deps = f" after [{', '.join(node.deps)}]" if node.deps else ""
+        log_file.write(f"  {node.name}: {node.state} {node.duration:.1f}s{deps}" + (f" ({stages})" if stages else "") + "\n")
+    log_file.write(
+        f"Critical path ({report.critical_path_s:.1f}s of {report.wall_time_s:.1f}s wall): "
+        f"{' -> '.join(report.critical_path) or '-'}\n"
+    )
+    log_file.flush()
+
+
 def compile_projects(
     projects: List[Project],
     thread_count: int,
     log_file,
     status_callback: Callable[[str], None],
-    progress_callback: Callable[[int, float], None],
+    progress_callback: Callable[[float, int], None],
     mode: str = "A",
-    compiler: str = "both"
+    compiler: str = "both",
+    report_callback: Optional[Callable[[BuildReport], None]] = None,
+    use_cache: bool = True,
+    cache_max_mb: Optional[int] = None,
+    backend_slots: Optional[dict] = None,
+    memory_budget_mb: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None,
+    fail_fast: bool = False,
+    backend_timeouts: Optional[dict] = None,
+    retry_policy: Optional[RetryPolicy] = None,
 ) -> List[str]:
     """
-    Compile multiple projects in parallel in the given mode and with the selected compiler.
+    Compile multiple projects in the given mode and with the selected compiler.
     - mode: "A", "B" or "C" to select the projects.
     - compiler: "pyarmor", "nuitka", "cython", "pyinstaller", "mpy" or "both".
+
+    Projects are scheduled as a dependency graph (see scheduler.build_project_graph):
+    every project whose dependencies are finished runs in parallel (within the resource budget),
+    dependents of a failed project are skipped. report_callback receives the BuildReport
+    with per-project timings and the critical path. progress_callback(done, total) also
+    receives fractional values while projects run (parsed from the tools' output).
+
+    Each project writes into its own sink (buildlog.LogHub, one background writer): every
+    line goes into log_file as it arrives, prefixed with "[project] ", and unprefixed into
+    <log>.projects/<project>.log (one consolidated file per project). Structured events
+    (start/end, warnings, errors, report) go to <log>.events.jsonl, line offsets, error
+    lines and project/stage boundaries for the debug inspector to <log>.idx.
+
+    cancel_token.cancel() kills the running tools (whole process tree) and drops the
+    queue. Tool runs are limited by backend_timeouts ({"nuitka": 3600, ...}, merged over
+    process_runner.DEFAULT_BACKEND_TIMEOUTS) and by project.build_timeout_s.
+    fail_fast cancels everything on the first failed project.
+
+    Transient tool failures (file locks, "Permission denied" in _append_data_to_exe, ...)
+    retry only the failed stage with exponential backoff (retry_policy, default RetryPolicy()).
+
+    use_cache=False (CLI: --no-cache) forces a full rebuild; otherwise unchanged projects
+    are restored from the local build cache (LRU, limited to cache_max_mb).
+
+    Concurrency is limited per backend (resources.BACKEND_PROFILES, overridable via
+    backend_slots) and by a CPU budget of thread_count cores plus a memory budget.
+    nuitka_jobs / sphinx_parallel are split between concurrently running builds.
     """
     selected_projects = [
         p for p in projects
@@ -318,25 +556,138 @@ def compile_projects(
         log_file.flush()
         return []
 
-    with ThreadPoolExecutor(max_workers=thread_count) as executor:
-        futures = {executor.submit(compile_single, p, log_file, compiler): p for p in selected_projects}
-        for i, future in enumerate(as_completed(futures), 1):
+    try:
+        graph = build_project_graph(selected_projects, lambda s: log_file.write(s))
+        graph.validate()
+    except ValueError as e:
+        msg = f"Error in project dependencies: {e}"
+        log_file.write(f"{msg}\n")
+        log_file.flush()
+        status_callback(msg)
+        return [msg]
+
+    # Ausgabe paralleler Projekte: gepuffert pro Projekt, ein Writer-Thread schreibt ins Log
+    events_path = events_path_for(log_file)
+    index_path = index_path_for(log_file)
+    hub = LogHub(log_file, events_path, index_path)
+    out = hub.main
+
+    cache: Optional[BuildCache] = None
+    if use_cache:
+        cache = BuildCache(max_mb=cache_max_mb) if cache_max_mb else BuildCache()
+    else:
+        out.write("--- INFO: Build cache disabled, full rebuild\n")
+
+    # Trefferquote des Compiler-Caches nur, wenn ein Projekt C/C++ übersetzt
+    cc_session: Optional[CompilerCacheSession] = None
+    if any(
+        {"nuitka", "cython", "cpp"} & set(_active_routes(p, compiler))
+        and getattr(p, "compiler_cache", "auto") != "off"
+        for p in selected_projects
+    ):
+        cc_session = CompilerCacheSession()
+
+    budget = ResourceBudget(
+        cpu_total=thread_count,
+        mem_total_mb=memory_budget_mb,
+        backend_slots=backend_slots,
+        backends_of=lambda p: _job_backends(p, compiler),
+    )
+    budget.expect(selected_projects)
+    max_workers = 1 if int(thread_count or 1) <= 1 else budget.max_concurrency()
+    out.write(f"--- INFO: Resource budget: {budget.describe()}\n")
+
+    if cancel_token is None and fail_fast:
+        cancel_token = CancelToken()
+    if retry_policy is None:
+        retry_policy = RetryPolicy()
+
+    finished = 0
+    partial: dict[str, float] = {}
+    progress_lock = threading.Lock()
+
+    def on_tool_progress(name: str, fraction: float) -> None:
+        # Fortschritt laufender Projekte aus den Tool-Ausgaben (Sphinx [45%], Nuitka, PyInstaller-Phasen, ...)
+        with progress_lock:
+            if fraction <= partial.get(name, 0.0):
+                return
+            partial[name] = min(fraction, 0.99)
+            value = finished + sum(partial.values())
+        progress_callback(value, total)
+
+    def worker(node):
+        hub.begin(node.name)
+        sink = hub.sink(node.name)
+        if node.grant:
+            sink.write(f"--- INFO: {node.name}: " + ", ".join(f"{k}={v}" for k, v in node.grant.items()) + "\n")
+        limit = int(getattr(node.payload, "build_timeout_s", 0) or 0)
+        deadline = time.monotonic() + limit if limit > 0 else None
+        with build_context(
+            prefix=node.name,
+            progress=lambda f: on_tool_progress(node.name, f),
+            cancel=cancel_token,
+            deadline=deadline,
+            timeouts=backend_timeouts,
+        ), _applied_grant(node.payload, node.grant):
+            return compile_single(
+                node.payload, sink, compiler, timings=node.stage_timings, cache=cache,
+                retry=retry_policy, attempts=node.attempts,
+            )
+
+    def on_node_done(node):
+        nonlocal finished
+        with progress_lock:
+            finished += 1
+            partial.pop(node.name, None)
+        result = node.result or ""
+        hub.end(
+            node.name, state=node.state, result=result, duration_s=round(node.duration, 3),
+            stages={k: round(v, 3) for k, v in node.stage_timings.items()},
+            attempts=dict(node.attempts),
+        )
+        if node.state == SKIPPED:
+            out.write(f"Project {finished}/{total} skipped: {result}\n")
+        elif node.state == CANCELLED:
+            out.write(f"Project {finished}/{total} cancelled: {result}\n")
+        else:
+            out.write(f"Project {finished}/{total} completed ({node.duration:.1f}s): {result}\n")
+        status_callback(result)
+        if DagScheduler.is_failure(node.result):
+            errors.append(result)
+        with progress_lock:
+            value = finished + sum(partial.values())
+        progress_callback(value, total)
+
+    try:
+        report = DagScheduler(
+            graph, worker, max_workers=max_workers, on_node_done=on_node_done, resources=budget,
+            cancel=cancel_token, fail_fast=fail_fast,
+        ).run()
+        _log_build_report(report, out)
+        hub.event(None, "report", **report.to_dict())
+        if cache is not None:
+            out.write(
+                f"Build cache: {cache.hits} hit(s), {cache.misses} miss(es), "
+                f"{cache.total_bytes() / (1024 * 1024):.1f} MB in {cache.root}\n"
+            )
+        if cc_session is not None:
+            totals = cc_session.totals()
+            line = cc_session.describe(totals)
+            if line:
+                out.write(line + "\n")
+                hub.event(None, "compiler_cache", **{k: {"hits": h, "misses": m} for k, (h, m) in totals.items()})
+            cc_session.cache.trim()
+        if report_callback:
             try:
-                result = future.result()
-                log_file.write(f"Project {i}/{total} completed: {result}\n")
-                log_file.flush()
-                status_callback(result)
-                if "Error" in result:
-                    errors.append(result)
-                progress_callback(i, total)
+                report_callback(report)
             except Exception as e:
-                msg = f"Exception in future {i}: {e}"
-                log_file.write(f"{msg}\n")
-                log_file.flush()
-                errors.append(msg)
-            time.sleep(0.05)
+                out.write(f"report_callback failed: {e}\n")
 
-    log_file.write(f"--- compile_projects() END: {len(errors)} errors ---\n")
+        if cancel_token is not None and cancel_token.cancelled:
+            out.write(f"--- Build cancelled: {cancel_token.reason} ---\n")
+        out.write(f"--- compile_projects() END: {len(errors)} errors ---\n")
+    finally:
+        hub.close()
     log_file.flush()
     keep_log = (len(errors) > 0) or any(p.debug for p in selected_projects)
 
@@ -346,6 +697,14 @@ def compile_projects(
         pass
 
     if not keep_log:
+        for sidecar in (events_path, index_path):
+            if sidecar:
+                try:
+                    Path(sidecar).unlink()
+                except Exception:
+                    pass
+        if hub.projects_dir is not None:
+            shutil.rmtree(hub.projects_dir, ignore_errors=True)
         try:
             Path(log_file.name).unlink()
         except Exception as e:
@@ -0,0 +1,456 @@
+# compilercache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .buildcache import default_cache_dir
+from .extension_paths_loader import which_tool
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_MB = 4096
+
+# project.compiler_cache
+MODES = ("auto", "ccache", "local", "off")
+
+# Options that only name output/depfile paths: not part of the key
+_OUTPUT_OPTS = {"-o", "-MF", "-MT", "-MQ"}
+_DEP_FLAGS = {"-MD", "-MMD", "-MP"}
+# Preprocessor-only options: their effect is already in the preprocessed source,
+# leaving them out lets projects with the same vendored sources in other folders share objects
+_PREPROCESSOR_OPTS = {"-I", "-D", "-U", "-include", "-imacros", "-isystem", "-iquote", "-idirafter"}
+_PREPROCESSOR_PREFIXES = ("-I", "-D", "-U")
+_ARG_OPTS = _PREPROCESSOR_OPTS | {"-x", "-arch", "-target", "--target", "-Xclang"}
+_UNCACHEABLE = {"-E", "-S", "-M", "-MM", "-save-temps", "--coverage", "-fprofile-arcs", "-ftest-coverage", "-"}
+_C_SOURCES = {".c", ".cc", ".cpp", ".cxx", ".c++", ".m", ".mm"}
+
+
+def default_objcache_dir() -> Path:
+    """objcache/ next to the build cache (shared by all projects)."""
+    return default_cache_dir().parent / "objcache"
+
+
+def resolve_mode(project) -> Tuple[str, Optional[str]]:
+    """
+    project.compiler_cache -> ("ccache", exe) | ("local", None) | ("off", None).
+    "auto" and "ccache" use ccache/sccache from extensions_path.ini/PATH when found,
+    otherwise the local stand-in cache.
+    """
+    mode = str(getattr(project, "compiler_cache", "auto") or "auto").lower()
+    if mode == "off":
+        return "off", None
+    if mode in ("auto", "ccache"):
+        exe = which_tool("ccache", "sccache")
+        if exe:
+            return "ccache", exe
+    return "local", None
+
+
+def parse_compile_args(args: List[str]) -> Optional[dict]:
+    """
+    Splits a GCC/Clang compile command (without the compiler) into
+    {source, output, pp_args, dep_args, key_args}. None if not cacheable
+    (no -c, several sources, response files, -E/-S, coverage, ...).
+    """
+    if "-c" not in args:
+        return None
+    sources: List[str] = []
+    output = None
+    pp_args: List[str] = []
+    dep_args: List[str] = []
+    key_args: List[str] = []
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a in _UNCACHEABLE or a.startswith("@"):
+            return None
+        if a in _OUTPUT_OPTS:
+            if i + 1 >= len(args):
+                return None
+            if a == "-o":
+                output = args[i + 1]
+            else:
+                dep_args += [a, args[i + 1]]
+            i += 2
+            continue
+        if a.startswith("-o") and len(a) > 2:
+            output = a[2:]
+        elif a in _DEP_FLAGS:
+            dep_args.append(a)
+        elif a in _ARG_OPTS:
+            if i + 1 >= len(args):
+                return None
+            pp_args += [a, args[i + 1]]
+            if a not in _PREPROCESSOR_OPTS:
+                key_args += [a, args[i + 1]]
+            i += 2
+            continue
+        elif a.startswith(_PREPROCESSOR_PREFIXES):
+            pp_args.append(a)
+        elif not a.startswith("-") and (Path(a).suffix.lower() in _C_SOURCES or Path(a).suffix == ".C"):
+            sources.append(a)
+        elif a != "-c":
+            pp_args.append(a)
+            key_args.append(a)
+        i += 1
+    if len(sources) != 1 or not output:
+        return None
+    if any(d in dep_args for d in ("-MD", "-MMD")) and not any(d in dep_args for d in ("-MT", "-MQ")):
+        dep_args += ["-MT", output]
+    return {"source": sources[0], "output": output, "pp_args": pp_args, "dep_args": dep_args, "key_args": key_args}
+
+
+def _tool_identity(compiler: str) -> list:
+    path = shutil.which(compiler) or compiler
+    try:
+        st = Path(path).stat()
+        return [os.path.normcase(str(Path(path).resolve())), st.st_size, st.st_mtime_ns]
+    except OSError:
+        return [compiler]
+
+
+class ObjectCache:
+    """
+    Local stand-in for ccache: object files keyed on the preprocessed source plus
+    the compiler identity and the code-generation flags.
+
+    Layout:
+        <root>/ab/abcdef....o      cached object
+        <root>/ab/abcdef....json   {stderr} of the original compile (replayed on a hit)
+        <root>/stats.log           one "hit"/"miss" line per cacheable compile (all processes)
+
+    Used in-process by CPE0000000 and as launcher (python -m AutoPyPlusPlus.compilercache
+    <compiler> ...) for setuptools builds. Commands that are not plain single-source
+    compiles (linking, MSVC, -E, ...) are passed through unchanged.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_mb: int = DEFAULT_MAX_MB) -> None:
+        self.root = Path(root) if root else default_objcache_dir()
+        self.max_bytes = max(1, int(max_mb)) * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats_path(self) -> Path:
+        return self.root / "stats.log"
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    # ---------------- compile ----------------
+    def key_for(self, cmd: List[str], parsed: dict, cwd: Optional[str] = None) -> Optional[str]:
+        """Runs the preprocessor (also writes the depfile, if requested) and hashes its output."""
+        debug = any(a.startswith("-g") and a not in ("-g0",) for a in parsed["key_args"])
+        fd, pre = tempfile.mkstemp(suffix=".i", prefix="apy-objcache-")
+        os.close(fd)
+        try:
+            # without -g line markers do not reach the object: -P lets identical sources in other folders hit
+            pp = [cmd[0], *parsed["pp_args"], "-E", *([] if debug else ["-P"]), parsed["source"], "-o", pre, *parsed["dep_args"]]
+            res = subprocess.run(pp, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if res.returncode != 0:
+                return None
+            h = hashlib.sha256()
+            h.update(json.dumps([CACHE_FORMAT, _tool_identity(cmd[0]), parsed["key_args"],
+                                 os.path.abspath(cwd or ".") if debug else ""]).encode("utf-8"))
+            with open(pre, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+        except OSError:
+            return None
+        finally:
+            try:
+                os.unlink(pre)
+            except OSError:
+                pass
+
+    def compile(
+        self,
+        cmd: List[str],
+        run: Optional[Callable[[List[str]], object]] = None,
+        log_file=None,
+        cwd: Optional[str] = None,
+    ):
+        """
+        Compiles cmd through the cache. run(cmd) performs the real compile on a miss
+        (default: subprocess.run) and its result is returned; a hit returns a
+        CompletedProcess with the replayed stderr.
+        """
+        run = run or (lambda c: subprocess.run(c, cwd=cwd))
+        parsed = parse_compile_args(list(cmd[1:]))
+        key = self.key_for(list(cmd), parsed, cwd) if parsed else None
+        if key is None:
+            return run(list(cmd))
+
+        output = Path(cwd or ".") / parsed["output"]
+        entry = self._entry(key)
+        obj = entry.with_suffix(".o")
+        if obj.is_file():
+            try:
+                meta = json.loads(entry.with_suffix(".json").read_text(encoding="utf-8"))
+                output.parent.mkdir(parents=True, exist_ok=True)
+                tmp = output.with_name(f"{output.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                shutil.copyfile(obj, tmp)
+                os.replace(tmp, output)
+                os.utime(obj)  # LRU
+            except (OSError, ValueError):
+                pass
+            else:
+                self._record("hit")
+                if log_file is not None:
+                    log_file.write(f"--- INFO: Compiler cache hit {key[:12]}: {output.name}\n")
+                    if meta.get("stderr"):
+                        log_file.write(meta["stderr"].rstrip("\n") + "\n")
+                return subprocess.CompletedProcess(list(cmd), 0, "", meta.get("stderr", ""))
+
+        self._record("miss")
+        result = run(list(cmd))
+        if getattr(result, "returncode", 1) == 0:
+            self._store(entry, output, getattr(result, "stderr", "") or "")
+        return result
+
+    def _store(self, entry: Path, output: Path, stderr: str) -> None:
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(entry.name + suffix)
+            shutil.copyfile(output, tmp)
+            os.replace(tmp, entry.with_suffix(".o"))
+            entry.with_name(entry.name + ".meta" + suffix).write_text(json.dumps({"stderr": stderr}), encoding="utf-8")
+            os.replace(entry.with_name(entry.name + ".meta" + suffix), entry.with_suffix(".json"))
+        except OSError:
+            pass
+
+    # ---------------- stats ----------------
+    def _record(self, kind: str) -> None:
+        with self._lock:
+            if kind == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # O_APPEND: short lines from parallel launcher processes do not interleave
+            fd = os.open(self.stats_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, (kind + "\n").encode("ascii"))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def stats_offset(self) -> int:
+        try:
+            return self.stats_path.stat().st_size
+        except OSError:
+            return 0
+
+    def stats_since(self, offset: int) -> Tuple[int, int]:
+        """(hits, misses) recorded after offset (see stats_offset())."""
+        try:
+            with open(self.stats_path, "rb") as f:
+                f.seek(offset)
+                lines = f.read().split()
+        except OSError:
+            return 0, 0
+        return lines.count(b"hit"), lines.count(b"miss")
+
+    # ---------------- eviction ----------------
+    def trim(self) -> None:
+        """Deletes least recently used objects until the cache fits max_bytes; resets stats.log."""
+        objs = []
+        for p in self.root.glob("*/*.o"):
+            try:
+                st = p.stat()
+                objs.append((st.st_mtime, st.st_size, p))
+            except OSError:
+                pass
+        total = sum(size for _, size, _ in objs)
+        for _, size, p in sorted(objs):
+            if total <= self.max_bytes:
+                break
+            for f in (p, p.with_suffix(".json")):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            total -= size
+        if self.stats_offset() > 1024 * 1024:
+            try:
+                self.stats_path.unlink()
+            except OSError:
+                pass
+
+
+_shared: Optional[ObjectCache] = None
+_shared_lock = threading.Lock()
+
+
+def object_cache() -> ObjectCache:
+    """Process-wide instance."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ObjectCache()
+        return _shared
+
+
+# =====================================================================
+#                     Launcher for setuptools / external tools
+# =====================================================================
+
+def launcher_script(root: Optional[Path] = None) -> Optional[str]:
+    """
+    Small wrapper script (<objcache>/apy-cc) that runs this module with the current
+    interpreter, usable as CC prefix. None in a frozen application.
+    """
+    if getattr(sys, "frozen", False):
+        return None
+    root = Path(root) if root else default_objcache_dir()
+    package_parent = str(Path(__file__).resolve().parent.parent)
+    if os.name == "nt":
+        path = root / "apy-cc.cmd"
+        text = f'@set "PYTHONPATH={package_parent};%PYTHONPATH%"\r\n@"{sys.executable}" -m AutoPyPlusPlus.compilercache %*\r\n'
+    else:
+        path = root / "apy-cc"
+        text = (
+            "#!/bin/sh\n"
+            f"PYTHONPATH={shlex.quote(package_parent)}${{PYTHONPATH:+:$PYTHONPATH}} "
+            f"exec {shlex.quote(sys.executable)} -m AutoPyPlusPlus.compilercache \"$@\"\n"
+        )
+    try:
+        if not path.is_file() or path.read_text(encoding="utf-8") != text:
+            root.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8", newline="")
+            tmp.chmod(0o755)
+            os.replace(tmp, path)
+    except OSError:
+        return None
+    return str(path)
+
+
+def compiler_env(project, log_file=None) -> Optional[Dict[str, str]]:
+    """
+    Environment for setuptools build_ext (Cython): CC/CXX prefixed with ccache/sccache
+    or the local launcher. None if nothing applies (off, Windows/MSVC ignores CC).
+    """
+    mode, exe = resolve_mode(project)
+    if mode == "off" or os.name == "nt":
+        return None
+    launcher = exe if mode == "ccache" else launcher_script()
+    if not launcher:
+        return None
+    env = dict(os.environ)
+    for var in ("CC", "CXX"):
+        base = env.get(var) or sysconfig.get_config_var(var)
+        if base and "ccache" not in base and "apy-cc" not in base:
+            env[var] = f"{shlex.quote(launcher)} {base}"
+    if log_file is not None:
+        log_file.write(f"--- INFO: Compiler cache ({mode}): CC={env.get('CC', '')}\n")
+    return env
+
+
+def nuitka_env(project, log_file=None) -> Tuple[Optional[Dict[str, str]], List[str]]:
+    """
+    (env, extra options) for Nuitka. Nuitka drives ccache itself; an explicitly found
+    ccache is passed via NUITKA_CCACHE_BINARY, "off" adds --disable-ccache. The local
+    stand-in is not used (Nuitka only talks to a real ccache).
+    """
+    mode, exe = resolve_mode(project)
+    if mode == "off":
+        return None, ["--disable-ccache"]
+    if mode == "ccache" and Path(exe).stem.lower() == "ccache":
+        if log_file is not None:
+            log_file.write(f"--- INFO: Compiler cache (ccache): NUITKA_CCACHE_BINARY={exe}\n")
+        return dict(os.environ, NUITKA_CCACHE_BINARY=exe), []
+    return None, []
+
+
+# =====================================================================
+#                     Session statistics (build summary)
+# =====================================================================
+
+def external_stats(exe: str) -> Optional[Tuple[int, int]]:
+    """(hits, misses) counters of ccache (--print-stats) or sccache (JSON stats)."""
+    try:
+        if Path(exe).stem.lower() == "sccache":
+            out = subprocess.run([exe, "--show-stats", "--stats-format=json"], capture_output=True, text=True, timeout=10).stdout
+            stats = json.loads(out).get("stats", {})
+            hits = sum((stats.get("cache_hits") or {}).get("counts", {}).values())
+            misses = sum((stats.get("cache_misses") or {}).get("counts", {}).values())
+            return hits, misses
+        out = subprocess.run([exe, "--print-stats"], capture_output=True, text=True, timeout=10).stdout
+        values = {}
+        for line in out.splitlines():
+            name, _, value = line.partition("\t")
+            if value.strip().isdigit():
+                values[name.strip()] = int(value)
+        if not values:
+            return None
+        return (values.get("direct_cache_hit", 0) + values.get("preprocessed_cache_hit", 0),
+                values.get("cache_miss", 0))
+    except (OSError, ValueError, AttributeError, subprocess.SubprocessError):
+        return None
+
+
+class CompilerCacheSession:
+    """Hit rate of one compile_projects() run: local stand-in plus ccache/sccache counter deltas."""
+
+    def __init__(self, cache: Optional[ObjectCache] = None) -> None:
+        self.cache = cache or object_cache()
+        self._offset = self.cache.stats_offset()
+        self._external: Dict[str, Tuple[int, int]] = {}
+        for name in ("ccache", "sccache"):
+            exe = which_tool(name)
+            stats = external_stats(exe) if exe else None
+            if stats is not None:
+                self._external[exe] = stats
+
+    def totals(self) -> Dict[str, Tuple[int, int]]:
+        """{"local": (hits, misses), "<exe name>": (hits, misses)}, only sources with activity."""
+        result = {}
+        local = self.cache.stats_since(self._offset)
+        if sum(local):
+            result["local"] = local
+        for exe, (h0, m0) in self._external.items():
+            now = external_stats(exe)
+            if now is not None and (now[0] - h0 or now[1] - m0):
+                result[Path(exe).stem] = (max(0, now[0] - h0), max(0, now[1] - m0))
+        return result
+
+    def describe(self, totals: Optional[Dict[str, Tuple[int, int]]] = None) -> Optional[str]:
+        totals = self.totals() if totals is None else totals
+        if not totals:
+            return None
+        hits = sum(h for h, _ in totals.values())
+        misses = sum(m for _, m in totals.values())
+        rate = 100.0 * hits / max(1, hits + misses)
+        parts = ", ".join(f"{k} {h}/{h + m}" for k, (h, m) in totals.items())
+        return f"Compiler cache: {hits} hit(s), {misses} miss(es), {rate:.0f}% hit rate ({parts})"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Launcher: python -m AutoPyPlusPlus.compilercache <compiler> <args...>"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        sys.stderr.write("usage: python -m AutoPyPlusPlus.compilercache <compiler> [args...]\n")
+        return 2
+    # hit notes and the replayed warnings go to stderr, i.e. into the build log of the caller
+    result = object_cache().compile(argv, log_file=sys.stderr)
+    return int(getattr(result, "returncode", 1))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
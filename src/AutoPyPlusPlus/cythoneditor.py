@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 from typing import Optional
-from .gcceditor import GCCEditor
+from .lazy import lazy
+
+GCCEditor = lazy(".gcceditor", "GCCEditor")  # only for the C++ settings dialog
 
 
 class CythonEditor:
@@ -23,6 +25,8 @@ class CythonEditor:
         self.e_extra_compile_args: Optional[ttk.Entry] = None
         self.e_extra_link_args: Optional[ttk.Entry] = None
         self.e_output_name: Optional[ttk.Entry] = None
+        self.e_package_dir: Optional[ttk.Entry] = None
+        self.e_jobs: Optional[ttk.Entry] = None
         self.files_listbox: Optional[tk.Listbox] = None
 
         # Tk variables initialized in show()
@@ -44,6 +48,7 @@ class CythonEditor:
         self.var_cplus_exceptions: Optional[tk.BooleanVar] = None
         self.var_cpp_locals: Optional[tk.BooleanVar] = None
         self.var_annotate: Optional[tk.BooleanVar] = None
+        self.var_incremental: Optional[tk.BooleanVar] = None
         self.var_target_os: Optional[tk.StringVar] = None
 
         # convenience holder for a frame
@@ -89,6 +94,8 @@ class CythonEditor:
         assert self.e_extra_compile_args is not None
         assert self.e_extra_link_args is not None
         assert self.e_output_name is not None
+        assert self.e_package_dir is not None
+        assert self.e_jobs is not None
         assert self.files_listbox is not None
 
         assert self.var_use_cython is not None
@@ -109,6 +116,7 @@ class CythonEditor:
         assert self.var_cplus_exceptions is not None
         assert self.var_cpp_locals is not None
         assert self.var_annotate is not None
+        assert self.var_incremental is not None
         assert self.var_target_os is not None
 
     def show(self):
@@ -216,6 +224,9 @@ class CythonEditor:
         self.var_annotate = tk.BooleanVar(value=getattr(self.project, "cython_annotate", False))
         ttk.Checkbutton(adv_frame, text="Annotate (HTML analysis)", variable=self.var_annotate).pack(anchor="w", pady=2)
 
+        self.var_incremental = tk.BooleanVar(value=getattr(self.project, "cython_incremental", True))
+        ttk.Checkbutton(adv_frame, text="Incremental (skip unchanged .pyx/.pxd)", variable=self.var_incremental).pack(anchor="w", pady=2)
+
         ttk.Separator(adv_frame, orient="horizontal").pack(fill="x", pady=7)
 
         ttk.Label(adv_frame, text="Target OS:").pack(anchor="w", pady=(3, 0))
@@ -310,6 +321,18 @@ class CythonEditor:
             9,  # nächste freie Zeile (nach extra_link_args ist 8)
         )
 
+        self.e_package_dir = add_entry_row(
+            "Package dir (all .pyx, optional):",
+            getattr(self.project, "cython_package_dir", ""),
+            10,
+            self._choose_dir,
+        )
+        self.e_jobs = add_entry_row(
+            "Parallel modules (0 = auto):",
+            str(getattr(self.project, "cython_jobs", 0)),
+            11,
+        )
+
         # Prefill Output Name aus dem Projektnamen (ohne Endung), falls noch leer
         if not getattr(self.project, "cython_output_name", ""):
             base = Path(getattr(self.project, "name", "")).stem or (Path(self.project.script).stem if getattr(self.project, "script", "") else "")
@@ -467,8 +490,13 @@ class CythonEditor:
         language_level = self.var_language_level.get()
         setup_py = self.e_setup_py.get().strip()
 
+        package_dir = self.e_package_dir.get().strip()
+        if package_dir and not Path(package_dir).is_dir():
+            issues.append(f"Package dir does not exist: {package_dir}")
+
         if not script:
-            issues.append("Source file is empty.")
+            if not package_dir:
+                issues.append("Source file is empty.")
         else:
             path = Path(script)
             if not path.exists():
@@ -536,6 +564,7 @@ class CythonEditor:
         p.cython_cplus_exceptions = self.var_cplus_exceptions.get()
         p.cython_cpp_locals = self.var_cpp_locals.get()
         p.cython_annotate = self.var_annotate.get()
+        p.cython_incremental = self.var_incremental.get()
         p.cython_build_with_setup = self.var_build_with_setup.get()
         p.cython_target_os = self.var_target_os.get()
         # We'll overwrite cython_setup_py below to enforce invariant
@@ -543,6 +572,9 @@ class CythonEditor:
         p.cython_extra_compile_args = [s.strip() for s in self.e_extra_compile_args.get().split(",") if s.strip()]
         p.cython_extra_link_args = [s.strip() for s in self.e_extra_link_args.get().split(",") if s.strip()]
         p.cython_include_dirs = [s.strip() for s in self.e_include_dirs.get().split(",") if s.strip()]
+        p.cython_package_dir = self.e_package_dir.get().strip()
+        jobs = self.e_jobs.get().strip()
+        p.cython_jobs = int(jobs) if jobs.isdigit() else 0
         # Speichere Target Type
         p.cython_target_type = self.var_cython_target_type.get()
 
@@ -1,13 +1,21 @@
+from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk, messagebox
+from tkinter import font as tkfont
 from pathlib import Path
 from datetime import datetime
 import os
 import re
+import shutil
 from typing import List
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from .project import Project
 from .config import save_config
+from .logindex import LineIndex, LogSidecar, compile_bytes_query, sidecar_path
+from .loghighlight import KEYWORD_PATTERNS, Highlighter
+from .logsearch import LogSearchIndex, LogSearchIndexer
 
 ERROR_RECOMMENDATIONS = {
     "permission denied": "🔒 Permission denied. First Aid: 1) Restart system 2) Check file/folder permissions.",
@@ -64,40 +72,9 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
     WINDOW_TITLE = "Log Analyzer"
     WINDOW_SIZE = "1200x700"
     MIN_WINDOW_SIZE = "400x300"
-    KEYWORD_PATTERNS = {
-        # Allgemein
-        "warning": (r"(?i)\bwarning\b", "#FFAA00"),
-        "info": (r"(?i)\binfo\b", "#55AAFF"),
-        "debug": (r"(?i)\bdebug\b", "#00FFAA"),
-        "permission_denied": (r"(?i)permission denied", "#FF5555"),
-        "success": (r"(?i)success", "#55FF55"),
-        "successfully": (r"(?i)successfully", "#55FF55"),
-        "not_found": (r"(?i)not found", "#FF5555"),
-        "true": (r"(?i)\btrue\b", "#00FF00"),
-        "false": (r"(?i)\bfalse\b", "#FF0000"),
-        "failed": (r"(?i)failed", "#FF5555"),
-        "end_0_errors": (r"(?i)end: 0 errors", "#55FF55"),
-        "starting_compilation": (r"(?i)starting compilation", "#FFAA00"),
-        # Pytest-spezifisch
-        "pytest_fail": (r"(?i)\bFAILED\b|\bFAILURES\b", "#FF2222"),
-        "pytest_pass": (r"(?i)\bPASSED\b|\bcollected \d+ items\b", "#55FF99"),
-        "pytest_xfail": (r"(?i)\bXFAIL\b|\bXPASS\b", "#999999"),
-        "pytest_error": (r"(?i)\bERROR\b", "#FF2222"),
-        "pytest_trace": (r"(?i)>\s+assert\b|\s+E\s+", "#AA00FF"),
-        "pytest_monkey": (r"\bmonkeypatch\b", "#00DDFF"),
-        "pytest_capsys": (r"\bcapsys\b", "#00DDFF"),
-        "pytest_fixture": (r"\bfixture\b", "#FF00AA"),
-        "pytest_collect": (r"collected \d+ items", "#BBBBFF"),
-        "pytest_summary": (r"short test summary info", "#FFFF44"),
-        "pytest_line": (r"={4,}", "#666666"),
-        "pytest_testcase": (r"\bdef test_\w+", "#FFFF00"),
-        # Optional: catch MSVC lines explicitly (helps show C1083 lines even if no 'failed' token)
-        "msvc_fatal": (r"(?i)\bfatal error C\d{4}\b", "#FF2222"),
-        "msvc_error": (r"(?i)\berror C\d{4}\b", "#FF4444"),
-    }
 
     FONT_CONFIG = ("Segoe UI", 10)
-    CHUNK_SIZE = 1000
+    CHUNK_SIZE = 20000  # Zeilen pro Auswertungs-Auftrag (Fehlerliste/Statistik)
 
     window_bg = style.lookup("TFrame", "background", default="#1E2526")
     text_fg = style.lookup("TLabel", "foreground", default="#D3D7CF")
@@ -171,19 +148,19 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
     def delete_logfile():
         if messagebox.askyesno("Confirm", f"Delete logfile {logfile}?"):
             try:
+                if index is not None:
+                    index.close()  # Windows: eingeblendete Dateien lassen sich nicht löschen
                 Path(logfile).unlink()
+                sidecar_path(logfile).unlink(missing_ok=True)
+                shutil.rmtree(f"{logfile}.projects", ignore_errors=True)  # Ausgabe je Projekt (LogHub)
                 messagebox.showinfo("Success", "Logfile deleted.")
                 win.destroy()
             except Exception as e:
                 messagebox.showerror("Error", f"Deletion failed: {e}")
 
     def export_errors():
-        error_tags = ["failed", "not_found", "permission_denied", "pytest_fail", "pytest_error", "msvc_fatal", "msvc_error"]
-        error_patterns = [KEYWORD_PATTERNS[tag][0] for tag in error_tags if tag in KEYWORD_PATTERNS]
-        errors: list[str] = []
-        for log_line in lines:
-            if any(re.search(pattern, log_line) for pattern in error_patterns):
-                errors.append(log_line.strip())
+        # Fehlerzeilen hat die Hintergrund-Auswertung bereits ermittelt
+        errors: list[str] = [added_error_lines[i].strip() for i in sorted(added_error_lines)]
         if errors:
             with open("errors_export.txt", "w", encoding="utf-8") as f:
                 f.write("\n".join(errors))
@@ -218,6 +195,16 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
         btn.bind('<Enter>', lambda e, t=tooltip: show_tooltip(e, t))
         btn.bind('<Leave>', hide_tooltip)
 
+    # Projekt-/Stage-Grenzen aus dem Log-Index (<log>.idx) des Builds
+    section_lines: list[int] = []
+    section_selector = ttk.Combobox(btn_frame, state="readonly", width=30)
+    section_selector.pack(side="left", padx=5)
+    section_selector.bind("<<ComboboxSelected>>", lambda e: section_lines and goto_line(section_lines[section_selector.current()]))
+
+    # Tail-Follow: neue Zeilen werden angehängt, die Ansicht folgt dem Ende
+    follow_var = tk.BooleanVar(value=True)
+    ttk.Checkbutton(btn_frame, text="Follow", variable=follow_var).pack(side="left", padx=5)
+
     search_frame = ttk.Frame(main_frame)
     search_frame.pack(fill="x", pady=(0, 5))
     ttk.Label(search_frame, text="Search:", foreground=text_fg).pack(side="left", padx=(0, 5))
@@ -247,39 +234,28 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
     next_log_btn.pack(side="left", padx=5)
     prev_log_btn = ttk.Button(search_frame, text="Prev Log", command=lambda: navigate_log_files("prev"))
     prev_log_btn.pack(side="left", padx=5)
+    ttk.Button(search_frame, text="Search All Logs", command=lambda: search_all_logs()).pack(side="left", padx=5)
 
     ttk.Label(search_frame, text="Custom Pattern:", foreground=text_fg).pack(side="left", padx=5)
     custom_pattern_var = tk.StringVar()
     custom_entry = ttk.Entry(search_frame, textvariable=custom_pattern_var)
     custom_entry.pack(side="left", padx=5)
 
+    # Virtualisierte Ansicht: das Text-Widget enthält nur die sichtbaren Zeilen, die
+    # Scrollbar bildet die Position im LineIndex (mmap + Zeilen-Offsets) ab.
     text_frame = ttk.Frame(main_frame)
     text_frame.pack(fill="both", expand=True)
+    xscrollbar = ttk.Scrollbar(text_frame, orient="horizontal")
+    xscrollbar.pack(side="bottom", fill="x")
     line_numbers_widget = tk.Text(text_frame, width=4, bg=window_bg, fg=text_fg, font=FONT_CONFIG)
     line_numbers_widget.pack(side="left", fill="y")
     scrollbar = ttk.Scrollbar(text_frame, orient="vertical")
     scrollbar.pack(side="right", fill="y")
-    text_widget = tk.Text(text_frame, wrap="word", yscrollcommand=scrollbar.set, font=FONT_CONFIG, bg=window_bg, fg=text_fg, insertbackground=text_fg)
+    text_widget = tk.Text(text_frame, wrap="none", xscrollcommand=xscrollbar.set, font=FONT_CONFIG, bg=window_bg, fg=text_fg, insertbackground=text_fg)
     text_widget.pack(side="left", fill="both", expand=True)
+    xscrollbar.config(command=text_widget.xview)
+    line_height = max(1, tkfont.Font(font=FONT_CONFIG).metrics("linespace"))
 
-    def on_scroll(*args):
-        text_widget.yview(*args)
-        line_numbers_widget.yview(*args)
-
-    scrollbar.config(command=on_scroll)
-
-    def on_text_scroll(event):
-        line_numbers_widget.yview_moveto(text_widget.yview()[0])
-
-    def on_line_numbers_scroll(event):
-        text_widget.yview_moveto(line_numbers_widget.yview()[0])
-
-    text_widget.bind("<MouseWheel>", on_text_scroll)
-    line_numbers_widget.bind("<MouseWheel>", on_line_numbers_scroll)
-    text_widget.bind("<Button-4>", on_text_scroll)
-    text_widget.bind("<Button-5>", on_text_scroll)
-    line_numbers_widget.bind("<Button-4>", on_line_numbers_scroll)
-    line_numbers_widget.bind("<Button-5>", on_line_numbers_scroll)
     context_menu = tk.Menu(text_widget, tearoff=0)
     context_menu.add_command(label="Copy Line", command=lambda: text_widget.clipboard_append(text_widget.get("insert linestart", "insert lineend")))
     context_menu.add_command(label="Show Context", command=lambda: show_error_context(None))
@@ -290,8 +266,15 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
     error_listbox = tk.Listbox(error_frame, height=7, bg=window_bg, fg="#FF0000", font=FONT_CONFIG, selectbackground="#4A4A4A")
     error_listbox.pack(side="left", fill="x", expand=True)
 
-    lines: list[str] = []
-    last_modified = Path(logfile).stat().st_mtime
+    index: LineIndex | None = None
+    load_generation = 0
+    view_top = 0          # erste sichtbare Zeile (0-basiert)
+    view_count = 0        # Zeilen im Text-Widget
+    current_line = 0      # markierte Zeile (1-basiert, 0 = keine)
+    analyzed = 0          # bis hierher ausgewertete Zeilen (Fehlerliste/Statistik)
+    search_rx: re.Pattern | None = None
+    search_bytes: re.Pattern | None = None
+    search_generation = 0
 
     def get_error_recommendation(log_line):
         # minimalistic: check codes first (substring, case-insensitive)
@@ -305,123 +288,313 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
                 return rec
         return ""
 
-    def load_logfile_chunks(chunk_size=CHUNK_SIZE):
-        nonlocal lines
-        text_widget.config(state="normal")
-        text_widget.delete("1.0", "end")
-        line_numbers_widget.delete("1.0", "end")
-        try:
-            with open(logfile, encoding="utf-8") as f:
-                lines[:] = f.readlines()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load logfile: {e}")
-            return
-        text_widget.insert("1.0", "".join(lines))
-        line_numbers_widget.insert("1.0", "\n".join(str(i) for i in range(1, len(lines) + 1)))
-        text_widget.config(state="disabled")
-        line_numbers_widget.config(state="disabled")
-        apply_highlighting()
-        text_widget.see("end")
-
-    def load_logfile_async():
-        def load():
-            load_logfile_chunks()
-            win.after(0, lambda: [apply_highlighting(), update_button_states()])
-        threading.Thread(target=load, daemon=True).start()
+    text_widget.tag_configure("highlight_line", background="#4A4A4A")
+    for tag, (_pattern, color) in KEYWORD_PATTERNS.items():
+        text_widget.tag_configure(tag, foreground=color, font=("Segoe UI", 10, "bold"))
+    text_widget.tag_configure("value", foreground="#FFFF00")
+    text_widget.tag_configure("custom", foreground="#FF00FF")
+    text_widget.tag_configure("search", background="#FFFF00")
+
+    def visible_rows() -> int:
+        height = text_widget.winfo_height()
+        if height <= 1:  # noch nicht eingeblendet
+            return int(text_widget.cget("height"))
+        return max(1, height // line_height)
+
+    def render(top: int | None = None):
+        """Nur das sichtbare Fenster aus dem Index materialisieren und hervorheben."""
+        nonlocal view_top, view_count
+        total = len(index) if index is not None else 0
+        rows = visible_rows()
+        view_top = max(0, min(view_top if top is None else top, total - rows))
+        text = index.text(view_top, view_top + rows) if total else ""
+        if text.endswith("\n"):
+            text = text[:-1]
+        view_count = text.count("\n") + 1 if text else 0
+        numbers = "\n".join(str(i) for i in range(view_top + 1, view_top + view_count + 1))
+        for widget, content in ((text_widget, text), (line_numbers_widget, numbers)):
+            widget.config(state="normal")
+            widget.delete("1.0", "end")
+            widget.insert("1.0", content)
+            widget.config(state="disabled")
+        line_numbers_widget.config(width=max(4, len(str(total))))
+        highlight_window(text)
+        if total:
+            scrollbar.set(view_top / total, min(1.0, (view_top + rows) / total))
+        else:
+            scrollbar.set(0.0, 1.0)
 
-    def check_file_changes():
-        nonlocal last_modified
-        try:
-            current_mtime = Path(logfile).stat().st_mtime
-            if current_mtime > last_modified:
-                last_modified = current_mtime
-                load_logfile_async()
-        except FileNotFoundError:
-            return
-        win.after(1000, check_file_changes)
+    def highlight_window(text: str):
+        # das Fenster ist klein (eine Bildschirmseite) -> synchron im Tk-Thread
+        for tag, flat in highlighter.scan(text).batches():
+            text_widget.tag_add(tag, *flat)
+        window_lines = text.split("\n")
+        pattern = custom_pattern_var.get().strip()
+        if pattern:
+            try:
+                custom = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                custom = None
+            for i, log_line in enumerate(window_lines, 1):
+                for match in custom.finditer(log_line) if custom else ():
+                    text_widget.tag_add("custom", f"{i}.{match.start()}", f"{i}.{match.end()}")
+        if search_rx is not None:
+            for i, log_line in enumerate(window_lines, 1):
+                for match in search_rx.finditer(log_line):
+                    text_widget.tag_add("search", f"{i}.{match.start()}", f"{i}.{match.end()}")
+            text_widget.tag_raise("search")
+        update_line_highlight()
 
     def update_line_highlight():
-        text_widget.config(state="normal")
         text_widget.tag_remove("highlight_line", "1.0", "end")
-        current_index = text_widget.index("insert")
-        line_num = int(current_index.split(".")[0])
-        text_widget.tag_add("highlight_line", f"{line_num}.0", f"{line_num + 1}.0")
-        if "search" in text_widget.tag_names():
-            text_widget.tag_raise("highlight_line", "search")
-        else:
-            text_widget.tag_raise("highlight_line")
-        text_widget.config(state="disabled")
+        row = current_line - view_top
+        if 1 <= row <= view_count:
+            text_widget.tag_add("highlight_line", f"{row}.0", f"{row + 1}.0")
+            if "search" in text_widget.tag_names():
+                text_widget.tag_raise("highlight_line", "search")
+            else:
+                text_widget.tag_raise("highlight_line")
 
-    # Positions in the text widget for each error; and a mapping from listbox rows to these positions
-    error_positions: list[str] = []
+    def goto_line(line: int, center: bool = True):
+        """Zeile (1-basiert) markieren und ins Fenster holen."""
+        nonlocal current_line
+        if index is None or not len(index):
+            return
+        current_line = max(1, min(line, len(index)))
+        rows = visible_rows()
+        top = view_top
+        if center:
+            top = current_line - 1 - rows // 3
+        elif current_line - 1 < view_top:
+            top = current_line - 1
+        elif current_line > view_top + rows:
+            top = current_line - rows
+        render(top)
+        row = current_line - view_top
+        text_widget.mark_set("insert", f"{row}.0")
+
+    def on_scroll(*args):
+        if index is None:
+            return
+        if args[0] == "moveto":
+            render(int(float(args[1]) * len(index)))
+        elif args[0] == "scroll":
+            step = visible_rows() if args[2] == "pages" else 1
+            render(view_top + int(args[1]) * step)
+
+    scrollbar.config(command=on_scroll)
+
+    def on_mouse_wheel(event):
+        if event.num in (4, 5):
+            delta = -3 if event.num == 4 else 3
+        else:
+            delta = -3 * int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        render(view_top + delta)
+        return "break"
+
+    for widget in (text_widget, line_numbers_widget):
+        widget.bind("<MouseWheel>", on_mouse_wheel)
+        widget.bind("<Button-4>", on_mouse_wheel)
+        widget.bind("<Button-5>", on_mouse_wheel)
+
+    def move_cursor(delta: int):
+        goto_line((current_line or view_top + 1) + delta, center=False)
+        return "break"
+
+    text_widget.bind("<Up>", lambda e: move_cursor(-1))
+    text_widget.bind("<Down>", lambda e: move_cursor(1))
+    text_widget.bind("<Prior>", lambda e: move_cursor(-visible_rows()))
+    text_widget.bind("<Next>", lambda e: move_cursor(visible_rows()))
+    text_widget.bind("<Control-Home>", lambda e: move_cursor(-len(index or ())))
+    text_widget.bind("<Control-End>", lambda e: move_cursor(len(index or ())))
+    text_widget.bind("<Configure>", lambda e: render())
+
+    # Positions (file lines) for each error; and a mapping from listbox rows to these positions
+    error_positions: list[int] = []
     row_to_err_idx: list[int] = []
 
-    def apply_highlighting():
-        nonlocal error_positions
-        # reset listbox and mappings
+    stats = {tag: 0 for tag in KEYWORD_PATTERNS}
+    # dedupe by source line so each error line is listed once (line -> text)
+    added_error_lines: dict[int, str] = {}
+
+    # Ein Worker: Auswertungs-Aufträge (Voll-Laden, Tail-Blöcke) laufen in Reihenfolge
+    highlighter = Highlighter()
+    highlight_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-highlight")
+
+    # Suche über alle compile_*.log des Verzeichnisses: invertierter Index, im Hintergrund nachgeführt
+    try:
+        log_search: LogSearchIndex | None = LogSearchIndex(log_dir)
+        log_indexer: LogSearchIndexer | None = LogSearchIndexer(log_search)
+        log_indexer.start()
+    except Exception:  # z. B. Cache-Verzeichnis nicht beschreibbar
+        log_search = log_indexer = None
+
+    def on_destroy(event):
+        if event.widget is win:
+            highlight_pool.shutdown(wait=False)
+            if log_indexer is not None:
+                log_indexer.stop()
+            if index is not None:
+                index.close()
+
+    win.bind("<Destroy>", on_destroy, add="+")
+
+    def reset_analysis():
+        nonlocal analyzed
+        analyzed = 0
         error_listbox.delete(0, "end")
         row_to_err_idx.clear()
         error_positions.clear()
+        added_error_lines.clear()
+        for tag in stats:
+            stats[tag] = 0
+
+    def analyze():
+        """Fehlerliste/Statistik für die noch nicht ausgewerteten Zeilen, blockweise im Hintergrund."""
+        nonlocal analyzed
+        first, last = analyzed, len(index)
+        if first >= last:
+            return
+        # die offene letzte Zeile kann noch wachsen -> beim nächsten Mal erneut auswerten
+        analyzed = index.complete_lines
+        generation, source = load_generation, index
+
+        def deliver(payload):
+            try:
+                win.after(0, lambda: show_analysis(payload, generation))
+            except (tk.TclError, RuntimeError):
+                pass  # Fenster bereits geschlossen
+
+        def job():
+            try:
+                for start in range(first, last, CHUNK_SIZE):
+                    if generation != load_generation:
+                        return
+                    text = source.text(start, min(last, start + CHUNK_SIZE))
+                    result = highlighter.scan(text, start + 1)
+                    block = text.split("\n")
+                    deliver((result.stats, [(i, block[i - 1 - start]) for i in result.error_lines]))
+            except Exception as e:
+                deliver(e)
 
-        text_widget.config(state="normal")
-        stats = {tag: 0 for tag in KEYWORD_PATTERNS}
-        critical_tags = ["failed", "permission_denied", "not_found", "pytest_fail", "pytest_error", "msvc_fatal", "msvc_error"]
-        text_widget.tag_configure("highlight_line", background="#4A4A4A")
-
-        # dedupe by source line so each error line is listed once
-        added_error_lines: set[int] = set()
-
-        for tag, (pattern, color) in KEYWORD_PATTERNS.items():
-            text_widget.tag_configure(tag, foreground=color, font=("Segoe UI", 10, "bold"))
-            for i, log_line in enumerate(lines, 1):
-                for match in re.finditer(pattern, log_line):
-                    text_widget.tag_add(tag, f"{i}.{match.start()}", f"{i}.{match.end()}")
-                    stats[tag] += 1
-                    if tag.startswith("error") or tag in critical_tags:
-                        if i in added_error_lines:
-                            continue
-                        added_error_lines.add(i)
-
-                        # Base error row
-                        base_text = f"Line {i}: {log_line.strip()}"
-                        error_listbox.insert("end", base_text)
-
-                        # record target position for this error row
-                        error_positions.append(f"{i}.0")
-                        row_to_err_idx.append(len(error_positions) - 1)
-
-                        # Optional recommendation row – maps to same error index
-                        recommendation = get_error_recommendation(log_line)
-                        if recommendation:
-                            tip_text = f"   {recommendation}"
-                            error_listbox.insert("end", tip_text)
-                            tip_idx = error_listbox.size() - 1
-                            try:
-                                error_listbox.itemconfig(tip_idx, foreground=HELP_FG)
-                            except Exception:
-                                pass
-                            # map tip row to the same error index as the base row
-                            row_to_err_idx.append(len(error_positions) - 1)
-
-        # Stacktrace und Testnamen speziell hervorheben
-        for i, log_line in enumerate(lines, 1):
-            # Pytest-Trace
-            if re.match(r"\s+E\s+", log_line):
-                text_widget.tag_add("pytest_trace", f"{i}.0", f"{i}.end")
-            # Testfunktion
-            if re.search(r"\bdef test_\w+", log_line):
-                text_widget.tag_add("pytest_testcase", f"{i}.0", f"{i}.end")
-
-        text_widget.tag_configure("value", foreground="#FFFF00")
-        for i, log_line in enumerate(lines, 1):
-            for match in re.finditer(r"\b0x[0-9a-fA-F]+\b|\b\d{4}-\d{2}-\d{2}\b|\bexit code \d+\b", log_line):
-                text_widget.tag_add("value", f"{i}.{match.start()}", f"{i}.{match.end()}")
-
-        text_widget.tag_configure("custom", foreground="#FF00FF")
-        apply_custom_pattern()
+        highlight_pool.submit(job)
+
+    def show_analysis(payload, generation: int):
+        """Ergebnis eines Blocks im Tk-Thread übernehmen."""
+        if generation != load_generation or not win.winfo_exists():
+            return
+        if isinstance(payload, Exception):
+            stats_label.config(text=f"Highlighting failed: {payload}")
+            return
+        block_stats, errors = payload
+        for i, log_line in errors:
+            if i in added_error_lines:
+                continue
+            added_error_lines[i] = log_line
+
+            # Base error row
+            base_text = f"Line {i}: {log_line.strip()}"
+            error_listbox.insert("end", base_text)
+
+            # record target line for this error row
+            error_positions.append(i)
+            row_to_err_idx.append(len(error_positions) - 1)
+
+            # Optional recommendation row – maps to same error index
+            recommendation = get_error_recommendation(log_line)
+            if recommendation:
+                tip_text = f"   {recommendation}"
+                error_listbox.insert("end", tip_text)
+                tip_idx = error_listbox.size() - 1
+                try:
+                    error_listbox.itemconfig(tip_idx, foreground=HELP_FG)
+                except Exception:
+                    pass
+                # map tip row to the same error index as the base row
+                row_to_err_idx.append(len(error_positions) - 1)
+
+        for tag, count in block_stats.items():
+            if tag in stats:
+                stats[tag] += count
         stats_text = " | ".join(f"{tag.capitalize()}: {count}" for tag, count in stats.items())
         stats_label.config(text=stats_text)
-        text_widget.config(state="disabled")
+
+    def show_sections(sidecar: LogSidecar | None):
+        labels: list[str] = []
+        section_lines.clear()
+        for sec in sidecar.sections if sidecar else ():
+            labels.append(f"{sec['section']} ({sec.get('state') or '?'})")
+            section_lines.append(sec["start"])
+            for stage, line in sec.get("stages", []):
+                labels.append(f"    {sec['section']} › {stage}")
+                section_lines.append(line)
+        section_selector["values"] = labels
+        section_selector.set(f"Sections ({len(sidecar.sections)})" if labels else "")
+
+    def show_index(new_index: LineIndex, sidecar: LogSidecar | None, errors: list, generation: int, line: int = 0):
+        """
+        Neu aufgebauten Index übernehmen (Tk-Thread); Ansicht startet am Ende wie bisher
+        bzw. bei line (Treffer aus "Search All Logs").
+        Mit Log-Index liegen Fehlerliste und Statistik schon vor, ausgewertet wird nur der Rest.
+        """
+        nonlocal index, current_line, analyzed
+        if generation != load_generation or not win.winfo_exists():
+            new_index.close()
+            return
+        index = new_index
+        current_line = 0
+        reset_analysis()
+        if sidecar is not None:
+            analyzed = sidecar.lines
+            show_analysis((sidecar.stats, errors), generation)
+        show_sections(sidecar)
+        if line:
+            goto_line(line)
+        else:
+            render(len(index))
+        analyze()
+        update_button_states()
+
+    def load_logfile_async(line: int = 0):
+        # Index im Hintergrund aufbauen, Widgets nur im Tk-Thread; veraltete Ladevorgänge verwerfen
+        nonlocal load_generation, index
+        load_generation += 1
+        generation, path = load_generation, logfile
+        if index is not None:
+            index.close()
+            index = None
+
+        def load():
+            new_index = LineIndex(path)
+            try:
+                # Log-Index des Builds: Marken übernehmen statt die Datei zu scannen
+                sidecar = new_index.load_sidecar()
+                new_index.refresh()
+                errors = [(i, "".join(new_index.lines(i - 1, i))) for i in sidecar.errors] if sidecar else []
+            except Exception as e:
+                new_index.close()
+                msg = f"Failed to load logfile: {e}"
+                win.after(0, lambda: messagebox.showerror("Error", msg))
+                return
+            win.after(0, lambda: show_index(new_index, sidecar, errors, generation, line))
+        threading.Thread(target=load, daemon=True).start()
+
+    def check_file_changes():
+        # Tail: nur nachgeschriebene Bytes indizieren, Fenster bei Follow am Ende halten
+        try:
+            if index is not None and index.changed():
+                at_bottom = view_top + visible_rows() >= len(index)
+                if index.refresh():
+                    load_logfile_async()
+                else:
+                    analyze()
+                    render(len(index) if follow_var.get() and at_bottom else view_top)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            stats_label.config(text=f"Tail error: {e}")
+        if win.winfo_exists():
+            win.after(1000, check_file_changes)
 
     def jump_to_error(event):
         # Robust: use explicit row->error index mapping
@@ -440,101 +613,157 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
         if err_idx < 0 or err_idx >= len(error_positions):
             return
 
-        target = error_positions[err_idx]
-
-        text_widget.config(state="normal")
-        try:
-            text_widget.tag_remove("highlight_line", "1.0", "end")
-            line_num = int(target.split(".")[0])
-            text_widget.see(target)
-            text_widget.mark_set("insert", target)
-            text_widget.tag_add("highlight_line", f"{line_num}.0", f"{line_num + 1}.0")
-            if "search" in text_widget.tag_names():
-                text_widget.tag_raise("highlight_line", "search")
-            else:
-                text_widget.tag_raise("highlight_line")
-        finally:
-            text_widget.config(state="disabled")
+        goto_line(error_positions[err_idx])
 
     error_listbox.bind("<Double-1>", jump_to_error)
 
-    def apply_custom_pattern():
-        text_widget.config(state="normal")
-        text_widget.tag_remove("custom", "1.0", "end")
-        pattern = custom_pattern_var.get().strip()
-        if pattern:
-            try:
-                for i, log_line in enumerate(lines, 1):
-                    for match in re.finditer(pattern, log_line, re.IGNORECASE):
-                        text_widget.tag_add("custom", f"{i}.{match.start()}", f"{i}.{match.end()}")
-            except re.error:
-                messagebox.showerror("Invalid Pattern", "Invalid regular expression.")
-        text_widget.config(state="disabled")
-
-    custom_pattern_var.trace_add("write", lambda *_: apply_custom_pattern())
+    custom_pattern_var.trace_add("write", lambda *_: render())
 
-    text_widget.bind("<Button-1>", lambda event: [text_widget.mark_set("insert", text_widget.index("@%d,%d" % (event.x, event.y))), update_line_highlight()])
-    text_widget.bind("<KeyPress>", lambda event: [win.after(0, update_line_highlight)])
+    def on_click(event):
+        nonlocal current_line
+        text_widget.focus_set()
+        text_widget.mark_set("insert", text_widget.index("@%d,%d" % (event.x, event.y)))
+        current_line = view_top + int(text_widget.index("insert").split(".")[0])
+        update_line_highlight()
 
-    matches: list[str] = []
+    text_widget.bind("<Button-1>", on_click)
 
     def search_text(*args):
-        text_widget.config(state="normal")
-        text_widget.tag_remove("search", "1.0", "end")
+        nonlocal search_rx, search_bytes
+        search_rx = search_bytes = None
         query = search_var.get().strip()
-        if not query:
-            text_widget.config(state="disabled")
+        if query:
+            try:
+                flags = 0 if case_sensitive_var.get() else re.IGNORECASE
+                search_rx = re.compile(query, flags) if regex_var.get() else re.compile(re.escape(query), flags)
+                search_bytes = compile_bytes_query(query, regex_var.get(), case_sensitive_var.get())
+            except re.error:
+                search_rx = search_bytes = None
+                messagebox.showerror("Invalid Regex", "Invalid regular expression.")
+        render()
+        if search_bytes is not None:
+            find_match(0)
+
+    def find_match(from_line: int, backwards: bool = False, notify: bool = False):
+        """Treffer über den Index suchen (Hintergrund-Thread, nur die neueste Suche zählt)."""
+        nonlocal search_generation
+        search_generation += 1
+        generation, rx, source = search_generation, search_bytes, index
+        if source is None:
             return
-        text_widget.tag_configure("search", background="#FFFF00")
-        matches.clear()
-        try:
-            flags = 0 if case_sensitive_var.get() else re.IGNORECASE
-            pattern = re.compile(query, flags) if regex_var.get() else re.compile(re.escape(query), flags)
-            for i, log_line in enumerate(lines, 1):
-                for match in pattern.finditer(log_line):
-                    start = f"{i}.{match.start()}"
-                    end = f"{i}.{match.end()}"
-                    text_widget.tag_add("search", start, end)
-                    matches.append(start)
-            if matches:
-                text_widget.see(matches[0])
-                text_widget.tag_raise("search")
-        except re.error:
-            messagebox.showerror("Invalid Regex", "Invalid regular expression.")
-        text_widget.config(state="disabled")
+        stale = lambda: generation != search_generation
+
+        def job():
+            try:
+                line = source.search(rx, from_line, backwards, stop=stale)
+                if line is None and not stale():
+                    line = source.search(rx, 0, stop=stale)  # wie bisher: zurück zum ersten Treffer
+            except (OSError, ValueError):
+                return  # Index wurde geschlossen/neu geladen
+            win.after(0, lambda: stale() or show_match(line, notify))
+        threading.Thread(target=job, daemon=True).start()
+
+    def show_match(line: int | None, notify: bool):
+        if line is None:
+            if notify:
+                messagebox.showinfo("Info", "No search matches found.")
+            return
+        goto_line(line + 1)
 
     def navigate_matches(direction):
-        if not matches:
+        if search_bytes is None:
             messagebox.showinfo("Info", "No search matches found.")
             return
-        current = text_widget.index("insert")
-        next_match = matches[0]
+        current = current_line or view_top + 1
         if direction == "next":
-            for m in matches:
-                if m > current:
-                    next_match = m
-                    break
+            find_match(current, notify=True)
         else:
-            for m in reversed(matches):
-                if m < current:
-                    next_match = m
-                    break
-        text_widget.see(next_match)
-        text_widget.mark_set("insert", next_match)
-        update_line_highlight()
+            find_match(current - 1, backwards=True, notify=True)
 
-    def navigate_log_files(direction):
+    def select_log(new_index: int, line: int = 0):
         nonlocal logfile, current_log_index
+        logfile = str(log_files[new_index])
+        current_log_index = new_index
+        log_selector.current(current_log_index)
+        log_path = Path(logfile)
+        file_info = f"Logfile: {log_path.name} | Size: {log_path.stat().st_size / 1024:.2f} KB | Created: {datetime.fromtimestamp(log_path.stat().st_ctime).strftime('%Y-%m-%d %H:%M:%S')}"
+        file_info_label.config(text=file_info)
+        win.title(f"{WINDOW_TITLE} - {log_path.name}")
+        load_logfile_async(line)
+
+    def navigate_log_files(direction):
         new_index = current_log_index + (1 if direction == "next" else -1)
         if 0 <= new_index < len(log_files):
-            logfile = str(log_files[new_index])
-            current_log_index = new_index
-            log_selector.current(current_log_index)
-            log_path = Path(logfile)
-            file_info = f"Logfile: {log_path.name} | Size: {log_path.stat().st_size / 1024:.2f} KB | Created: {datetime.fromtimestamp(log_path.stat().st_ctime).strftime('%Y-%m-%d %H:%M:%S')}"
-            file_info_label.config(text=file_info)
-            win.title(f"{WINDOW_TITLE} - {log_path.name}")
-            load_logfile_async()
+            select_log(new_index)
+        update_button_states()
+
+    def search_all_logs():
+        query = search_var.get().strip()
+        if not query:
+            messagebox.showinfo("Info", "Enter a search term first.")
+            return
+        if log_search is None:
+            messagebox.showerror("Error", "Log search index is not available.")
+            return
+
+        def job():
+            error = None
+            t0 = time.perf_counter()
+            try:
+                hits = log_search.search(query)
+            except Exception as e:
+                hits, error = [], str(e)
+            finally:
+                log_search.close()  # Verbindung dieses Threads
+            ms = (time.perf_counter() - t0) * 1000
+            win.after(0, lambda: show_log_hits(query, hits, ms, error))
+        threading.Thread(target=job, daemon=True).start()
+
+    def show_log_hits(query: str, hits: list, ms: float, error: str | None):
+        """Treffer aller Logs, älteste zuerst (erste Zeile = erstes Auftreten); Doppelklick öffnet."""
+        if not win.winfo_exists():
+            return
+        if error:
+            messagebox.showerror("Error", f"Log search failed: {error}")
+            return
+        res = tk.Toplevel(win)
+        res.title(f"Search All Logs - {query}")
+        res.geometry("1000x400")
+        res.configure(bg=window_bg)
+        if hits:
+            first = hits[0]
+            summary = (f"{len(hits)} hit(s) in {len({h.path for h in hits})} log(s), {ms:.0f} ms | "
+                       f"First seen: {datetime.fromtimestamp(first.started):%Y-%m-%d %H:%M} in {Path(first.path).name}:{first.line}")
+        else:
+            summary = f"No hits ({ms:.0f} ms)"
+        if log_indexer is not None and not log_indexer.ready.is_set():
+            summary += " | indexing still running…"
+        ttk.Label(res, text=summary, foreground=text_fg).pack(anchor="w", padx=10, pady=5)
+        hits_listbox = tk.Listbox(res, bg=window_bg, fg=text_fg, font=FONT_CONFIG, selectbackground="#4A4A4A")
+        hits_listbox.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        for hit in hits:
+            hits_listbox.insert("end", hit.describe())
+
+        def open_hit(event):
+            sel = hits_listbox.curselection()
+            if sel:
+                open_log_at(Path(hits[sel[0]].path), hits[sel[0]].line)
+
+        hits_listbox.bind("<Double-1>", open_hit)
+
+    def open_log_at(path: Path, line: int):
+        if str(Path(logfile).resolve()) == str(path) and index is not None:
+            goto_line(line)
+            return
+        matches_path = [i for i, f in enumerate(log_files) if f.resolve() == path]
+        if not matches_path:  # seit dem Öffnen neu hinzugekommen
+            log_files[:] = sorted([f for f in log_dir.glob("*.log") if f.is_file()])
+            log_selector["values"] = [f.name for f in log_files]
+            matches_path = [i for i, f in enumerate(log_files) if f.resolve() == path]
+        if not matches_path:
+            messagebox.showerror("Error", f"Logfile {path} not found.")
+            return
+        select_log(matches_path[0], line)
         update_button_states()
 
     def update_button_states():
@@ -545,20 +774,24 @@ def debuginspector(master: tk.Tk, logfile: str, selected: List[Project], style:
     search_entry.bind("<Return>", search_text)
 
     def show_error_context(event):
-        index = text_widget.index("@%d,%d" % (event.x, event.y)) if event else text_widget.index("insert")
-        line = int(index.split(".")[0])
+        if event:
+            line = view_top + int(text_widget.index("@%d,%d" % (event.x, event.y)).split(".")[0])
+        else:
+            line = current_line or view_top + 1
+        if index is None:
+            return
         context_lines = 2
         start = max(1, line - context_lines)
-        end = min(len(lines) + 1, line + context_lines + 1)
-        context = "\n".join(lines[start-1:end-1])
+        end = min(len(index) + 1, line + context_lines + 1)
+        context = "\n".join(index.lines(start - 1, end - 1))
         messagebox.showinfo("Error Context", f"Line {line}:\n{context}")
 
     text_widget.bind("<Double-1>", show_error_context)
 
     def error_listbox_tooltip(event):
-        index = error_listbox.nearest(event.y)
-        if 0 <= index < error_listbox.size():
-            line = error_listbox.get(index)
+        row = error_listbox.nearest(event.y)
+        if 0 <= row < error_listbox.size():
+            line = error_listbox.get(row)
             rec = get_error_recommendation(line)
             if rec:
                 show_tooltip(event, f"{line}\n\nTipp: {rec}")
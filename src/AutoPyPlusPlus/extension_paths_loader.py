@@ -1,12 +1,79 @@
 
 import os
 import sys
+import shutil
+import threading
 import configparser
 from pathlib import Path
 
+_INI_FILE = Path(__file__).parent / "extensions_path.ini"
+
+# Prozessweiter Cache: wird nur neu geladen, wenn sich extensions_path.ini ändert (mtime/size)
+_cache_lock = threading.Lock()
+_cache: dict = {"signature": None, "paths": None, "error": None}
+_which_cache: dict = {}
+
+
+def _ini_signature(path_file: Path):
+    try:
+        st = path_file.stat()
+        return (str(path_file), st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (str(path_file), None, None)
+
+
+def clear_toolchain_cache() -> None:
+    """Verwirft alle aufgelösten Pfade (z. B. nach Änderungen in den Einstellungen)."""
+    with _cache_lock:
+        _cache.update(signature=None, paths=None, error=None)
+        _which_cache.clear()
+
+
 def load_extensions_paths(log_file=None) -> dict:
-    base_dir = Path(__file__).parent
-    path_file = base_dir / "extensions_path.ini"
+    """
+    Liefert die geprüften Tool-Pfade aus extensions_path.ini.
+    Die INI wird pro Sitzung nur einmal geparst und geprüft; erst eine neue mtime/Größe
+    der Datei löst ein erneutes Laden aus. Rückgabe ist eine Kopie.
+    """
+    signature = _ini_signature(_INI_FILE)
+    with _cache_lock:
+        if _cache["signature"] == signature:
+            if log_file is not None:
+                state = "FAILED" if _cache["error"] is not None else f"{len(_cache['paths'])} tool(s)"
+                log_file.write(f"--- load_extensions_paths() cached: {state} ---\n")
+                log_file.flush()
+            if _cache["error"] is not None:
+                raise _cache["error"]
+            return dict(_cache["paths"])
+
+        try:
+            paths = _load_extensions_paths_uncached(_INI_FILE, log_file)
+        except Exception as e:
+            _cache.update(signature=signature, paths=None, error=e)
+            raise
+        _cache.update(signature=signature, paths=paths, error=None)
+        # neue INI -> auch die PATH-Suche neu bewerten
+        _which_cache.clear()
+        return dict(paths)
+
+
+def which_tool(*names: str):
+    """shutil.which() über mehrere Namen, pro Sitzung gecacht (neu bei geändertem PATH)."""
+    key = (names, os.environ.get("PATH", ""))
+    with _cache_lock:
+        if key in _which_cache:
+            return _which_cache[key]
+    found = None
+    for name in names:
+        found = shutil.which(name)
+        if found:
+            break
+    with _cache_lock:
+        _which_cache[key] = found
+    return found
+
+
+def _load_extensions_paths_uncached(path_file: Path, log_file=None) -> dict:
 
     if log_file is not None:
         log_file.write("--- load_extensions_paths() START ---\n")
@@ -154,7 +221,7 @@ def load_extensions_paths(log_file=None) -> dict:
                 # Verzeichnis: Compiler/Tool suchen
                 if path_obj.is_dir():
                     exe_path = find_compiler_in_dir(path_obj, key)
-                    if not tiros:
+                    if not exe_path:
                         if log_file is not None:
                             log_file.write(f"Warning: Kein passender Executable in '{path_obj}' für Schlüssel '{key}' gefunden.\n")
                         continue
@@ -20,6 +20,7 @@ class GCCEditor:
         self.e_cpp_libraries: Optional[ttk.Entry] = None
         self.e_cpp_defines: Optional[ttk.Entry] = None
         self.e_cpp_linker_flags: Optional[ttk.Entry] = None
+        self.e_cpp_pch_header: Optional[ttk.Entry] = None
         self.default_values = {
             "cpp_compiler_path": "g++",
             "cpp_output_dir": "",
@@ -31,6 +32,9 @@ class GCCEditor:
             "cpp_linker_flags": "",
             "cpp_generate_deps": False,
             "cpp_verbose_compile": False,
+            "cpp_incremental": False,
+            "cpp_jobs": 0,
+            "cpp_pch_header": "",
             "cpp_compile_files": [],
             "cpp_include_dirs": [],
             "cpp_lib_dirs": [],
@@ -415,6 +419,22 @@ class GCCEditor:
         self.var_verbose_compile = tk.BooleanVar(value=verbose_compile_default)
         ttk.Checkbutton(self.adv_frame, text="Verbose Compilation (-v)", variable=self.var_verbose_compile).grid(row=6, column=1, sticky="w", pady=5)
 
+        incremental_default = cast(bool, getattr(self.project, "cpp_incremental", self.default_values["cpp_incremental"]))
+        self.var_incremental = tk.BooleanVar(value=incremental_default)
+        ttk.Checkbutton(self.adv_frame, text="Incremental Build (object files, rebuild stale only)", variable=self.var_incremental).grid(row=7, column=1, sticky="w", pady=5)
+
+        self.var_jobs = tk.StringVar(value=str(getattr(self.project, "cpp_jobs", self.default_values["cpp_jobs"])))
+        ttk.Label(self.adv_frame, text="Parallel Jobs (0 = auto):").grid(row=8, column=0, sticky="e", pady=5, padx=(0, 5))
+        ttk.Spinbox(self.adv_frame, from_=0, to=64, textvariable=self.var_jobs, width=6).grid(row=8, column=1, sticky="w", pady=5)
+
+        pch_header_default = cast(str, getattr(self.project, "cpp_pch_header", self.default_values["cpp_pch_header"]))
+        self.e_cpp_pch_header = self.add_adv_entry(
+            "Precompiled Header:", 9,
+            pch_header_default,
+            "Header with the heavy includes (Python.h, pybind11, Eigen); built once per flag set, needs Incremental Build"
+        )
+        ttk.Button(self.adv_frame, text="Browse", command=lambda: self._choose_file(self.e_cpp_pch_header)).grid(row=9, column=2, padx=5)
+
         ttk.Label(main_frame, text="Compilation Command Preview:").grid(row=1, column=0, columnspan=2, sticky="w", pady=5)
         self.command_preview = tk.Text(main_frame, height=3, wrap="word")
         self.command_preview.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
@@ -746,6 +766,11 @@ class GCCEditor:
 
         self.var_generate_deps.set(bool(self.default_values["cpp_generate_deps"]))
         self.var_verbose_compile.set(bool(self.default_values["cpp_verbose_compile"]))
+        self.var_incremental.set(bool(self.default_values["cpp_incremental"]))
+        self.var_jobs.set(str(self.default_values["cpp_jobs"]))
+        if self.e_cpp_pch_header is not None:
+            self.e_cpp_pch_header.delete(0, tk.END)
+            self.e_cpp_pch_header.insert(0, str(self.default_values["cpp_pch_header"]))
 
         self.compile_files_listbox.delete(0, tk.END)
         for f in self.default_values["cpp_compile_files"]:
@@ -874,6 +899,11 @@ class GCCEditor:
             if compiler_flags:
                 command.extend(compiler_flags.split())
 
+            # Precompiled Header (CPE baut die .pch einmal pro Flag-Satz)
+            pch_header = self._pch_header()
+            if pch_header:
+                command.extend([f"/Yu{Path(pch_header).name}", f"/FI{Path(pch_header).name}"])
+
             # === NEU: MSVC-Komfort-Flags für Executable automatisch ergänzen ===
             if self.var_target_type.get() == "Executable":
                 # /MD und /EHsc immer ergänzen, wenn noch nicht gesetzt:
@@ -934,6 +964,11 @@ class GCCEditor:
 
         if self.var_generate_deps.get():
             command.append("-MMD")
+
+        # Precompiled Header (CPE baut die .gch einmal pro Flag-Satz)
+        pch_header = self._pch_header()
+        if pch_header:
+            command.extend(["-include", pch_header, "-Winvalid-pch"])
         if self.var_verbose_compile.get():
             command.append("-v")
 
@@ -1089,6 +1124,10 @@ class GCCEditor:
         p.cpp_linker_flags = self.e_cpp_linker_flags.get().strip()
         p.cpp_generate_deps = self.var_generate_deps.get()
         p.cpp_verbose_compile = self.var_verbose_compile.get()
+        p.cpp_incremental = self.var_incremental.get()
+        jobs = (self.var_jobs.get() or "").strip()
+        p.cpp_jobs = int(jobs) if jobs.isdigit() else 0  # 0 = alle Kerne
+        p.cpp_pch_header = self.e_cpp_pch_header.get().strip() if self.e_cpp_pch_header is not None else ""
         p.cpp_compile_files = compile_files
         p.cpp_include_dirs = include_dirs
         p.cpp_lib_dirs = lib_dirs
@@ -1100,6 +1139,11 @@ class GCCEditor:
         self.saved = True
         self.win.destroy()
 
+    def _pch_header(self) -> str:
+        if self.e_cpp_pch_header is None:
+            return ""
+        return self.e_cpp_pch_header.get().strip()
+
     def on_cancel(self):
         self.saved = False
         self.win.destroy()
@@ -8,7 +8,7 @@ from .config import save_config
 def show_general_settings(master, config: dict, style, theme_func):
     win = tk.Toplevel(master)
     win.title("AutoPy++ – Advanced Settings")
-    win.geometry("600x700")
+    win.geometry("600x850")
     win.transient(master)
     win.grab_set()
 
@@ -27,6 +27,7 @@ def show_general_settings(master, config: dict, style, theme_func):
         )
     )
     enable_hashcheck_var = tk.BooleanVar(value=bool(config.get("enable_hashcheck", True)))
+    fail_fast_var = tk.BooleanVar(value=bool(config.get("fail_fast", False)))
     sequential_build_var = tk.BooleanVar(value=bool(config.get("sequential_build", False)))
 
     # pipeline cooldown (seconds)
@@ -47,22 +48,37 @@ def show_general_settings(master, config: dict, style, theme_func):
         return max(1, min(_cpu_max, v))
     thread_count_var = tk.IntVar(value=_get_threads_initial())
 
+    # build cache (content-addressed artifacts, LRU)
+    build_cache_var = tk.BooleanVar(value=bool(config.get("build_cache_enabled", True)))
+    def _get_cache_mb_initial():
+        try:
+            return max(64, int(config.get("build_cache_max_mb", 2048)))
+        except Exception:
+            return 2048
+    build_cache_mb_var = tk.IntVar(value=_get_cache_mb_initial())
+
     # originals for "Save" enable logic
     original_simplex  = enable_simplex_var.get()
     original_wd       = working_dir_var.get()
     original_hash     = enable_hashcheck_var.get()
+    original_failfast = fail_fast_var.get()
     original_seq      = sequential_build_var.get()
     original_cooldown = pipeline_cooldown_var.get()
     original_threads  = thread_count_var.get()
+    original_cache    = build_cache_var.get()
+    original_cache_mb = build_cache_mb_var.get()
 
     def enable_save_btn_if_changed(*_):
         changed = (
             enable_simplex_var.get()        != original_simplex
             or working_dir_var.get()        != original_wd
             or enable_hashcheck_var.get()   != original_hash
+            or fail_fast_var.get()          != original_failfast
             or sequential_build_var.get()   != original_seq
             or pipeline_cooldown_var.get()  != original_cooldown
             or thread_count_var.get()       != original_threads
+            or build_cache_var.get()        != original_cache
+            or build_cache_mb_var.get()     != original_cache_mb
         )
         if changed:
             save_btn.state(["!disabled"])
@@ -99,7 +115,8 @@ def show_general_settings(master, config: dict, style, theme_func):
         frame_threads,
         text=("Sets the number of worker threads used during ‘Compile All’ when Top/Down Pipeline Mode is disabled. "
               "Higher values can speed up builds on multi-core CPUs. "
-              "This is capped by your CPU core count. While Top/Down mode is active, this setting is ignored."),
+              "This is capped by your CPU core count. While Top/Down mode is active, this setting is ignored. "
+              "Projects with 'Depends on' entries wait only for those projects; everything else runs in parallel."),
         wraplength=540, foreground="#666", justify="left",
     ).grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 6))
 
@@ -182,6 +199,13 @@ def show_general_settings(master, config: dict, style, theme_func):
     )
     chk_hash.grid(row=1, column=0, sticky="w")
 
+    ttk.Checkbutton(
+        frame_hash,
+        text="Fail fast: cancel running and queued builds on the first error",
+        variable=fail_fast_var, onvalue=True, offvalue=False,
+        command=enable_save_btn_if_changed,
+    ).grid(row=2, column=0, sticky="w", pady=(4, 0))
+
     # ===================== Top/Down Pipeline Mode =====================
     frame_seq = ttk.LabelFrame(win, text="Top/Down Pipeline Mode", padding=10)
     frame_seq.pack(fill="x", padx=16, pady=(0, 8))
@@ -214,6 +238,30 @@ def show_general_settings(master, config: dict, style, theme_func):
         row=2, column=2, sticky="w", padx=(8, 0)
     )
 
+    # ===================== Build Cache =====================
+    frame_cache = ttk.LabelFrame(win, text="Build Cache", padding=10)
+    frame_cache.pack(fill="x", padx=16, pady=(0, 8))
+
+    ttk.Label(
+        frame_cache,
+        text=("Unchanged projects (same sources, options and toolchain) are restored from a local "
+              "content-addressed cache instead of being rebuilt. Least recently used entries are evicted."),
+        wraplength=540, foreground="#666", justify="left",
+    ).grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 6))
+
+    ttk.Checkbutton(
+        frame_cache,
+        text="Reuse cached build artifacts",
+        variable=build_cache_var, onvalue=True, offvalue=False,
+        command=enable_save_btn_if_changed,
+    ).grid(row=1, column=0, columnspan=3, sticky="w", pady=(0, 6))
+
+    ttk.Label(frame_cache, text="Maximum cache size (MB):").grid(row=2, column=0, sticky="w", padx=(0, 6))
+    _Spinbox2(
+        frame_cache, from_=64, to=1048576, increment=256,
+        textvariable=build_cache_mb_var, width=9, justify="center", state="normal", wrap=False,
+    ).grid(row=2, column=1, sticky="w")
+
     # ===================== Save / Close =====================
     btns = ttk.Frame(win)
     btns.pack(fill="x", padx=16, pady=(6, 12))
@@ -257,6 +305,7 @@ def show_general_settings(master, config: dict, style, theme_func):
         config["enable_simplex_api"] = bool(enable_simplex_var.get())  # NEW
         config["working_dir"] = str(wd)
         config["enable_hashcheck"] = bool(enable_hashcheck_var.get())
+        config["fail_fast"] = bool(fail_fast_var.get())
         config["sequential_build"] = bool(sequential_build_var.get())
 
         # cooldown (seconds)
@@ -273,6 +322,13 @@ def show_general_settings(master, config: dict, style, theme_func):
             threads_val = _cpu_max
         config["thread_count"] = threads_val
 
+        # build cache
+        config["build_cache_enabled"] = bool(build_cache_var.get())
+        try:
+            config["build_cache_max_mb"] = max(64, int(build_cache_mb_var.get()))
+        except Exception:
+            config["build_cache_max_mb"] = 2048
+
         save_config(config)
 
         # live-apply to main window if available
@@ -287,6 +343,9 @@ def show_general_settings(master, config: dict, style, theme_func):
         try:
             master.config["pipeline_cooldown_s"] = cooldown_val
             master.config["thread_count"] = threads_val
+            master.config["build_cache_enabled"] = config["build_cache_enabled"]
+            master.config["fail_fast"] = config["fail_fast"]
+            master.config["build_cache_max_mb"] = config["build_cache_max_mb"]
         except Exception:
             pass
         if hasattr(master, "pipeline_cooldown_s"):
@@ -315,9 +374,12 @@ def show_general_settings(master, config: dict, style, theme_func):
             f"Simplex API: {'enabled' if enable_simplex_var.get() else 'disabled'}\n"
             f"Working Directory: {wd}\n"
             f"Hash Check: {'enabled' if enable_hashcheck_var.get() else 'disabled'}\n"
+            f"Fail Fast: {'enabled' if fail_fast_var.get() else 'disabled'}\n"
             f"Top/Down Pipeline Mode: {'enabled' if sequential_build_var.get() else 'disabled'}\n"
             f"Cooldown (seconds): {cooldown_val}\n"
-            f"Threads: {threads_val}\n\n"
+            f"Threads: {threads_val}\n"
+            f"Build Cache: {'enabled' if build_cache_var.get() else 'disabled'} "
+            f"({config['build_cache_max_mb']} MB)\n\n"
             "(A restart might be necessary if other modules cache settings during import.)",
         )
         win.destroy()
@@ -328,7 +390,10 @@ def show_general_settings(master, config: dict, style, theme_func):
     enable_simplex_var.trace_add("write", enable_save_btn_if_changed)
     working_dir_var.trace_add("write", enable_save_btn_if_changed)
     enable_hashcheck_var.trace_add("write", enable_save_btn_if_changed)
+    fail_fast_var.trace_add("write", enable_save_btn_if_changed)
     sequential_build_var.trace_add("write", enable_save_btn_if_changed)
     pipeline_cooldown_var.trace_add("write", enable_save_btn_if_changed)
     thread_count_var.trace_add("write", enable_save_btn_if_changed)
+    build_cache_var.trace_add("write", enable_save_btn_if_changed)
+    build_cache_mb_var.trace_add("write", enable_save_btn_if_changed)
     enable_save_btn_if_changed()
@@ -14,31 +14,37 @@ import configparser
 import subprocess # For update function
 import sys, shutil # for python venv terminal
 
-from .help import show_main_helper  # Open the main in-app help window
+# Editors, dialogs and build backends are imported on first use (lazy.py)
+from .lazy import lazy
+
+show_main_helper = lazy(".help", "show_main_helper")  # Open the main in-app help window
 
 from .language import LANGUAGES  # Localized UI strings
 
 from .hotkeys import register_hotkeys  # Register global app hotkeys
 
-from .about import show_about_dialog  # “About” dialog with app info
+show_about_dialog = lazy(".about", "show_about_dialog")  # “About” dialog with app info (PIL)
 
-from .feedback import show_feedback_dialog, feedback_is_done # Feedback
+show_feedback_dialog = lazy(".feedback", "show_feedback_dialog")  # Feedback (PIL)
+feedback_is_done = lazy(".feedback", "feedback_is_done")
 
-from .general_settings import show_general_settings  # General settings dialog
+show_general_settings = lazy(".general_settings", "show_general_settings")  # General settings dialog
 
-from .simplex_api import SimplexAPIWatcher  # Watches simplexAPI.ini and reacts to changes
+SimplexAPIWatcher = lazy(".simplex_api", "SimplexAPIWatcher")  # Watches simplexAPI.ini and reacts to changes
 
-from .projecteditor import ProjectEditor  # Editor UI for regular projects
+ProjectEditor = lazy(".projecteditor", "ProjectEditor")  # Editor UI for regular projects (imports all sub-editors)
 
-from .mpyeditor import MpyEditor
+MpyEditor = lazy(".mpyeditor", "MpyEditor")
 
-from .debuginspector import debuginspector  # Viewer for compile logs & diagnostics
+debuginspector = lazy(".debuginspector", "debuginspector")  # Viewer for compile logs & diagnostics
 
-from .compiler import compile_projects  # Orchestrates the compilation pipeline
+compile_projects = lazy(".compiler", "compile_projects")  # Orchestrates the compilation pipeline (all CP* backends)
+CancelToken = lazy(".process_runner", "CancelToken")  # Cancels running builds (kills tool process trees)
+RetryPolicy = lazy(".retry", "RetryPolicy")  # Retries transient tool failures (file locks, AV scanners)
 
 from .project import Project  # Data model for a build/project entry
 
-from . import hashcheck  # Check developer/compiler hashes
+hashcheck = lazy(".hashcheck")  # Check developer/compiler hashes
 
 from .config import ( # Read/write application configuration
     load_config, save_config,
@@ -47,11 +53,11 @@ from .config import ( # Read/write application configuration
 
 from .tooltip import CreateToolTip  # Tooltip helper for Tk widgets
 
-from .parse_spec_file import parse_spec_file  # Parse .spec files into Project objects
+parse_spec_file = lazy(".parse_spec_file", "parse_spec_file")  # Parse .spec files into Project objects
 
-from .speceditor import SpecEditor  # Editor UI for .spec-based projects
+SpecEditor = lazy(".speceditor", "SpecEditor")  # Editor UI for .spec-based projects
 
-from .apyeditor import ApyEditor  # Editor for .apyscript bundle files
+ApyEditor = lazy(".apyeditor", "ApyEditor")  # Editor for .apyscript bundle files
 
 from .core import (   # Persistence & housekeeping utilities
     save_projects, load_projects,
@@ -1554,6 +1560,18 @@ class AutoPyPlusPlusGUI:
         pb = ttk.Progressbar(self.main_frame, variable=prog, maximum=100, style=self.pb_style_name)
         pb.pack(fill="x", pady=5)
 
+        # Abbruch: beendet laufende Tools (inkl. Kindprozesse) und verwirft die Warteschlange
+        cancel_token = CancelToken()
+        self._cancel_token = cancel_token
+
+        def request_cancel():
+            cancel_token.cancel("cancelled by user")
+            cancel_btn.state(["disabled"])
+            self.set_status("Cancelling build …", hold_ms=3000)
+
+        cancel_btn = ttk.Button(self.main_frame, text="✖ Cancel build", command=request_cancel)
+        cancel_btn.pack(anchor="e", pady=(0, 5))
+
         def do_compile():
             
             log_path = None  # wir arbeiten nur mit dem Pfad und öffnen bei Bedarf
@@ -1597,6 +1615,13 @@ class AutoPyPlusPlusGUI:
 
                 threads = 1 if sequential else self._get_thread_count()
                 cooldown_s = self._get_pipeline_cooldown_s() if sequential else 0
+                use_cache = bool(self.config.get("build_cache_enabled", True))
+                cache_max_mb = int(self.config.get("build_cache_max_mb", 2048) or 2048)
+                backend_slots = self.config.get("backend_slots") or None
+                memory_budget_mb = self.config.get("memory_budget_mb") or None
+                fail_fast = bool(self.config.get("fail_fast", False))
+                backend_timeouts = self.config.get("backend_timeouts") or None
+                retry_policy = RetryPolicy.from_config(self.config)
 
 
                 print(f"[DEBUG] Pipeline (Top/Down): {sequential} -> threads={threads}, cooldown={cooldown_s}s")
@@ -1642,12 +1667,25 @@ class AutoPyPlusPlusGUI:
                                 progress_callback=lambda cur, tot: overall_progress(cur, tot),
                                 compiler=per_compiler,
                                 mode=active_mode,
+                                use_cache=use_cache,
+                                cache_max_mb=cache_max_mb,
+                                backend_slots=backend_slots,
+                                memory_budget_mb=memory_budget_mb,
+                                cancel_token=cancel_token,
+                                fail_fast=fail_fast,
+                                backend_timeouts=backend_timeouts,
+                                retry_policy=retry_policy,
                             )
                         if err:
                             errors.extend(err)
 
                         done += 1
 
+                        # Abbruch bzw. Fail-Fast: restliche Pipeline verwerfen
+                        if cancel_token.cancelled or (fail_fast and err):
+                            log(f"Pipeline stopped after {proj.name}: {cancel_token.reason or 'fail-fast'}")
+                            break
+
                         # Cooldown
                         if i < total - 1 and cooldown_s > 0:
                             for remaining in range(cooldown_s, 0, -1):
@@ -1679,6 +1717,14 @@ class AutoPyPlusPlusGUI:
                             progress_callback=lambda cur, total: self.master.after(0, lambda: prog.set((cur / max(1, total)) * 100)),
                             compiler=compiler_mode,
                             mode=active_mode,
+                            use_cache=use_cache,
+                            cache_max_mb=cache_max_mb,
+                            backend_slots=backend_slots,
+                            memory_budget_mb=memory_budget_mb,
+                            cancel_token=cancel_token,
+                            fail_fast=fail_fast,
+                            backend_timeouts=backend_timeouts,
+                            retry_policy=retry_policy,
                         )
 
                 if errors:
@@ -1706,7 +1752,9 @@ class AutoPyPlusPlusGUI:
                 self.master.after(0, _on_fail)
             finally:
                 stop_event.set()
+                self._cancel_token = None
                 self.master.after(0, pb.destroy)
+                self.master.after(0, cancel_btn.destroy)
 
         threading.Thread(target=do_compile, daemon=True).start()
 
@@ -0,0 +1,80 @@
+# lazy.py
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import Any, Optional
+
+_UNSET = object()
+
+
+class Lazy:
+    """
+    Platzhalter für ein Modul oder ein Attribut eines Moduls, das erst beim ersten
+    Aufruf bzw. Attributzugriff importiert wird (z. B. Editoren und Backends in gui.py).
+
+        ProjectEditor = lazy(".projecteditor", "ProjectEditor")
+        ProjectEditor(master, ...)            # importiert projecteditor hier
+        hashcheck = lazy(".hashcheck")
+        hashcheck.verify_against_reference()  # importiert hashcheck hier
+
+    Relative Namen beziehen sich auf das Paket AutoPyPlusPlus. Thread-sicher.
+    """
+
+    __slots__ = ("_module", "_attr", "_target", "_lock")
+
+    def __init__(self, module: str, attr: Optional[str] = None) -> None:
+        self._module = module
+        self._attr = attr
+        self._target: Any = _UNSET
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        target = self._target
+        if target is _UNSET:
+            with self._lock:
+                if self._target is _UNSET:
+                    module = importlib.import_module(self._module, __package__)
+                    self._target = getattr(module, self._attr) if self._attr else module
+                target = self._target
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not _UNSET
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    # Schreiben/Löschen geht an das echte Objekt (z. B. monkeypatch.setattr(compiler.CPA0000000, ...))
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in Lazy.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.resolve(), name)
+
+    # isinstance(proxy, type) bzw. isinstance(obj, proxy) wie beim echten Objekt
+    @property
+    def __class__(self):
+        return type(self.resolve())
+
+    def __instancecheck__(self, obj: Any) -> bool:
+        return isinstance(obj, self.resolve())
+
+    def __subclasscheck__(self, cls: type) -> bool:
+        return issubclass(cls, self.resolve())
+
+    def __repr__(self) -> str:
+        name = f"{self._module}:{self._attr}" if self._attr else self._module
+        return f"<Lazy {name}{'' if self.loaded else ' (not imported)'}>"
+
+
+def lazy(module: str, attr: Optional[str] = None) -> Any:
+    """Lazy(module, attr); als Any typisiert, damit Aufrufstellen unverändert bleiben."""
+    return Lazy(module, attr)
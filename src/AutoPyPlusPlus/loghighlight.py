@@ -0,0 +1,330 @@
+# loghighlight.py
+"""
+Single-Pass-Highlighter für den Debug-Inspector.
+
+Alle KEYWORD_PATTERNS (plus Pytest-Trace-/Testzeilen und Werte) stecken in einer einzigen,
+einmal kompilierten Alternation mit benannten Gruppen. scan() läuft ohne Tk (Worker-Thread)
+über den Text und liefert pro Tag fertige Index-Paare ("zeile.spalte") für text.tag_add(),
+die Trefferstatistik und die Fehlerzeilen.
+
+    python -m AutoPyPlusPlus.loghighlight --lines 1000000   # Benchmark gegen den alten Ablauf
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+KEYWORD_PATTERNS = {
+    # Allgemein
+    "warning": (r"(?i)\bwarning\b", "#FFAA00"),
+    "info": (r"(?i)\binfo\b", "#55AAFF"),
+    "debug": (r"(?i)\bdebug\b", "#00FFAA"),
+    "permission_denied": (r"(?i)permission denied", "#FF5555"),
+    "success": (r"(?i)success", "#55FF55"),
+    "successfully": (r"(?i)successfully", "#55FF55"),
+    "not_found": (r"(?i)not found", "#FF5555"),
+    "true": (r"(?i)\btrue\b", "#00FF00"),
+    "false": (r"(?i)\bfalse\b", "#FF0000"),
+    "failed": (r"(?i)failed", "#FF5555"),
+    "end_0_errors": (r"(?i)end: 0 errors", "#55FF55"),
+    "starting_compilation": (r"(?i)starting compilation", "#FFAA00"),
+    # Pytest-spezifisch
+    "pytest_fail": (r"(?i)\bFAILED\b|\bFAILURES\b", "#FF2222"),
+    "pytest_pass": (r"(?i)\bPASSED\b|\bcollected \d+ items\b", "#55FF99"),
+    "pytest_xfail": (r"(?i)\bXFAIL\b|\bXPASS\b", "#999999"),
+    "pytest_error": (r"(?i)\bERROR\b", "#FF2222"),
+    "pytest_trace": (r"(?i)>\s+assert\b|\s+E\s+", "#AA00FF"),
+    "pytest_monkey": (r"\bmonkeypatch\b", "#00DDFF"),
+    "pytest_capsys": (r"\bcapsys\b", "#00DDFF"),
+    "pytest_fixture": (r"\bfixture\b", "#FF00AA"),
+    "pytest_collect": (r"collected \d+ items", "#BBBBFF"),
+    "pytest_summary": (r"short test summary info", "#FFFF44"),
+    "pytest_line": (r"={4,}", "#666666"),
+    "pytest_testcase": (r"\bdef test_\w+", "#FFFF00"),
+    # Optional: catch MSVC lines explicitly (helps show C1083 lines even if no 'failed' token)
+    "msvc_fatal": (r"(?i)\bfatal error C\d{4}\b", "#FF2222"),
+    "msvc_error": (r"(?i)\berror C\d{4}\b", "#FF4444"),
+}
+
+CRITICAL_TAGS = ("failed", "permission_denied", "not_found", "pytest_fail", "pytest_error", "msvc_fatal", "msvc_error")
+VALUE_PATTERN = r"\b0x[0-9a-fA-F]+\b|\b\d{4}-\d{2}-\d{2}\b|\bexit code \d+\b"
+_VALUE = "value"
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+@dataclass
+class ScanResult:
+    """ranges[tag] = [start, end, start, end, ...] (Tk-Indizes), direkt für tag_add(tag, *ranges)."""
+    ranges: Dict[str, List[str]] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=dict)
+    error_lines: List[int] = field(default_factory=list)
+
+    def batches(self, max_pairs: int = 2000) -> Iterator[Tuple[str, List[str]]]:
+        """(tag, ranges) in Häppchen, damit der UI-Thread zwischendurch reagieren kann."""
+        step = 2 * max_pairs
+        for tag, flat in self.ranges.items():
+            for i in range(0, len(flat), step):
+                yield tag, flat[i:i + step]
+
+
+def _single_line(pattern: str) -> str:
+    """\\s darf über den ganzen Text nicht über Zeilenenden hinweg matchen (früher: Zeile für Zeile)."""
+    return pattern.replace(r"\s", r"[^\S\n]")
+
+
+def _fold(pattern: str) -> str:
+    """Literale klein schreiben, Escapes (\\S, \\D, \\B, ...) unverändert lassen."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return "".join(out)
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Top-Level-"|" eines Musters (nicht innerhalb von (...) oder [...])."""
+    parts, depth, in_class, start, i = [], 0, False, 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def _literal_first(alt: str) -> List[str]:
+    """
+    Zweige so umschreiben, dass sie mit einem Literal beginnen: nur dann überspringt re
+    unpassende Zweige ohne Versuch und kann die Suche über einen Start-Zeichensatz abkürzen.
+    \\bword -> w(?<!\\ww)ord, \\b\\d{4} -> 0..9 + \\d{3}, [^\\S\\n]+ -> " "/"\\t", ={4,} -> =={3,}.
+    """
+    m = re.match(r"\\b(\w)(?![*+?{])", alt)
+    if m:
+        c = m.group(1)
+        return [f"{c}(?<!\\w{c}){alt[3:]}"]
+    m = re.match(r"\\b\\d(?:\{(\d+)\}|(\+))?", alt)
+    if m:
+        # erste Ziffer als Literal, Rest des Quantors bleibt: \d{4} -> 2\d{3}, \d+ -> 2\d*
+        rest = r"\d{%d}" % (int(m.group(1)) - 1) if m.group(1) else (r"\d*" if m.group(2) else "")
+        return [f"{d}(?<!\\w{d}){rest}{alt[m.end():]}" for d in "0123456789"]
+    if alt.startswith(r"[^\S\n]+"):
+        rest = alt[len(r"[^\S\n]+"):]
+        return [f" [^\\S\\n]*{rest}", f"\\t[^\\S\\n]*{rest}"]
+    m = re.match(r"([^\\()\[\].^$|*+?{])\{(\d+),\}", alt)
+    if m and int(m.group(2)) > 0:
+        c, n = m.group(1), int(m.group(2))
+        return [f"{c}{c}{{{n - 1},}}{alt[m.end():]}"]
+    return [alt]
+
+
+def _first_literal(branch: str) -> Optional[str]:
+    """Erstes Zeichen eines Zweigs, falls es ein Literal ist (sonst None = unbekannt)."""
+    if branch.startswith("\\t"):
+        return "\t"
+    if branch and branch[0] not in "\\()[].^$|*+?{":
+        return branch[0]
+    return None
+
+
+class Highlighter:
+    """
+    Eine kombinierte Regex statt len(patterns) x Zeilen re.finditer-Läufen.
+
+    Gesucht wird im klein geschriebenen Text (Case-insensitive-Matching ist in re ein
+    Vielfaches langsamer); alle Zweige beginnen mit einem Literal und tragen eine leere
+    Markergruppe am Ende (m.lastgroup = Tag). Muster ohne (?i) werden am Originaltext
+    nachgeprüft. Pro Position gewinnt der erste passende Zweig, längere Muster stehen vorn;
+    weitere Tags, die mit demselben Zeichen beginnen können ("FAILED" -> failed und
+    pytest_fail, "successfully" -> success), werden an dieser Stelle nachgeprüft.
+    Treffer, die erst innerhalb eines längeren Treffers beginnen, entfallen.
+    """
+
+    def __init__(self, patterns: Optional[dict] = None) -> None:
+        self.patterns = dict(patterns or KEYWORD_PATTERNS)
+        # pro Tag: Muster für den klein geschriebenen Text; exakt = Originalmuster (nur ohne (?i))
+        self.folded: Dict[str, "re.Pattern[str]"] = {}
+        self.exact: Dict[str, "re.Pattern[str]"] = {}
+        branches: List[str] = []
+        self._group_tag: Dict[str, str] = {}
+        order = sorted(self.patterns, key=lambda t: len(self.patterns[t][0]), reverse=True)
+        for tag in order + [_VALUE]:
+            pattern = VALUE_PATTERN if tag == _VALUE else self.patterns[tag][0]
+            insensitive = tag == _VALUE or pattern.startswith("(?i)")
+            body = _single_line(pattern[4:] if pattern.startswith("(?i)") else pattern)
+            folded = _fold(body)
+            self.folded[tag] = re.compile(folded)
+            if not insensitive:
+                self.exact[tag] = re.compile(body)
+            for alt in _split_alternatives(folded):
+                for branch in _literal_first(alt):
+                    group = f"{tag}__{len(branches)}"  # Gruppennamen müssen eindeutig sein
+                    self._group_tag[group] = tag
+                    branches.append(f"(?:{branch})(?P<{group}>)")
+        self.regex = re.compile("|".join(branches), re.MULTILINE)
+
+        # Welche anderen Tags können an derselben Stelle beginnen? (über das erste Zeichen der Zweige)
+        starts: Dict[str, set] = {}
+        for group, branch in zip(self._group_tag, branches):
+            first = _first_literal(branch[3:])
+            starts.setdefault(self._group_tag[group], set()).add(first)
+        self._costart: Dict[str, Tuple[str, ...]] = {}
+        for group, branch in zip(self._group_tag, branches):
+            tag, first = self._group_tag[group], _first_literal(branch[3:])
+            self._costart[group] = tuple(
+                t for t, chars in starts.items()
+                if t not in (tag, _VALUE) and (first in chars or None in chars or first is None)
+            )
+
+    def _matcher(self, tag: str):
+        """(tag, regex, auf Originaltext?) – Case-sensitive-Tags werden am Originaltext geprüft."""
+        rx = self.exact.get(tag)
+        return (tag, rx, True) if rx else (tag, self.folded[tag], False)
+
+    def scan(self, text: str, first_line: int = 1) -> ScanResult:
+        """Text ab Zeile first_line klassifizieren (ein Durchlauf, ohne Tk)."""
+        ranges: Dict[str, List[str]] = defaultdict(list)
+        stats = dict.fromkeys(self.patterns, 0)
+        error_lines: List[int] = []
+        error_tags = {t for t in self.patterns if t in CRITICAL_TAGS or t.startswith("error")}
+        # pro Markergruppe: Gewinner (None = Treffer gilt ohne Nachprüfung) und Mitbewerber
+        plan = {
+            group: (tag, self._matcher(tag) if tag in self.exact else None,
+                    tuple(self._matcher(t) for t in self._costart[group]))
+            for group, tag in self._group_tag.items()
+        }
+
+        low = text.lower()
+        if len(low) != len(text):  # z. B. "İ" -> 2 Zeichen: Spalten müssen stimmen
+            low = text.translate(_ASCII_LOWER)
+
+        line = first_line
+        line_start = 0
+        pos = 0
+        for m in self.regex.finditer(low):
+            start = m.start()
+            newlines = low.count("\n", pos, start)
+            if newlines:
+                line += newlines
+                line_start = low.rfind("\n", pos, start) + 1
+            pos = start
+            winner, check, rivals = plan[m.lastgroup]
+            begin = f"{line}.{start - line_start}"
+
+            if winner == _VALUE:
+                ranges[_VALUE] += (begin, f"{line}.{m.end() - line_start}")
+                continue
+
+            hits = []
+            for tag, rx, on_text in ((check,) if check else ()) + rivals:
+                other = rx.match(text if on_text else low, start)
+                if other:
+                    hits.append((tag, other.end()))
+            if not check:
+                hits.append((winner, m.end()))
+
+            for tag, end in hits:
+                ranges[tag] += (begin, f"{line}.{end - line_start}")
+                stats[tag] += 1
+                if tag in error_tags and (not error_lines or error_lines[-1] != line):
+                    error_lines.append(line)
+                # Ganze Zeile: Pytest-Trace am Zeilenanfang ("  E  ...") und Testfunktionen
+                if tag == "pytest_testcase" or (tag == "pytest_trace" and start == line_start and low[start] in " \t"):
+                    ranges[tag] += (f"{line}.0", f"{line}.end")
+
+        return ScanResult(ranges=dict(ranges), stats=stats, error_lines=error_lines)
+
+
+# ---- Benchmark ----
+
+_SAMPLE_LINES = [
+    "--- INFO: Resource budget: cpu=8, mem=16384 MB\n",
+    "Nuitka-Scons: Backend C compiler: gcc (gcc 12.2).\n",
+    "[{n}/1200] Compiling module_{n}.c ... ok\n",
+    "WARNING: Hidden import 'pkg_{n}' not found\n",
+    "2024-05-01 12:00:{s:02d} DEBUG some debug output 0x{n:08x}\n",
+    "tests/test_mod.py::test_case_{n} PASSED\n",
+    "    def test_case_{n}(monkeypatch, capsys):\n",
+    "E       assert {n} == 42\n",
+    "build\\temp\\mod_{n}.c(12): fatal error C1083: Cannot open include file: 'io.h'\n",
+    "ERROR: command failed with exit code {s}\n",
+    "Project 3/7 completed (12.4s): Successfully compiled app_{n}\n",
+    "plain output line without any keyword number {n}\n",
+    "plain output line without any keyword number {n}\n",
+    "plain output line without any keyword number {n}\n",
+]
+
+
+def synthetic_log(lines: int, seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    return "".join(rnd.choice(_SAMPLE_LINES).format(n=i, s=i % 60) for i in range(lines))
+
+
+def legacy_scan(lines: List[str], patterns: Optional[dict] = None) -> int:
+    """Der alte Ablauf aus apply_highlighting (ohne Tk): Muster x Zeilen plus drei Extra-Durchläufe."""
+    patterns = patterns or KEYWORD_PATTERNS
+    found = 0
+    for _tag, (pattern, _color) in patterns.items():
+        for i, log_line in enumerate(lines, 1):
+            for match in re.finditer(pattern, log_line):
+                found += 1
+    for i, log_line in enumerate(lines, 1):
+        if re.match(r"\s+E\s+", log_line):
+            found += 1
+        if re.search(r"\bdef test_\w+", log_line):
+            found += 1
+    for i, log_line in enumerate(lines, 1):
+        for match in re.finditer(VALUE_PATTERN, log_line):
+            found += 1
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m AutoPyPlusPlus.loghighlight", description="highlighter benchmark")
+    ap.add_argument("--lines", type=int, default=1_000_000)
+    ap.add_argument("--skip-legacy", action="store_true", help="only time the single-pass highlighter")
+    args = ap.parse_args(argv)
+
+    text = synthetic_log(args.lines)
+    print(f"synthetic log: {args.lines} lines, {len(text) / (1024 * 1024):.1f} MB")
+
+    highlighter = Highlighter()
+    t0 = time.perf_counter()
+    result = highlighter.scan(text)
+    new_s = time.perf_counter() - t0
+    n_ranges = sum(len(v) // 2 for v in result.ranges.values())
+    print(f"single pass : {new_s:8.2f} s  {n_ranges} ranges, {len(result.error_lines)} error lines")
+
+    if not args.skip_legacy:
+        lines = text.splitlines(keepends=True)
+        t0 = time.perf_counter()
+        found = legacy_scan(lines)
+        old_s = time.perf_counter() - t0
+        print(f"legacy      : {old_s:8.2f} s  {found} matches  (x{old_s / max(new_s, 1e-9):.1f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+# logindex.py
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate, repeat
+from operator import add
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern
+
+from .loghighlight import Highlighter
+
+SIDECAR_SUFFIX = ".idx"
+SIDECAR_VERSION = 1
+_CRC_BYTES = 64  # Prüfsumme über die letzten indizierten Bytes: passt der Index noch zum Log?
+
+
+class LineIndex:
+    """
+    Zeilen-Index über ein per mmap eingeblendetes Logfile (auch mehrere GB).
+
+    Gespeichert wird nur der Byte-Offset jeder STEP-ten Zeile (8 Byte / STEP Zeilen);
+    text(first, last) materialisiert nur den angefragten Zeilenbereich. refresh() indiziert
+    nachgeschriebene Bytes inkrementell (Tail) und erkennt gekürzte/ersetzte Dateien.
+    Zeilennummern sind 0-basiert; eine offene letzte Zeile ohne "\\n" zählt mit.
+    """
+
+    STEP = 32
+    CHUNK_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._ident = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self._marks = array("Q")   # Byte-Offset der Zeilen 0, STEP, 2*STEP, ...
+        self._lines = 0            # Zeilen mit abschließendem "\n"
+        self._tail = 0             # Beginn der offenen letzten Zeile
+        self.size = 0              # eingeblendete Bytes
+
+    def __len__(self) -> int:
+        return self._lines + (1 if self.size > self._tail else 0)
+
+    @property
+    def complete_lines(self) -> int:
+        """Zeilen mit abschließendem "\\n" (die offene letzte Zeile kann noch wachsen)."""
+        return self._lines
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def changed(self) -> bool:
+        """Günstiger Vorab-Check (nur stat)."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return st.st_size != self.size or (self._ident is not None and (st.st_dev, st.st_ino) != self._ident)
+
+    def refresh(self) -> bool:
+        """Index bis zum aktuellen Dateiende erweitern. True = Datei gekürzt/ersetzt, Index neu aufgebaut."""
+        with self._lock:
+            st = os.stat(self.path)
+            ident = (st.st_dev, st.st_ino)
+            reset = self._ident is not None and (ident != self._ident or st.st_size < self.size)
+            if reset:
+                self.close()
+                self._clear()
+            self._ident = ident
+            if st.st_size == self.size and (self._mm is not None or not self.size):
+                return reset
+            self._remap()
+            self._index_from(self._tail)
+            return reset
+
+    def _remap(self) -> None:
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = size
+
+    def _index_from(self, pos: int) -> None:
+        mm, step = self._mm, self.STEP
+        while pos < self.size:
+            end = min(self.size, pos + self.CHUNK_BYTES)
+            cut = mm.rfind(b"\n", pos, end)
+            if cut < 0:
+                cut = mm.find(b"\n", end, self.size)  # sehr lange Zeile
+                if cut < 0:
+                    break
+            parts = mm[pos:cut + 1].split(b"\n")
+            parts.pop()  # leer hinter dem letzten "\n"
+            # Zeilenanfänge: pos, pos+len0+1, ... (in C über accumulate/map)
+            starts = list(accumulate(map(add, map(len, parts), repeat(1)), initial=pos))
+            first = (-self._lines) % step
+            self._marks.extend(starts[first:len(parts):step])
+            self._lines += len(parts)
+            pos = starts[-1]
+        self._tail = pos
+
+    def load_sidecar(self, path=None) -> Optional["LogSidecar"]:
+        """
+        Zeilen-Marken aus <log>.idx übernehmen, falls der Index zum Log passt (Länge und
+        Prüfsumme der zuletzt indizierten Bytes). refresh() indiziert danach nur den Rest.
+        """
+        data = read_sidecar(path or sidecar_path(self.path))
+        if data is None or len(data.marks) != -(-data.lines // self.STEP):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, data.upto - _CRC_BYTES))
+                tail = f.read(min(_CRC_BYTES, data.upto))
+        except OSError:
+            return None
+        if len(tail) != min(_CRC_BYTES, data.upto) or zlib.crc32(tail) != data.crc:
+            return None
+        with self._lock:
+            self.close()
+            self._ident = None
+            self._marks, self._lines = data.marks, data.lines
+            self._tail = self.size = data.upto
+        return data
+
+    def line_start(self, line: int) -> int:
+        """Byte-Offset des Zeilenanfangs (line >= len(self) -> Dateiende)."""
+        with self._lock:
+            if line >= len(self):
+                return self.size
+            if line >= self._lines:
+                return self._tail
+            block, skip = divmod(max(0, line), self.STEP)
+            pos = self._marks[block]
+            for _ in range(skip):
+                pos = self._mm.find(b"\n", pos, self.size) + 1
+            return pos
+
+    def line_of(self, offset: int) -> int:
+        """Zeile, in der der Byte-Offset liegt."""
+        with self._lock:
+            if offset >= self._tail:
+                return self._lines  # offene letzte Zeile
+            block = bisect.bisect_right(self._marks, offset) - 1
+            start = self._marks[block]
+            return block * self.STEP + self._mm[start:offset].count(b"\n")
+
+    def text(self, first: int, last: int) -> str:
+        """Zeilen [first, last) als Text ("\\r\\n" -> "\\n", einzelnes "\\r" -> Leerzeichen)."""
+        with self._lock:
+            if self._mm is None or first >= last:
+                return ""
+            raw = self._mm[self.line_start(first):self.line_start(last)]
+        return raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", " ")
+
+    def lines(self, first: int, last: int) -> List[str]:
+        text = self.text(first, last)
+        return text.split("\n")[:-1] if text.endswith("\n") else text.split("\n") if text else []
+
+    def search(self, rx: Pattern[bytes], from_line: int, backwards: bool = False,
+               stop: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """
+        Nächste Zeile ab from_line (rückwärts: vor from_line) mit Treffer von rx, sonst None.
+        Sucht in zeilenbündigen Blöcken direkt auf dem mmap; zwischen den Blöcken ist der
+        Index frei (refresh/text blockieren nicht) und stop() kann die Suche abbrechen.
+        """
+        pos = self.line_start(from_line)
+        while not (stop and stop()):
+            with self._lock:
+                mm, size = self._mm, self.size
+                if mm is None:
+                    return None
+                if backwards:
+                    if pos <= 0:
+                        return None
+                    lo = max(0, pos - self.CHUNK_BYTES)
+                    if lo:
+                        nl = mm.find(b"\n", lo, pos - 1)
+                        lo = nl + 1 if nl >= 0 else lo
+                    last = None
+                    for last in rx.finditer(mm, lo, pos):
+                        pass
+                    if last is not None:
+                        return self.line_of(last.start())
+                    pos = lo
+                else:
+                    if pos >= size:
+                        return None
+                    hi = min(size, pos + self.CHUNK_BYTES)
+                    if hi < size:
+                        nl = mm.rfind(b"\n", pos, hi)
+                        hi = nl + 1 if nl >= 0 else hi
+                    m = rx.search(mm, pos, hi)
+                    if m:
+                        return self.line_of(m.start())
+                    pos = hi
+        return None
+
+
+def compile_bytes_query(query: str, regex: bool, case_sensitive: bool) -> Pattern[bytes]:
+    """Suchtext/Regex der Oberfläche als bytes-Regex für LineIndex.search (direkt auf dem mmap)."""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    pattern = query.encode("utf-8") if regex else re.escape(query.encode("utf-8"))
+    return re.compile(pattern, flags)
+
+
+def sidecar_path(log_path) -> Path:
+    """<log>.idx neben dem Logfile."""
+    return Path(str(log_path) + SIDECAR_SUFFIX)
+
+
+@dataclass
+class LogSidecar:
+    """Inhalt eines <log>.idx: Marken/Fehler für die ersten `lines` Zeilen (= `upto` Bytes)."""
+    upto: int = 0
+    lines: int = 0
+    crc: int = 0
+    marks: array = field(default_factory=lambda: array("Q"))
+    errors: List[int] = field(default_factory=list)
+    warnings: List[int] = field(default_factory=list)
+    stats: Dict[str, int] = field(default_factory=dict)
+    sections: List[dict] = field(default_factory=list)
+
+
+def read_sidecar(path) -> Optional[LogSidecar]:
+    """<log>.idx einlesen; None, wenn nicht vorhanden oder unbekanntes Format."""
+    try:
+        f = open(path, encoding="utf-8")
+    except OSError:
+        return None
+    with f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return None
+        if header.get("v") != SIDECAR_VERSION or header.get("step") != LineIndex.STEP:
+            return None
+        data = LogSidecar()
+        for raw in f:
+            try:
+                rec = json.loads(raw) if raw.endswith("\n") else None
+            except ValueError:
+                rec = None
+            if rec is None:
+                break  # abgerissener letzter Datensatz (Build läuft noch / Absturz)
+            if "section" in rec:
+                data.sections.append(rec)
+                continue
+            data.marks.extend(rec["marks"])
+            data.errors += rec["errors"]
+            data.warnings += rec["warnings"]
+            for tag, count in rec["stats"].items():
+                data.stats[tag] = data.stats.get(tag, 0) + count
+            data.upto, data.lines, data.crc = rec["upto"], rec["lines"], rec["crc"]
+    return data
+
+
+class SidecarWriter:
+    """
+    Schreibt den Index eines wachsenden Logs inkrementell nach <log>.idx (JSON-Lines):
+    Kopf {"v", "step"}, je update() ein Datensatz mit den neuen Zeilen-Marken, Fehler- und
+    Warnzeilen und der Tag-Statistik sowie {"section": ...} für Projekt-/Stage-Grenzen.
+
+    Indiziert wird, was tatsächlich im Log steht (auch Zeilen anderer Schreiber, Windows-
+    Zeilenenden); ein vorhandener, passender Index wird fortgesetzt (mehrere Builds pro Log).
+    """
+
+    def __init__(self, log_path, path=None) -> None:
+        self.path = Path(path) if path else sidecar_path(log_path)
+        self.index = LineIndex(log_path)
+        self._highlighter = Highlighter()
+        resume = self.index.load_sidecar(self.path) is not None
+        self._out = open(self.path, "a" if resume else "w", encoding="utf-8")
+        if not resume:
+            self._write({"v": SIDECAR_VERSION, "step": LineIndex.STEP})
+
+    def _write(self, rec: dict) -> None:
+        self._out.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._out.flush()
+
+    def update(self) -> int:
+        """Neu geschriebene, abgeschlossene Zeilen indizieren; liefert deren Gesamtzahl."""
+        index = self.index
+        first, first_mark = index.complete_lines, len(index._marks)
+        if index.refresh():  # Log gekürzt/ersetzt -> Index neu beginnen
+            first = first_mark = 0
+            self._out.seek(0)
+            self._out.truncate()
+            self._write({"v": SIDECAR_VERSION, "step": LineIndex.STEP})
+        last = index.complete_lines
+        if last > first:
+            result = self._highlighter.scan(index.text(first, last), first + 1)
+            upto = index.line_start(last)
+            with index._lock:
+                crc = zlib.crc32(index._mm[max(0, upto - _CRC_BYTES):upto])
+            self._write({
+                "upto": upto,
+                "lines": last,
+                "crc": crc,
+                "marks": index._marks[first_mark:].tolist(),
+                "errors": result.error_lines,
+                "warnings": sorted({int(r.split(".", 1)[0]) for r in result.ranges.get("warning", [])[::2]}),
+                "stats": {tag: n for tag, n in result.stats.items() if n},
+            })
+        return last
+
+    def section(self, project: str, start: int, end: int, **data) -> None:
+        """Projektblock (1-basierte Zeilen start..end) mit Stages [[name, zeile], ...]."""
+        self._write(dict(data, section=project, start=start, end=end))
+
+    def close(self) -> None:
+        self.index.close()
+        self._out.close()
@@ -0,0 +1,342 @@
+# logsearch.py
+"""
+Suche über alle compile_*.log eines Verzeichnisses.
+
+Ein invertierter Index (Token -> Log/Zeile/Byte-Offset) in SQLite wird im Hintergrund
+inkrementell nachgeführt: neue Logs komplett, wachsende Logs ab dem zuletzt indizierten Byte;
+gelöschte, gekürzte oder ersetzte Logs werden entfernt bzw. neu indiziert. Suchbegriffe
+werden als Wortanfänge per UND verknüpft, die Trefferzeilen danach auf den genauen
+Suchtext geprüft. Treffer sind nach Log-Zeitpunkt sortiert (der erste = erstes Auftreten).
+
+    python -m AutoPyPlusPlus.logsearch "error C1083" --dir . --first
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .buildcache import default_cache_dir
+
+INDEX_FORMAT = 1
+LOG_GLOB = "compile_*.log"
+
+_TOKEN_RX = re.compile(r"[^\W_]*[^\W\d_][^\W_]*")  # Wörter/Codes mit mind. einem Buchstaben
+_MAX_TOKEN = 64
+_CHUNK_BYTES = 8 * 1024 * 1024
+_NAME_TIME_RX = re.compile(r"_(\d{8}_\d{4})\.log$")  # compile_<name>_YYYYMMDD_HHMM.log
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, ident TEXT NOT NULL,
+    size INTEGER NOT NULL, lines INTEGER NOT NULL, started REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS tokens (id INTEGER PRIMARY KEY, token TEXT UNIQUE NOT NULL, df INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS postings (
+    file_id INTEGER NOT NULL, token_id INTEGER NOT NULL, line INTEGER NOT NULL, offset INTEGER NOT NULL,
+    PRIMARY KEY (file_id, token_id, line)) WITHOUT ROWID;
+"""
+# postings nach Log gruppiert: Einfügen bleibt lokal, Löschen eines Logs ist ein Bereich,
+# gesucht wird pro Log (älteste zuerst) und nur so lange, bis genug Treffer da sind.
+_MAX_PREFIX_IDS = 500  # breitere Präfixe filtern nicht im Index, nur beim Prüfen der Zeile
+
+
+def tokenize(text: str) -> set:
+    """Wörter/Codes (ohne reine Zahlen wie Uhrzeiten), kleingeschrieben."""
+    return {t for t in _TOKEN_RX.findall(text.lower()) if 1 < len(t) <= _MAX_TOKEN}
+
+
+def default_db_path(log_dir) -> Path:
+    """Ein Index pro Log-Verzeichnis, neben dem Build-Cache."""
+    key = hashlib.sha1(str(Path(log_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir().parent / "logsearch" / f"{key}.sqlite3"
+
+
+def _started(path: Path, mtime: float) -> float:
+    """Zeitpunkt des Logs: aus dem Dateinamen (Build-Start), sonst mtime."""
+    m = _NAME_TIME_RX.search(path.name)
+    if m:
+        try:
+            return datetime.strptime(m.group(1), "%Y%m%d_%H%M").timestamp()
+        except ValueError:
+            pass
+    return mtime
+
+
+@dataclass
+class LogHit:
+    path: str
+    line: int        # 1-basiert, wie im Debug-Inspector
+    text: str
+    started: float
+
+    def describe(self) -> str:
+        when = datetime.fromtimestamp(self.started).strftime("%Y-%m-%d %H:%M")
+        return f"{when}  {Path(self.path).name}:{self.line}  {self.text.strip()}"
+
+
+class LogSearchIndex:
+    """Invertierter Index über LOG_GLOB in log_dir; eine SQLite-Verbindung pro Thread (WAL)."""
+
+    def __init__(self, log_dir, db_path=None) -> None:
+        self.log_dir = Path(log_dir).resolve()  # Pfade im Index absolut (ein Index pro Verzeichnis)
+        self.db_path = Path(db_path) if db_path else default_db_path(self.log_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._token_ids: Dict[str, int] = {}
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT:
+            conn.executescript("DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS tokens; DROP TABLE IF EXISTS files;")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_FORMAT}")
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Verbindung des aufrufenden Threads schließen."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------------- Indizieren ----------------
+    def update(self, stop: Optional[Callable[[], bool]] = None) -> int:
+        """Neue/gewachsene Logs indizieren, verschwundene entfernen; liefert die Zahl neuer Zeilen."""
+        conn = self._conn()
+        try:
+            return self._update(conn, stop)
+        except Exception:
+            # z. B. zweiter Schreiber (anderes Inspector-Fenster): Transaktion verwerfen, später erneut
+            conn.rollback()
+            self._token_ids.clear()
+            raise
+
+    def _update(self, conn: sqlite3.Connection, stop) -> int:
+        known = {row[1]: row for row in conn.execute("SELECT id, path, ident, size, lines FROM files")}
+        added = 0
+        for path in sorted(self.log_dir.glob(LOG_GLOB)):
+            if stop and stop():
+                return added
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            ident = f"{st.st_dev}:{st.st_ino}"
+            row = known.pop(str(path), None)
+            if row is not None and (row[2] != ident or st.st_size < row[3]):
+                self._forget(conn, row[0])  # ersetzt oder gekürzt -> neu indizieren
+                row = None
+            if row is None:
+                cur = conn.execute(
+                    "INSERT INTO files (path, ident, size, lines, started) VALUES (?, ?, 0, 0, ?)",
+                    (str(path), ident, _started(path, st.st_mtime)),
+                )
+                row = (cur.lastrowid, str(path), ident, 0, 0)
+                conn.commit()
+            if st.st_size > row[3]:
+                added += self._index_file(conn, row[0], path, row[3], row[4], stop)
+        for row in known.values():
+            self._forget(conn, row[0])
+        return added
+
+    def _forget(self, conn: sqlite3.Connection, file_id: int) -> None:
+        counts = conn.execute("SELECT token_id, COUNT(*) FROM postings WHERE file_id = ? GROUP BY token_id", (file_id,)).fetchall()
+        conn.executemany("UPDATE tokens SET df = df - ? WHERE id = ?", [(n, tid) for tid, n in counts])
+        conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+        conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        conn.commit()
+
+    def _token_id(self, conn: sqlite3.Connection, token: str) -> int:
+        tid = self._token_ids.get(token)
+        if tid is None:
+            row = conn.execute("SELECT id FROM tokens WHERE token = ?", (token,)).fetchone()
+            tid = row[0] if row else conn.execute("INSERT INTO tokens (token) VALUES (?)", (token,)).lastrowid
+            self._token_ids[token] = tid
+        return tid
+
+    def _index_file(self, conn, file_id: int, path: Path, offset: int, line: int, stop) -> int:
+        """Abgeschlossene Zeilen ab offset indizieren (Zeilen = "\\n" wie im LineIndex)."""
+        added = 0
+        ids = self._token_ids
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return 0
+        with f:
+            f.seek(offset)
+            while not (stop and stop()):
+                data = f.read(_CHUNK_BYTES)
+                cut = data.rfind(b"\n")
+                if cut < 0 and len(data) == _CHUNK_BYTES:
+                    # Zeile länger als ein Block (z. B. scons-/Nuitka-Kommandozeilen): bis zu ihrem Ende lesen
+                    parts = [data]
+                    while cut < 0:
+                        more = f.read(_CHUNK_BYTES)
+                        if not more:
+                            break
+                        cut = more.find(b"\n")
+                        if cut >= 0:
+                            cut += sum(map(len, parts))
+                        parts.append(more)
+                    data = b"".join(parts)
+                if cut < 0:
+                    break  # offene letzte Zeile: beim nächsten Mal
+                f.seek(offset + cut + 1)
+                raw = data[:cut]
+                # "\n" kommt in UTF-8 nur als Zeilenende vor -> Text- und Bytezeilen laufen gleich
+                text_lines = raw.decode("utf-8", errors="replace").lower().split("\n")
+                rows = []
+                pos = offset
+                for text_line, size in zip(text_lines, map(len, raw.split(b"\n"))):
+                    line += 1
+                    for token in set(_TOKEN_RX.findall(text_line)):
+                        if 1 < len(token) <= _MAX_TOKEN:
+                            rows.append((file_id, ids.get(token) or self._token_id(conn, token), line, pos))
+                    pos += size + 1
+                rows.sort()
+                conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)", rows)
+                df = Counter(row[1] for row in rows)
+                conn.executemany("UPDATE tokens SET df = df + ? WHERE id = ?", [(n, tid) for tid, n in df.items()])
+                conn.execute("UPDATE files SET size = ?, lines = ? WHERE id = ?", (pos, line, file_id))
+                conn.commit()
+                added += len(text_lines)
+                offset = pos
+        return added
+
+    # ---------------- Suchen ----------------
+    def search(self, query: str, limit: int = 500) -> List[LogHit]:
+        """Zeilen mit allen Suchbegriffen (Wortanfänge), die den Suchtext enthalten; älteste zuerst."""
+        needle = query.strip().lower()
+        conn = self._conn()
+        terms = []
+        for term in tokenize(needle):
+            rows = conn.execute(
+                "SELECT id, df FROM tokens WHERE token >= ? AND token < ? AND df > 0", (term, term + "\U0010ffff")
+            ).fetchall()
+            if not rows:
+                return []  # ein Begriff kommt in keinem Log vor
+            terms.append((sum(df for _, df in rows), [tid for tid, _ in rows]))
+        if not terms:
+            return []
+        terms.sort(key=lambda t: t[0])  # seltenster Begriff führt
+        id_lists = [",".join(map(str, ids)) for _, ids in terms if len(ids) <= _MAX_PREFIX_IDS]
+        if not id_lists:
+            id_lists = [",".join(map(str, terms[0][1]))]
+        sql = f"SELECT DISTINCT line, offset FROM postings p0 WHERE file_id = ? AND token_id IN ({id_lists[0]})"
+        for ids in id_lists[1:]:
+            sql += (f" AND EXISTS (SELECT 1 FROM postings p1 WHERE p1.file_id = p0.file_id"
+                    f" AND p1.token_id IN ({ids}) AND p1.line = p0.line)")
+        sql += " ORDER BY line"
+
+        hits: List[LogHit] = []
+        files = conn.execute("SELECT id, path, started FROM files ORDER BY started, path").fetchall()
+        for file_id, path, started in files:
+            f = None
+            try:
+                for line, offset in conn.execute(sql, (file_id,)):
+                    if f is None:
+                        f = open(path, "rb")
+                    f.seek(offset)
+                    text = f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
+                    if needle in text.lower():
+                        hits.append(LogHit(path, line, text, started))
+                        if len(hits) >= limit:
+                            return hits
+            except OSError:
+                continue  # Log inzwischen gelöscht
+            finally:
+                if f is not None:
+                    f.close()
+        return hits
+
+    def first_seen(self, query: str) -> Optional[LogHit]:
+        hits = self.search(query, limit=1)
+        return hits[0] if hits else None
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._conn()
+        return {
+            "logs": conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            "lines": conn.execute("SELECT COALESCE(SUM(lines), 0) FROM files").fetchone()[0],
+            "tokens": conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0],
+        }
+
+
+class LogSearchIndexer(threading.Thread):
+    """Hält einen LogSearchIndex im Hintergrund aktuell (neue/wachsende Logs alle interval Sekunden)."""
+    daemon = True
+
+    def __init__(self, index: LogSearchIndex, interval: float = 2.0,
+                 on_update: Optional[Callable[[int], None]] = None) -> None:
+        super().__init__(name="LogSearchIndexer")
+        self.index = index
+        self.interval = interval
+        self.on_update = on_update
+        self.error: Optional[Exception] = None
+        self.ready = threading.Event()  # erster Durchlauf fertig
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    added = self.index.update(stop=self._stop_event.is_set)
+                    self.error = None
+                except Exception as e:  # z. B. Datenbank gesperrt: beim nächsten Mal erneut
+                    self.error = e
+                    added = 0
+                if not self._stop_event.is_set():
+                    self.ready.set()
+                if added and self.on_update:
+                    self.on_update(added)
+                self._stop_event.wait(self.interval)
+        finally:
+            self.index.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m AutoPyPlusPlus.logsearch", description="search all compile_*.log files")
+    ap.add_argument("query")
+    ap.add_argument("--dir", type=Path, default=Path.cwd(), help="log directory (default: CWD)")
+    ap.add_argument("--db", type=Path, default=None, help="index database (default: user cache dir)")
+    ap.add_argument("--first", action="store_true", help="only the first appearance")
+    ap.add_argument("--limit", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    index = LogSearchIndex(args.dir, args.db)
+    t0 = time.perf_counter()
+    added = index.update()
+    t1 = time.perf_counter()
+    hits = index.search(args.query, limit=1 if args.first else args.limit)
+    t2 = time.perf_counter()
+    for hit in hits:
+        print(hit.describe())
+    s = index.stats()
+    print(f"{len(hits)} hit(s) | index: {s['logs']} logs, {s['lines']} lines, +{added} new in {t1 - t0:.2f} s | query {1000 * (t2 - t1):.1f} ms",
+          file=sys.stderr)
+    index.close()
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# logtail.py
+from __future__ import annotations
+
+import codecs
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class LogTail:
+    """
+    Liest ein wachsendes Logfile ab dem zuletzt gelesenen Byte-Offset (tail -f).
+
+        tail = LogTail("compile_x.log")
+        text, first_line, reset = tail.read_new()   # erster Aufruf: ganze Datei
+
+    text ist normalisiert (\\r\\n und \\r -> \\n), first_line die 1-basierte Zeile, in der
+    text beginnt (eine noch offene letzte Zeile wird fortgesetzt). reset=True, wenn die
+    Datei gekürzt oder ersetzt wurde; text enthält dann wieder alles ab Zeile 1.
+    """
+
+    def __init__(self, path, encoding: str = "utf-8") -> None:
+        self.path = Path(path)
+        self.encoding = encoding
+        self._restart()
+
+    def _restart(self) -> None:
+        self.offset = 0          # gelesene Bytes
+        self.newlines = 0        # abgeschlossene Zeilen
+        self._ident: Optional[Tuple[int, int]] = None
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        self._carry_cr = False   # "\r" am Ende: gehört evtl. zu einem "\r\n" im nächsten Block
+
+    def changed(self) -> bool:
+        """Günstiger Vorab-Check (nur stat): gibt es ungelesene Bytes oder eine neue Datei?"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return st.st_size != self.offset or (self._ident is not None and (st.st_dev, st.st_ino) != self._ident)
+
+    def read_new(self, max_bytes: int = -1) -> Tuple[str, int, bool]:
+        st = os.stat(self.path)
+        ident = (st.st_dev, st.st_ino)
+        reset = self._ident is not None and (ident != self._ident or st.st_size < self.offset)
+        if reset:
+            self._restart()
+        self._ident = ident
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(max_bytes)
+        self.offset += len(data)
+
+        text = self._decoder.decode(data)
+        if self._carry_cr:
+            text = "\r" + text
+        self._carry_cr = text.endswith("\r")
+        if self._carry_cr:
+            text = text[:-1]
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        first_line = self.newlines + 1
+        self.newlines += text.count("\n")
+        return text, first_line, reset
+
+
+def split_lines(text: str) -> List[str]:
+    """Wie readlines(), aber nur an "\\n" (passend zu den Zeilennummern des Tk-Text-Widgets)."""
+    parts = text.split("\n")
+    out = [p + "\n" for p in parts[:-1]]
+    if parts[-1]:
+        out.append(parts[-1])
+    return out
@@ -1,3 +1,6 @@
+import sys
+
+
 def main():
     import tkinter as tk
     from .gui import AutoPyPlusPlusGUI
@@ -5,3 +8,11 @@ def main():
     root = tk.Tk()
     app = AutoPyPlusPlusGUI(root)
     root.mainloop()
+
+
+def cli_entry():
+    """Konsolen-Skript: ohne Argumente die GUI, sonst der Headless-Build (cli.py)."""
+    if len(sys.argv) > 1:
+        from .cli import main as cli_main
+        sys.exit(cli_main())
+    main()
@@ -7,7 +7,9 @@ from pathlib import Path
 from typing import Optional
 
 from .project import Project
-from .compiler import compile_single
+from .lazy import lazy
+
+compile_single = lazy(".compiler", "compile_single")  # build pipeline on first compile
 
 
 class _UILog:
@@ -47,6 +49,8 @@ class MpyEditor:
         # Vars
         self.var_arch: Optional[tk.StringVar] = None
         self.var_opt: Optional[tk.StringVar] = None
+        self.var_incremental: Optional[tk.BooleanVar] = None
+        self.var_jobs: Optional[tk.StringVar] = None
 
         # Log
         self.log_text: Optional[tk.Text] = None
@@ -67,6 +71,8 @@ class MpyEditor:
         assert self.e_exclude_glob is not None
         assert self.var_arch is not None
         assert self.var_opt is not None
+        assert self.var_incremental is not None
+        assert self.var_jobs is not None
         assert self.log_text is not None
         assert self.btn_compile is not None
 
@@ -143,6 +149,9 @@ class MpyEditor:
         p.mpy_arch = arch or ""                    # optional -march=...
         p.mpy_extra_opts = extra or ""             # passthrough
         p.mpy_exclude_glob = exclude or ""         # optional exclude glob
+        p.mpy_incremental = bool(self.var_incremental.get())  # only stale .mpy files
+        jobs = (self.var_jobs.get() or "").strip()
+        p.mpy_jobs = int(jobs) if jobs.isdigit() else 0  # 0 = all cores
 
         # opt string -> int|None (expects O0..O3)
         if opt.startswith("O") and opt[1:].isdigit():
@@ -284,6 +293,8 @@ class MpyEditor:
         # Vars
         self.var_arch = tk.StringVar(value="")
         self.var_opt = tk.StringVar(value="")
+        self.var_incremental = tk.BooleanVar(value=True)
+        self.var_jobs = tk.StringVar(value="0")
 
         def row_entry(parent, r, label, width=52, btn=None, btn_cmd=None):
             ttk.Label(parent, text=label).grid(row=r, column=0, sticky="e", pady=3, padx=(0, 6))
@@ -312,6 +323,14 @@ class MpyEditor:
 
         self.e_extra_opts = row_entry(left, 6, "Extra options:", width=52)
         self.e_exclude_glob = row_entry(left, 7, "Exclude glob (dir mode):", width=52)
+        ttk.Checkbutton(
+            left, text="Incremental (only changed files)", variable=self.var_incremental
+        ).grid(row=8, column=1, sticky="w", pady=3)
+
+        ttk.Label(left, text="Parallel jobs (0 = auto):").grid(row=9, column=0, sticky="e", pady=3, padx=(0, 6))
+        ttk.Spinbox(
+            left, from_=0, to=64, textvariable=self.var_jobs, width=6
+        ).grid(row=9, column=1, sticky="w", pady=3)
 
         left.grid_columnconfigure(1, weight=1)
 
@@ -0,0 +1,164 @@
+# probecache.py
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .buildcache import default_cache_dir
+
+_FORMAT_VERSION = 1
+
+
+def default_probe_file() -> Path:
+    """probes.json neben dem Build-Cache (%LOCALAPPDATA%\\AutoPyPlusPlus bzw. ~/.cache/AutoPyPlusPlus)."""
+    return default_cache_dir().parent / "probes.json"
+
+
+def _stamp(exe: str) -> Optional[list]:
+    try:
+        st = Path(exe).stat()
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+class ProbeCache:
+    """
+    Persistenter Cache für Interpreter-/Tool-Proben (python -c ..., python -m tool --version).
+
+    Schlüssel ist (Interpreter-Pfad, Probe-Name); ein Eintrag gilt, solange mtime und Größe
+    der Interpreter-Datei gleich sind. Er wird über Projekte und Sitzungen hinweg verwendet.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else default_probe_file()
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == _FORMAT_VERSION:
+                self._entries = dict(data.get("entries") or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def _key(exe: str, name: str) -> str:
+        try:
+            exe = str(Path(exe).resolve())
+        except OSError:
+            pass
+        return f"{os.path.normcase(exe)}|{name}"
+
+    def get(
+        self,
+        exe: str,
+        name: str,
+        probe: Callable[[], dict],
+        keep: Callable[[dict], bool] = lambda result: True,
+    ) -> Tuple[dict, bool]:
+        """
+        Liefert (Ergebnis, aus_cache). probe() wird nur bei fehlendem/veraltetem Eintrag
+        ausgeführt; keep(result) entscheidet, ob das neue Ergebnis gespeichert wird.
+        """
+        key = self._key(exe, name)
+        stamp = _stamp(exe)
+        with self._lock:
+            entry = self._entries.get(key)
+            if stamp is not None and entry and entry.get("stamp") == stamp:
+                self.hits += 1
+                return dict(entry["result"]), True
+            self.misses += 1
+
+        result = probe()
+        if stamp is not None and keep(result):
+            with self._lock:
+                self._entries[key] = {"stamp": stamp, "result": result}
+                self._save()
+        return result, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def _save(self) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(
+                json.dumps({"version": _FORMAT_VERSION, "entries": self._entries}, indent=1),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+        except OSError:
+            # Cache ist optional
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+_shared: Optional[ProbeCache] = None
+_shared_lock = threading.Lock()
+
+
+def probe_cache() -> ProbeCache:
+    """Prozessweite Instanz."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ProbeCache()
+        return _shared
+
+
+def python_info(pyexe: str) -> Tuple[dict, bool]:
+    """{version, arch, executable} des Interpreters (oder {error}); (Ergebnis, aus_cache)."""
+
+    def probe() -> dict:
+        try:
+            p = subprocess.run(
+                [pyexe, "-c",
+                 "import sys,platform; "
+                 "print(platform.python_version()); "
+                 "print(platform.architecture()[0]); "
+                 "print(sys.executable)"],
+                capture_output=True, text=True, check=True
+            )
+        except Exception as e:
+            return {"error": str(e)}
+        lines = [ln.strip() for ln in (p.stdout or "").splitlines() if ln.strip()]
+        if len(lines) >= 3:
+            return {"version": lines[0], "arch": lines[1], "executable": lines[2]}
+        return {"raw": p.stdout or ""}
+
+    return probe_cache().get(pyexe, "python", probe, keep=lambda r: "version" in r)
+
+
+def module_version(pyexe: str, module: str) -> Tuple[dict, bool]:
+    """
+    python -m <module> --version im Interpreter: {ok, version, stdout, stderr}.
+    Nur erfolgreiche Proben werden gespeichert, damit ein nachträgliches
+    pip install sofort erkannt wird (die Interpreter-Datei ändert sich dabei nicht).
+    """
+
+    def probe() -> dict:
+        try:
+            p = subprocess.run([pyexe, "-m", module, "--version"], capture_output=True, text=True)
+        except Exception as e:
+            return {"ok": False, "version": "", "stdout": "", "stderr": str(e)}
+        out = (p.stdout or "").strip()
+        err = (p.stderr or "").strip()
+        return {
+            "ok": p.returncode == 0,
+            "version": (out or err).splitlines()[0] if (out or err) else "",
+            "stdout": out,
+            "stderr": err,
+        }
+
+    return probe_cache().get(pyexe, f"module:{module}", probe, keep=lambda r: r.get("ok", False))
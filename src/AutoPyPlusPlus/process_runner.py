@@ -0,0 +1,475 @@
+# process_runner.py
+from __future__ import annotations
+
+import io
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Standard-Timeouts je Backend in Sekunden (None = unbegrenzt); über
+# build_context(timeouts=...) bzw. die Config "backend_timeouts" überschreibbar.
+DEFAULT_BACKEND_TIMEOUTS: Dict[str, Optional[float]] = {
+    "pyinstaller": 600,
+    "sphinx": 600,
+    "pyarmor": None,
+    "nuitka": None,
+    "cython": None,
+    "cpp": None,
+    "pytest": None,
+    "mpy": None,
+}
+
+_POLL_S = 0.2
+
+
+class BuildCancelled(Exception):
+    """Build wurde über ein CancelToken abgebrochen."""
+
+
+class CancelToken:
+    """
+    Thread-sicheres Abbruch-Signal für einen compile_projects()-Lauf.
+    cancel() beendet alle gerade laufenden Tool-Prozesse (inkl. Kindprozesse).
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs: Set[subprocess.Popen] = set()
+        self.reason = ""
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            procs = list(self._procs)
+        for proc in procs:
+            kill_process_tree(proc)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wartet bis zum Abbruch oder Timeout; True wenn abgebrochen."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise BuildCancelled(self.reason)
+
+    def _register(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.add(proc)
+            cancelled = self._event.is_set()
+        if cancelled:
+            kill_process_tree(proc)
+
+    def _unregister(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    """Beendet proc samt Kindprozessen (Nuitka/Scons-Compiler, setup.py-Compiler, ...)."""
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(
+                ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+            )
+        else:
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+    except Exception:
+        pass
+    try:
+        proc.kill()
+    except Exception:
+        pass
+
+
+# =====================================================================
+#                     Build-Kontext (pro Worker-Thread)
+# =====================================================================
+
+_context = threading.local()
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def build_context(
+    prefix: str = "",
+    progress: Optional[Callable[[float], None]] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[float] = None,
+    timeouts: Optional[Dict[str, Optional[float]]] = None,
+):
+    """
+    Setzt Log-Präfix und Fortschritts-Callback für alle run_streaming()-Aufrufe
+    im aktuellen Thread (z. B. ein Projekt in compile_projects()).
+    progress erhält einen Anteil 0.0 … 1.0, abgeleitet aus den Ausgaben der Tools.
+    cancel: CancelToken des Laufs; deadline: time.monotonic()-Zeitpunkt, an dem das
+    Projekt-Timeout abläuft; timeouts: Timeouts je Backend (überschreibt die Defaults).
+    """
+    old = current_context()
+    _context.prefix, _context.progress = prefix, progress
+    _context.cancel, _context.deadline, _context.timeouts = cancel, deadline, timeouts
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            setattr(_context, k, v)
+
+
+def current_context() -> Dict[str, object]:
+    """Kontext des aktuellen Threads, zum Weiterreichen an Hilfs-Threads: build_context(**ctx)."""
+    return {k: getattr(_context, k, None) for k in ("prefix", "progress", "cancel", "deadline", "timeouts")}
+
+
+def current_cancel_token() -> Optional[CancelToken]:
+    return getattr(_context, "cancel", None)
+
+
+def effective_timeout(backend: Optional[str], timeout: Optional[float]) -> Optional[float]:
+    """Kleinstes aus explizitem Timeout, Backend-Timeout und verbleibender Projektzeit."""
+    candidates: List[float] = []
+    if timeout:
+        candidates.append(float(timeout))
+    elif backend:
+        table = dict(DEFAULT_BACKEND_TIMEOUTS)
+        table.update(getattr(_context, "timeouts", None) or {})
+        if table.get(backend):
+            candidates.append(float(table[backend]))
+    deadline = getattr(_context, "deadline", None)
+    if deadline is not None:
+        candidates.append(max(0.0, deadline - time.monotonic()))
+    return min(candidates) if candidates else None
+
+
+def current_prefix() -> str:
+    return getattr(_context, "prefix", "") or ""
+
+
+def report_progress(fraction: float) -> None:
+    """Meldet Fortschritt (0.0 … 1.0) an den Callback des aktuellen build_context()."""
+    cb = getattr(_context, "progress", None)
+    if cb is not None:
+        try:
+            cb(max(0.0, min(1.0, fraction)))
+        except Exception:
+            pass
+
+
+@contextmanager
+def collect_artifacts():
+    """
+    Sammelt, was die Backends im aktuellen Thread per report_artifacts() als Ergebnis
+    melden: {route: [Datei, ...]} (Build-Cache in compile_single()).
+    """
+    old = getattr(_context, "artifacts", None)
+    found: Dict[str, List[Path]] = {}
+    _context.artifacts = found
+    try:
+        yield found
+    finally:
+        _context.artifacts = old
+
+
+def report_artifacts(route: str, *paths) -> None:
+    """Meldet fertige Ausgaben (Dateien oder Ordner) einer Route; ohne collect_artifacts() ein No-op."""
+    found = getattr(_context, "artifacts", None)
+    if found is None:
+        return
+    files = found.setdefault(route, [])
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(f for f in sorted(p.rglob("*")) if f.is_file())
+        elif p.is_file():
+            files.append(p)
+
+
+# =====================================================================
+#                     Fortschritts-Marker der Tools
+# =====================================================================
+
+# (regex, fn(match) -> fraction). Erste passende Regel gewinnt.
+PROGRESS_MARKERS: List[tuple] = [
+    # Sphinx "reading sources... [ 45%] index", pytest "[ 40%]"
+    (re.compile(r"\[\s*(\d{1,3})%\]"), lambda m: int(m.group(1)) / 100.0),
+    # ninja/cmake/mpy-cross-Stil "[3/10]"
+    (re.compile(r"\[\s*(\d+)\s*/\s*(\d+)\s*\]"), lambda m: int(m.group(1)) / max(1, int(m.group(2)))),
+    # Nuitka --show-progress (tqdm): "PASS 1:  45%|" bzw. "Nuitka-Scons: ... 12/40"
+    (re.compile(r"(\d{1,3}(?:\.\d+)?)%\|"), lambda m: float(m.group(1)) / 100.0),
+    # Cython/setup.py "Compiling foo.pyx because ..."/"[2/5] Cythonizing" ist oben abgedeckt
+    # PyInstaller-Phasen
+    (re.compile(r"INFO: Building PYZ"), lambda m: 0.5),
+    (re.compile(r"INFO: Building PKG"), lambda m: 0.7),
+    (re.compile(r"INFO: Building EXE"), lambda m: 0.85),
+    (re.compile(r"INFO: Build complete"), lambda m: 1.0),
+]
+
+
+def parse_progress(line: str) -> Optional[float]:
+    for rx, fn in PROGRESS_MARKERS:
+        m = rx.search(line)
+        if m:
+            try:
+                return max(0.0, min(1.0, fn(m)))
+            except (ValueError, ZeroDivisionError):
+                return None
+    return None
+
+
+# =====================================================================
+#                     Streaming-Runner
+# =====================================================================
+
+class StreamResult(subprocess.CompletedProcess):
+    """
+    Wie subprocess.CompletedProcess; stdout/stderr enthalten nur die letzten
+    tail_lines Zeilen (der Rest steht bereits im Log).
+    """
+
+    def __init__(self, args, returncode, stdout: str, stderr: str, line_count: int, duration: float) -> None:
+        super().__init__(args, returncode, stdout, stderr)
+        self.line_count = line_count
+        self.duration = duration
+
+
+def _pump(
+    stream,
+    tail: Deque[str],
+    log_file,
+    prefix: str,
+    is_err: bool,
+    counter: List[int],
+    on_line: Optional[Callable[[str], None]],
+    sidecar=None,
+) -> None:
+    tag = f"[{prefix}] " if prefix else ""
+    err = "stderr: " if is_err else ""
+    # ProjectLogSink: write() reiht nur in die Queue des LogHub ein, dessen Writer-Thread
+    # bündelt und flusht -> kein globaler Lock, kein flush() pro Zeile
+    queued = getattr(log_file, "queued", False)
+    try:
+        for raw in iter(stream.readline, ""):
+            line = raw.rstrip("\r\n")
+            tail.append(line)
+            counter[0] += 1
+            if sidecar is not None:
+                sidecar.write(line + "\n")
+            if log_file is not None:
+                text = f"[{time.strftime('%H:%M:%S')}] {tag}{err}{line}\n"
+                if queued:
+                    log_file.write(text)
+                else:
+                    with _write_lock:  # gemeinsames Log-File ohne LogHub
+                        log_file.write(text)
+                        log_file.flush()
+            if on_line is not None:
+                on_line(line)
+    except (ValueError, OSError):
+        pass  # Stream geschlossen (Prozess beendet/abgebrochen)
+    finally:
+        for f in (stream, sidecar):
+            try:
+                if f is not None:
+                    f.close()
+            except Exception:
+                pass
+
+
+def run_streaming(
+    cmd: Sequence[str] | str,
+    log_file,
+    *,
+    cwd=None,
+    env=None,
+    timeout: Optional[float] = None,
+    check: bool = False,
+    encoding: Optional[str] = None,
+    errors: str = "replace",
+    shell: bool = False,
+    prefix: Optional[str] = None,
+    progress: Optional[Callable[[float], None]] = None,
+    tail_lines: int = 200,
+    stdout_file=None,
+    stderr_file=None,
+    backend: Optional[str] = None,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> StreamResult:
+    """
+    Startet cmd und schreibt stdout/stderr zeilenweise (mit Zeitstempel und
+    Projekt-Präfix) ins Log, während der Prozess läuft. Im Speicher bleiben nur
+    die letzten tail_lines Zeilen je Stream; stdout_file/stderr_file (Pfade)
+    erhalten optional die vollständige Rohausgabe. on_line wird (im Lese-Thread)
+    zusätzlich mit jeder Zeile aufgerufen.
+
+    Verhält sich sonst wie subprocess.run(): timeout -> TimeoutExpired (Prozessbaum wird beendet),
+    check=True -> CalledProcessError bei returncode != 0. Ohne explizites timeout gilt das
+    Timeout des backend bzw. die restliche Projektzeit (siehe effective_timeout()).
+    Ein abgebrochenes CancelToken des build_context() beendet den Prozessbaum und
+    löst BuildCancelled aus.
+    """
+    prefix = current_prefix() if prefix is None else prefix
+    progress = getattr(_context, "progress", None) if progress is None else progress
+
+    last = [-1.0]
+
+    line_hook = on_line
+
+    def on_line(line: str) -> None:
+        if line_hook is not None:
+            try:
+                line_hook(line)
+            except Exception:
+                pass
+        if progress is None:
+            return
+        frac = parse_progress(line)
+        if frac is not None and frac > last[0] + 0.005:
+            last[0] = frac
+            try:
+                progress(frac)
+            except Exception:
+                pass
+
+    token = current_cancel_token()
+    if token is not None:
+        token.raise_if_cancelled()
+    timeout = effective_timeout(backend, timeout)
+
+    # eigene Prozessgruppe, damit der ganze Baum beendet werden kann
+    group_kw = (
+        {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == "nt"
+        else {"start_new_session": True}
+    )
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        encoding=encoding,
+        errors=errors,
+        bufsize=1,
+        cwd=cwd,
+        env=env,
+        shell=shell,
+        **group_kw,
+    )
+    if token is not None:
+        token._register(proc)
+    out_tail: Deque[str] = deque(maxlen=tail_lines)
+    err_tail: Deque[str] = deque(maxlen=tail_lines)
+    counter = [0]
+    sidecars = [
+        open(path, "w", encoding="utf-8") if path else None
+        for path in (stdout_file, stderr_file)
+    ]
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, out_tail, log_file, prefix, False, counter, on_line, sidecars[0]), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, err_tail, log_file, prefix, True, counter, on_line, sidecars[1]), daemon=True),
+    ]
+    for t in readers:
+        t.start()
+
+    end = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                returncode = proc.wait(timeout=_POLL_S)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if token is not None and token.cancelled:
+                kill_process_tree(proc)
+                proc.wait()
+                for t in readers:
+                    t.join(timeout=5)
+                raise BuildCancelled(token.reason)
+            if end is not None and time.monotonic() >= end:
+                kill_process_tree(proc)
+                proc.wait()
+                for t in readers:
+                    t.join(timeout=5)
+                raise subprocess.TimeoutExpired(cmd, timeout, output="\n".join(out_tail), stderr="\n".join(err_tail))
+    except BaseException:
+        kill_process_tree(proc)
+        raise
+    finally:
+        if token is not None:
+            token._unregister(proc)
+    for t in readers:
+        t.join()
+    if token is not None and token.cancelled:
+        # Prozess wurde von CancelToken.cancel() aus einem anderen Thread beendet
+        raise BuildCancelled(token.reason)
+
+    result = StreamResult(
+        cmd, returncode, "\n".join(out_tail), "\n".join(err_tail),
+        line_count=counter[0], duration=time.perf_counter() - t0,
+    )
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, output=result.stdout, stderr=result.stderr)
+    return result
+
+
+# =====================================================================
+#                     Parallele Teilaufgaben eines Projekts
+# =====================================================================
+
+def fan_out(
+    items: Iterable[T],
+    task: Callable[[T, "io.StringIO"], None],
+    workers: int,
+    name: str = "fan-out",
+) -> Iterator[Tuple[T, str, Optional[Exception]]]:
+    """
+    Führt task(item, log) für alle items in einem Thread-Pool aus und liefert
+    (item, log_text, fehler) in Eingabereihenfolge, sobald das jeweilige Item fertig ist.
+    Jede Aufgabe schreibt in ihren eigenen Puffer, der Aufrufer übernimmt ihn geordnet ins Log.
+
+    Abbruch, Timeouts und Präfix des build_context() gelten auch in den Pool-Threads;
+    Fortschritt meldet der Aufrufer. Fehler einzelner Items stoppen die übrigen nicht,
+    BuildCancelled verwirft die wartenden Aufgaben und wird weitergereicht.
+    """
+    ctx = dict(current_context(), progress=None)
+
+    def run(item: T, buf: io.StringIO) -> None:
+        with build_context(**ctx):
+            task(item, buf)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=name)
+    try:
+        futures = []
+        for item in items:
+            buf = io.StringIO()
+            futures.append((item, buf, pool.submit(run, item, buf)))
+        for item, buf, fut in futures:
+            try:
+                fut.result()
+                error = None
+            except BuildCancelled:
+                raise
+            except Exception as e:
+                error = e
+            yield item, buf.getvalue(), error
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
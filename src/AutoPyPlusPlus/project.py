@@ -55,6 +55,13 @@ class Project:
         # -------- Compiler state (mutually exclusive except Cython/C++) --------
         self._set_compiler(use_pyarmor, use_nuitka, use_cython, use_cpp)
 
+        # -------- Build graph: names of projects that must be built first --------
+        self.depends_on: list[str] = []
+        # Hard limit for the whole build of this project in seconds (0 = none)
+        self.build_timeout_s: int = 0
+        # Compiler cache for the C/C++ steps of Nuitka, Cython and C++: auto | ccache | local | off
+        self.compiler_cache: str = "auto"
+
         # ── Tool paths ────────────────────────────────────────────────────────
         self.pyinstaller_path: str | None = None
         self.pyarmor_path: str | None = None
@@ -70,6 +77,8 @@ class Project:
         self.mpy_opt: int | None = None 
         self.mpy_extra_opts: str = "" 
         self.mpy_exclude_glob: str = "" 
+        self.mpy_incremental: bool = True  # nur geänderte Quellen neu übersetzen
+        self.mpy_jobs: int = 0  # parallele mpy-cross-Prozesse, 0 = alle Kerne
 
         # Keep two attribute names for backward/forward compatibility.
         self.python_exec_path: str = ""       # preferred attribute
@@ -165,6 +174,9 @@ class Project:
         self.cython_annotate: bool = False
         self.cython_include_dirs: list[str] = []
         self.cython_compile_time_env: dict | None = None
+        self.cython_incremental: bool = True  # cythonize/build_ext nur bei Änderungen
+        self.cython_package_dir: str = ""  # Paket-Modus: alle .pyx unterhalb übersetzen
+        self.cython_jobs: int = 0  # parallele Module im Paket-Modus, 0 = alle Kerne
         self.additional_files: list[str] = []
 
         # ── C++ compiler options ─────────────────────────────────────────────
@@ -186,6 +198,9 @@ class Project:
         self.cpp_compile_files: list[str] = []
         self.cpp_target_type: str = "Executable"
         self.cpp_target_platform: str = "Windows"
+        self.cpp_incremental: bool = False  # opt-in: Objektdateien + Header-Abhängigkeiten, nur veraltete neu
+        self.cpp_jobs: int = 0  # parallele Übersetzungseinheiten, 0 = alle Kerne
+        self.cpp_pch_header: str = ""  # Header für Precompiled Header (leer = aus), nur inkrementell
 
         # ---- Pytest options ----
         self.use_pytest: bool = False
@@ -268,6 +283,9 @@ class Project:
             "compile_a_selected": self.compile_a_selected,
             "compile_b_selected": self.compile_b_selected,
             "compile_c_selected": self.compile_c_selected,
+            "depends_on": self.depends_on,
+            "build_timeout_s": self.build_timeout_s,
+            "compiler_cache": self.compiler_cache,
             "pyinstaller_path": self.pyinstaller_path,
             "pyarmor_path": self.pyarmor_path,
             "nuitka_path": self.nuitka_path,
@@ -312,6 +330,8 @@ class Project:
             "mpy_opt": self.mpy_opt,
             "mpy_extra_opts": self.mpy_extra_opts,
             "mpy_exclude_glob": self.mpy_exclude_glob,
+            "mpy_incremental": self.mpy_incremental,
+            "mpy_jobs": self.mpy_jobs,
 
 
             # ── PyArmor options ──────────────
@@ -377,6 +397,9 @@ class Project:
             "cython_annotate": self.cython_annotate,
             "cython_include_dirs": self.cython_include_dirs,
             "cython_compile_time_env": self.cython_compile_time_env if self.cython_compile_time_env is not None else {},
+            "cython_incremental": self.cython_incremental,
+            "cython_package_dir": self.cython_package_dir,
+            "cython_jobs": self.cython_jobs,
             "additional_files": self.additional_files,
 
             # ── C++ options ──────────────
@@ -397,6 +420,9 @@ class Project:
             "cpp_compile_files": self.cpp_compile_files,
             "cpp_target_type": self.cpp_target_type,
             "cpp_target_platform": self.cpp_target_platform,
+            "cpp_incremental": self.cpp_incremental,
+            "cpp_jobs": self.cpp_jobs,
+            "cpp_pch_header": self.cpp_pch_header,
 
             # ---- Pytest options ----
             "pytest_path": self.pytest_path,
@@ -443,6 +469,9 @@ class Project:
             divider_label=d.get("divider_label", d.get("name", "")),
         )
         p.additional_files = d.get("additional_files", [])  # set outside constructor
+        p.depends_on = d.get("depends_on", [])
+        p.build_timeout_s = d.get("build_timeout_s", 0)
+        p.compiler_cache = d.get("compiler_cache", "auto")
 
         # Correct potentially inconsistent compiler states
         if p.use_pyarmor and p.use_nuitka:
@@ -492,6 +521,8 @@ class Project:
         p.mpy_opt = d.get("mpy_opt", None)
         p.mpy_extra_opts = d.get("mpy_extra_opts", "")
         p.mpy_exclude_glob = d.get("mpy_exclude_glob", "")
+        p.mpy_incremental = d.get("mpy_incremental", True)
+        p.mpy_jobs = d.get("mpy_jobs", 0)
 
         # ── PyArmor options ─────────────────────────────────────────────────
         p.pyarmor_command = d.get("pyarmor_command", "gen")
@@ -557,6 +588,9 @@ class Project:
         p.cython_annotate = d.get("cython_annotate", False)
         p.cython_include_dirs = d.get("cython_include_dirs", [])
         p.cython_compile_time_env = d.get("cython_compile_time_env", {}) if d.get("cython_compile_time_env") is not None else {}
+        p.cython_incremental = d.get("cython_incremental", True)
+        p.cython_package_dir = d.get("cython_package_dir", "")
+        p.cython_jobs = d.get("cython_jobs", 0)
 
         # ── C++ options ─────────────────────────────────────────────────────
         p.cpp_language = d.get("cpp_language", "cpp")
@@ -575,6 +609,9 @@ class Project:
         p.cpp_compile_files = d.get("cpp_compile_files", [])
         p.cpp_target_type = d.get("cpp_target_type", "Executable")
         p.cpp_target_platform = d.get("cpp_target_platform", "Windows")
+        p.cpp_incremental = d.get("cpp_incremental", False)
+        p.cpp_jobs = d.get("cpp_jobs", 0)
+        p.cpp_pch_header = d.get("cpp_pch_header", "")
         p.cpp_filename = d.get("cpp_filename", "")
 
         # ---- Pytest options ----
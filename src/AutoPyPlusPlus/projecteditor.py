@@ -3,12 +3,14 @@ from tkinter import ttk, filedialog, scrolledtext, messagebox
 from pathlib import Path
 from datetime import datetime
 from .tooltip import CreateToolTip
-from .help import show_edit_helper
-from .nuitkaeditor import NuitkaEditor
-from .cythoneditor import CythonEditor
-from .pytesteditor import PytestEditor
-from .sphinxeditor import SphinxEditor
-from .pyarmoreditor import PyarmorEditor
+from .lazy import lazy
+# Sub-editors are imported when their dialog is first opened
+show_edit_helper = lazy(".help", "show_edit_helper")
+NuitkaEditor = lazy(".nuitkaeditor", "NuitkaEditor")
+CythonEditor = lazy(".cythoneditor", "CythonEditor")
+PytestEditor = lazy(".pytesteditor", "PytestEditor")
+SphinxEditor = lazy(".sphinxeditor", "SphinxEditor")
+PyarmorEditor = lazy(".pyarmoreditor", "PyarmorEditor")
 from glob import glob
 import re
 import sys
@@ -153,7 +155,7 @@ class ProjectEditor:
     # ----------------- UI -----------------
     def show(self):
         self.x = 860
-        self.y = 620
+        self.y = 680
         self.win = tk.Toplevel(self.master)
         self.win.title("Python Compilation Editor")
         self.win.geometry(f"{self.x}x{self.y}")
@@ -247,15 +249,26 @@ class ProjectEditor:
             "PyArmor runtime folder:", 12, getattr(self.project, "pyarmor_runtime_dir", ""), directory=True
         )
 
+        # Build order: projects that must be finished before this one starts
+        depends_on = getattr(self.project, "depends_on", []) or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        self.e_depends_on, l_depends_on = create_entry_row("Depends on:", 13, ", ".join(depends_on))
+        CreateToolTip(l_depends_on, "Comma separated project names. Parallel builds wait for these projects.")
+
+        timeout_s = int(getattr(self.project, "build_timeout_s", 0) or 0)
+        self.e_build_timeout, l_build_timeout = create_entry_row("Build timeout (s):", 14, str(timeout_s) if timeout_s else "")
+        CreateToolTip(l_build_timeout, "Hard limit for the whole project build. Running tools are killed when it expires. Empty = no limit.")
+
         # Options field
-        ttk.Label(form_frame, text=self.texts["options_label"]).grid(row=13, column=0, sticky="ne", pady=5)
+        ttk.Label(form_frame, text=self.texts["options_label"]).grid(row=15, column=0, sticky="ne", pady=5)
         self.txt_options = scrolledtext.ScrolledText(form_frame, width=50, height=4, font=("Segoe UI", 10))
-        self.txt_options.grid(row=13, column=1, pady=5, sticky="ew")
+        self.txt_options.grid(row=15, column=1, pady=5, sticky="ew")
         self.txt_options.insert(tk.END, self.project.options)
 
         # Bottom options
         check_frame_bottom = ttk.Frame(form_frame)
-        check_frame_bottom.grid(row=14, column=0, columnspan=2, pady=5, sticky="w")
+        check_frame_bottom.grid(row=16, column=0, columnspan=2, pady=5, sticky="w")
 
         self.var_upx = tk.BooleanVar(value=self.project.upx)
         self.var_debug = tk.BooleanVar(value=self.project.debug)
@@ -276,7 +289,7 @@ class ProjectEditor:
 
         # Buttons
         button_frame = ttk.Frame(form_frame)
-        button_frame.grid(row=15, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=17, column=0, columnspan=2, pady=10)
         ttk.Button(button_frame, text="Cancel", command=self.win.destroy).grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Analyze", command=self.analyze_inputs).grid(row=0, column=1, padx=5)
         ttk.Button(button_frame, text="Save", command=self.save, style="Accent.TButton").grid(row=0, column=2, padx=5)
@@ -414,6 +427,11 @@ class ProjectEditor:
 
         p.include_pyarmor_runtime = self.var_include_pyarmor_runtime.get()
         p.pyarmor_runtime_dir = self.e_pyarmor_runtime_dir.get()
+        p.depends_on = [d.strip() for d in self.e_depends_on.get().replace(";", ",").split(",") if d.strip()]
+        try:
+            p.build_timeout_s = max(0, int(self.e_build_timeout.get().strip() or 0))
+        except ValueError:
+            p.build_timeout_s = 0
 
         # --- NEU: Flags aus den UI-Variablen zuverlässig zurückschreiben ---
         p.use_pytest  = self.var_use_pytest.get()
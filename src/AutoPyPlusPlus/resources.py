@@ -0,0 +1,193 @@
+# resources.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .project import Project
+
+
+@dataclass(frozen=True)
+class BackendProfile:
+    """
+    Cost profile of one build backend.
+
+    cpu:       CPU cores one job occupies (fraction for light bytecode compilers)
+    mem_mb:    typical peak memory of one job
+    slots:     default concurrency limit as a function of the CPU budget
+    scalable:  job has its own parallelism (nuitka --jobs, sphinx -j) that is split
+               between concurrently running builds
+    """
+    cpu: float
+    mem_mb: int
+    slots: Callable[[int], int]
+    scalable: bool = False
+
+
+BACKEND_PROFILES: Dict[str, BackendProfile] = {
+    "nuitka":      BackendProfile(cpu=1.0,  mem_mb=1500, slots=lambda c: max(1, c // 4), scalable=True),
+    "sphinx":      BackendProfile(cpu=1.0,  mem_mb=600,  slots=lambda c: max(1, c // 4), scalable=True),
+    "cython":      BackendProfile(cpu=1.0,  mem_mb=500,  slots=lambda c: max(1, c // 2), scalable=True),
+    "cpp":         BackendProfile(cpu=1.0,  mem_mb=500,  slots=lambda c: max(1, c // 2), scalable=True),
+    "pyinstaller": BackendProfile(cpu=1.0,  mem_mb=400,  slots=lambda c: max(1, c // 2)),
+    "pyarmor":     BackendProfile(cpu=1.0,  mem_mb=200,  slots=lambda c: max(1, c)),
+    "pytest":      BackendProfile(cpu=1.0,  mem_mb=300,  slots=lambda c: max(1, c // 2)),
+    "mpy":         BackendProfile(cpu=1.0,  mem_mb=50,   slots=lambda c: max(1, c // 2), scalable=True),
+}
+
+# Project attribute holding the job-internal parallelism of a scalable backend
+SCALABLE_ATTRS: Dict[str, str] = {
+    "nuitka": "nuitka_jobs",
+    "sphinx": "sphinx_parallel",
+    "mpy": "mpy_jobs",
+    "cython": "cython_jobs",
+    "cpp": "cpp_jobs",
+}
+
+# Backends that only have job-internal parallelism in a certain mode (project attribute set)
+SCALABLE_ONLY_IF: Dict[str, str] = {
+    "cython": "cython_package_dir",
+    "cpp": "cpp_incremental",
+}
+
+
+def available_memory_mb() -> Optional[int]:
+    """Free physical memory in MB (psutil if installed, sysconf on POSIX), else None."""
+    try:
+        import psutil  # optional
+        return int(psutil.virtual_memory().available // (1024 * 1024))
+    except Exception:
+        pass
+    try:
+        pages = os.sysconf("SC_AVPHYS_PAGES")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return int(pages * page_size // (1024 * 1024))
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _requested_jobs(project: Project, backend: str, cpu_total: int) -> int:
+    """Requested job-internal parallelism; 0 means "all cores" (cpu_total)."""
+    attr = SCALABLE_ATTRS.get(backend)
+    if not attr:
+        return 1
+    mode = SCALABLE_ONLY_IF.get(backend)
+    if mode and not getattr(project, mode, None):
+        return 1
+    try:
+        jobs = int(getattr(project, attr, 1) or 0)
+    except (TypeError, ValueError):
+        return 1
+    return cpu_total if jobs <= 0 else jobs
+
+
+class ResourceBudget:
+    """
+    Admission control for DagScheduler.
+
+    A node is admitted only if every backend it uses has a free slot and the
+    global CPU/memory budget covers its cost. When nothing is running a node is
+    always admitted, so an oversized job cannot stall the queue.
+
+    For scalable backends the granted job count is the requested one, capped at
+    the fair share cpu_total / (number of such builds that can run at once).
+    The grant is stored in node.grant as {project_attr: jobs}.
+    """
+
+    def __init__(
+        self,
+        cpu_total: Optional[int] = None,
+        mem_total_mb: Optional[int] = None,
+        backend_slots: Optional[Dict[str, int]] = None,
+        backends_of: Callable[[Project], List[str]] = lambda p: [],
+        mem_fraction: float = 0.8,
+    ) -> None:
+        self.cpu_total = max(1, int(cpu_total or os.cpu_count() or 1))
+        if mem_total_mb is None:
+            free = available_memory_mb()
+            mem_total_mb = int(free * mem_fraction) if free else None
+        self.mem_total_mb = mem_total_mb
+        self.slots = {name: prof.slots(self.cpu_total) for name, prof in BACKEND_PROFILES.items()}
+        for name, limit in (backend_slots or {}).items():
+            try:
+                self.slots[name] = max(1, int(limit))
+            except (TypeError, ValueError):
+                pass
+        self.backends_of = backends_of
+
+        self._lock = threading.Lock()
+        self._cpu_used = 0.0
+        self._mem_used = 0
+        self._in_use: Counter = Counter()
+        self._expected: Counter = Counter()
+        self._held: Dict[str, tuple] = {}
+
+    # ---------------- planning ----------------
+    def expect(self, projects: Iterable[Project]) -> None:
+        """Announces the jobs of this run (used for the fair share of scalable backends)."""
+        with self._lock:
+            for p in projects:
+                self._expected.update(set(self.backends_of(p)))
+
+    def max_concurrency(self) -> int:
+        """Upper bound for the worker pool; the budget does the real limiting."""
+        return max(1, min(64, max(self.slots.values())))
+
+    def _fair_share(self, backend: str) -> int:
+        concurrent = max(1, min(self.slots.get(backend, 1), self._expected[backend] or 1))
+        return max(1, self.cpu_total // concurrent)
+
+    def _cost(self, project: Project, backends: List[str]) -> tuple[float, int, Dict[str, int]]:
+        cpu, mem, grant = 0.0, 0, {}
+        for b in backends:
+            prof = BACKEND_PROFILES.get(b)
+            if prof is None:
+                continue
+            job_cpu = prof.cpu
+            if prof.scalable:
+                jobs = min(_requested_jobs(project, b, self.cpu_total), self._fair_share(b))
+                grant[SCALABLE_ATTRS[b]] = jobs
+                job_cpu = float(jobs)
+            # stages of one project run one after another -> max, not sum
+            cpu = max(cpu, job_cpu)
+            mem = max(mem, prof.mem_mb)
+        return cpu, mem, grant
+
+    # ---------------- DagScheduler hooks ----------------
+    def try_acquire(self, node, idle: bool = False) -> bool:
+        project = node.payload
+        backends = list(dict.fromkeys(self.backends_of(project))) if project is not None else []
+        with self._lock:
+            cpu, mem, grant = self._cost(project, backends)
+            if not idle:
+                if any(self._in_use[b] >= self.slots.get(b, 1) for b in backends):
+                    return False
+                if self._cpu_used + cpu > self.cpu_total + 1e-9:
+                    return False
+                if self.mem_total_mb is not None and self._mem_used + mem > self.mem_total_mb:
+                    return False
+            self._cpu_used += cpu
+            self._mem_used += mem
+            self._in_use.update(backends)
+            self._held[node.name] = (cpu, mem, backends)
+            node.grant = grant
+            return True
+
+    def release(self, node) -> None:
+        with self._lock:
+            held = self._held.pop(node.name, None)
+            if held is None:
+                return
+            cpu, mem, backends = held
+            self._cpu_used = max(0.0, self._cpu_used - cpu)
+            self._mem_used = max(0, self._mem_used - mem)
+            self._in_use.subtract(backends)
+            self._expected.subtract(backends)
+
+    def describe(self) -> str:
+        mem = f"{self.mem_total_mb} MB" if self.mem_total_mb is not None else "unlimited"
+        slots = ", ".join(f"{k}={v}" for k, v in sorted(self.slots.items()))
+        return f"cpu={self.cpu_total}, mem={mem}, slots: {slots}"
@@ -0,0 +1,146 @@
+# retry.py
+from __future__ import annotations
+
+import random
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from .process_runner import BuildCancelled, current_cancel_token
+
+T = TypeVar("T")
+
+# Fehlerklassen
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+# Typische vorübergehende Fehler: Virenscanner-Locks, parallele Temp-Ordner, PyInstaller-Bug
+TRANSIENT_PATTERNS: List[str] = [
+    r"_append_data_to_exe",
+    r"Permission ?denied",
+    r"PermissionError",
+    r"\[WinError (5|32|33|183|145)\]",
+    r"being used by another process",
+    r"Access is denied",
+    r"Zugriff verweigert",
+    r"Der Prozess kann nicht auf die Datei zugreifen",
+    r"Resource temporarily unavailable",
+    r"Text file busy",
+    r"Directory not empty",
+    r"The directory is not empty",
+    r"Device or resource busy",
+    r"LINK : fatal error LNK1104",        # Ausgabe noch gesperrt
+    r"LINK : fatal error LNK1168",        # cannot open ... for writing
+]
+
+# Windows STATUS_DLL_INIT_FAILED (Desktop-Heap bei vielen parallelen Prozessen)
+TRANSIENT_EXIT_CODES = {0xC0000142, -1073741502}
+
+
+@dataclass
+class RetryPolicy:
+    """
+    max_attempts:  Versuche pro Stage inkl. des ersten (1 = kein Retry)
+    base_delay_s:  Wartezeit vor dem ersten Retry, danach * factor (gedeckelt auf max_delay_s)
+    retry_on_timeout: auch Timeouts erneut versuchen
+    """
+    max_attempts: int = 3
+    base_delay_s: float = 2.0
+    factor: float = 2.0
+    max_delay_s: float = 60.0
+    jitter: float = 0.1
+    retry_on_timeout: bool = False
+    patterns: List[str] = field(default_factory=lambda: list(TRANSIENT_PATTERNS))
+
+    def __post_init__(self) -> None:
+        self._rx = re.compile("|".join(f"(?:{p})" for p in self.patterns), re.IGNORECASE) if self.patterns else None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RetryPolicy":
+        """Liest retry_max_attempts, retry_base_delay_s, retry_on_timeout, retry_patterns (zusätzlich)."""
+        policy = cls()
+        try:
+            policy.max_attempts = max(1, int(config.get("retry_max_attempts", policy.max_attempts)))
+            policy.base_delay_s = max(0.0, float(config.get("retry_base_delay_s", policy.base_delay_s)))
+        except (TypeError, ValueError):
+            pass
+        policy.retry_on_timeout = bool(config.get("retry_on_timeout", False))
+        extra = config.get("retry_patterns") or []
+        if extra:
+            policy.patterns = policy.patterns + [str(p) for p in extra]
+            policy.__post_init__()
+        return policy
+
+    def delay(self, retry_no: int) -> float:
+        d = min(self.max_delay_s, self.base_delay_s * (self.factor ** (retry_no - 1)))
+        return max(0.0, d * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def classify(self, exc: BaseException) -> tuple[str, str]:
+        """(Klasse, Begründung) anhand von Exit-Code und stderr/Fehlertext."""
+        if isinstance(exc, BuildCancelled):
+            return CANCELLED, str(exc)
+        if isinstance(exc, subprocess.TimeoutExpired):
+            return TIMEOUT, f"timeout after {exc.timeout:.0f}s"
+        if isinstance(exc, subprocess.CalledProcessError) and exc.returncode in TRANSIENT_EXIT_CODES:
+            return TRANSIENT, f"exit code {exc.returncode:#x}"
+        text = " ".join(
+            str(x) for x in (exc, getattr(exc, "stderr", None), getattr(exc, "output", None)) if x
+        )
+        if self._rx is not None:
+            m = self._rx.search(text)
+            if m:
+                return TRANSIENT, m.group(0)
+        return PERMANENT, type(exc).__name__
+
+    def should_retry(self, kind: str) -> bool:
+        return kind == TRANSIENT or (kind == TIMEOUT and self.retry_on_timeout)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def _sleep(seconds: float) -> None:
+    """Backoff-Wartezeit, die ein CancelToken sofort beendet."""
+    token = current_cancel_token()
+    if token is not None:
+        if token.wait(seconds):
+            raise BuildCancelled(token.reason)
+    else:
+        time.sleep(seconds)
+
+
+def run_with_retry(
+    stage: str,
+    fn: Callable[[], T],
+    policy: Optional[RetryPolicy],
+    log_write: Callable[[str], None],
+    attempts: Optional[Dict[str, int]] = None,
+) -> T:
+    """
+    Führt fn() aus und wiederholt es bei vorübergehenden Fehlern mit exponentiellem Backoff.
+    Es wird nur diese Stage wiederholt. attempts[stage] erhält die Zahl der Versuche.
+    """
+    policy = policy or NO_RETRY
+    attempt = 0
+    while True:
+        attempt += 1
+        if attempts is not None:
+            attempts[stage] = attempt
+        try:
+            return fn()
+        except Exception as e:
+            kind, why = policy.classify(e)
+            if attempt >= policy.max_attempts or not policy.should_retry(kind):
+                if attempt > 1:
+                    log_write(f"!!! WARNING: Stage {stage} failed after {attempt} attempts ({kind}: {why})\n")
+                raise
+            delay = policy.delay(attempt)
+            log_write(
+                f"!!! WARNING: Stage {stage} failed ({kind}: {why}), "
+                f"retry {attempt}/{policy.max_attempts - 1} in {delay:.1f}s\n"
+            )
+            _sleep(delay)
@@ -0,0 +1,338 @@
+# scheduler.py
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .project import Project
+
+# Node states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class BuildNode:
+    name: str
+    payload: Any = None
+    deps: List[str] = field(default_factory=list)
+    state: str = PENDING
+    result: Optional[str] = None
+    start: Optional[float] = None       # time.perf_counter() when started
+    end: Optional[float] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    grant: Dict[str, int] = field(default_factory=dict)   # from ResourceBudget, e.g. {"nuitka_jobs": 4}
+    attempts: Dict[str, int] = field(default_factory=dict)  # tries per stage (retry policy)
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+@dataclass
+class BuildReport:
+    nodes: List[BuildNode]
+    critical_path: List[str]
+    critical_path_s: float
+    wall_time_s: float
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_time_s": round(self.wall_time_s, 3),
+            "critical_path": self.critical_path,
+            "critical_path_s": round(self.critical_path_s, 3),
+            "nodes": [
+                {
+                    "name": n.name,
+                    "state": n.state,
+                    "deps": list(n.deps),
+                    "result": n.result,
+                    "duration_s": round(n.duration, 3),
+                    "stages": {k: round(v, 3) for k, v in n.stage_timings.items()},
+                    "grant": dict(n.grant),
+                    "attempts": dict(n.attempts),
+                }
+                for n in self.nodes
+            ],
+        }
+
+
+class BuildGraph:
+    """
+    Directed acyclic graph of build nodes. An edge A -> B means "B waits for A".
+    Insertion order is kept, so ready nodes are dispatched in list order (top/down).
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, BuildNode] = {}
+
+    def add_node(self, name: str, payload: Any = None, deps: Iterable[str] = ()) -> BuildNode:
+        if name in self.nodes:
+            raise ValueError(f"Duplicate build node: {name}")
+        node = BuildNode(name=name, payload=payload, deps=list(dict.fromkeys(deps)))
+        self.nodes[name] = node
+        return node
+
+    def add_edge(self, before: str, after: str) -> None:
+        node = self.nodes[after]
+        if before not in node.deps:
+            node.deps.append(before)
+
+    def dependents(self, name: str) -> List[str]:
+        return [n.name for n in self.nodes.values() if name in n.deps]
+
+    def validate(self) -> None:
+        """Raises ValueError on unknown dependencies or cycles."""
+        for node in self.nodes.values():
+            for dep in node.deps:
+                if dep not in self.nodes:
+                    raise ValueError(f"{node.name}: unknown dependency '{dep}'")
+                if dep == node.name:
+                    raise ValueError(f"{node.name}: depends on itself")
+        self.topological_order()
+
+    def topological_order(self) -> List[str]:
+        indeg = {name: len(n.deps) for name, n in self.nodes.items()}
+        order: List[str] = []
+        ready = [name for name, d in indeg.items() if d == 0]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dep_name in self.dependents(name):
+                indeg[dep_name] -= 1
+                if indeg[dep_name] == 0:
+                    ready.append(dep_name)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(name for name, d in indeg.items() if d > 0)
+            raise ValueError(f"Dependency cycle between: {', '.join(cyclic)}")
+        return order
+
+    def critical_path(self) -> tuple[List[str], float]:
+        """Longest chain of measured durations through the graph."""
+        best: Dict[str, float] = {}
+        prev: Dict[str, Optional[str]] = {}
+        for name in self.topological_order():
+            node = self.nodes[name]
+            start_at, via = 0.0, None
+            for dep in node.deps:
+                if best[dep] > start_at:
+                    start_at, via = best[dep], dep
+            best[name] = start_at + node.duration
+            prev[name] = via
+        if not best:
+            return [], 0.0
+        tail = max(best, key=lambda k: best[k])
+        path: List[str] = []
+        cur: Optional[str] = tail
+        while cur is not None:
+            path.append(cur)
+            cur = prev[cur]
+        path.reverse()
+        return path, best[tail]
+
+
+class DagScheduler:
+    """
+    Runs every node whose dependencies are done, up to max_workers at a time.
+    A failed node marks all of its (transitive) dependents as skipped.
+
+    worker(node) must return a result string; results containing "Error" count
+    as failure (same convention as compile_single()).
+
+    resources (optional, see resources.ResourceBudget) is asked before a ready
+    node is dispatched: try_acquire(node, idle) -> bool and release(node).
+    Nodes that do not fit wait while other ready nodes may still start.
+
+    cancel (optional, process_runner.CancelToken): once cancelled no further node
+    is started and every pending node ends as CANCELLED. With fail_fast the first
+    failure cancels the token (running tools are killed, the queue is dropped).
+    """
+
+    def __init__(
+        self,
+        graph: BuildGraph,
+        worker: Callable[[BuildNode], str],
+        max_workers: int = 1,
+        on_node_done: Optional[Callable[[BuildNode], None]] = None,
+        resources=None,
+        cancel=None,
+        fail_fast: bool = False,
+    ) -> None:
+        self.graph = graph
+        self.worker = worker
+        self.max_workers = max(1, int(max_workers or 1))
+        self.on_node_done = on_node_done
+        self.resources = resources
+        self.cancel = cancel
+        self.fail_fast = fail_fast
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_failure(result: Optional[str]) -> bool:
+        return result is None or "Error" in result
+
+    def _run_node(self, node: BuildNode) -> str:
+        node.start = time.perf_counter()
+        try:
+            return self.worker(node)
+        finally:
+            node.end = time.perf_counter()
+
+    def _skip_dependents(self, name: str, finished: List[BuildNode]) -> None:
+        for dep_name in self.graph.dependents(name):
+            node = self.graph.nodes[dep_name]
+            if node.state != PENDING:
+                continue
+            node.state = SKIPPED
+            node.result = f"Error: {dep_name} skipped, dependency '{name}' failed"
+            finished.append(node)
+            self._skip_dependents(dep_name, finished)
+
+    def _cancel_pending(self) -> None:
+        reason = getattr(self.cancel, "reason", "") or "cancelled"
+        cancelled = []
+        for node in self.graph.nodes.values():
+            if node.state == PENDING:
+                node.state = CANCELLED
+                node.result = f"Error: {node.name} cancelled ({reason})"
+                cancelled.append(node)
+        if self.on_node_done:
+            for node in cancelled:
+                self.on_node_done(node)
+
+    def _ready(self) -> List[BuildNode]:
+        nodes = self.graph.nodes
+        return [
+            n for n in nodes.values()
+            if n.state == PENDING and all(nodes[d].state == DONE for d in n.deps)
+        ]
+
+    def run(self) -> BuildReport:
+        self.graph.validate()
+        t0 = time.perf_counter()
+        running: Dict[Any, BuildNode] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if self.cancel is not None and self.cancel.cancelled:
+                    self._cancel_pending()
+                for node in self._ready():
+                    if len(running) >= self.max_workers:
+                        break
+                    if self.resources is not None and not self.resources.try_acquire(node, idle=not running):
+                        continue
+                    node.state = RUNNING
+                    running[executor.submit(self._run_node, node)] = node
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    if self.resources is not None:
+                        self.resources.release(node)
+                    finished: List[BuildNode] = [node]
+                    try:
+                        node.result = future.result()
+                    except Exception as e:
+                        node.result = f"Error: exception in {node.name}: {e}"
+                    if self.is_failure(node.result):
+                        node.state = FAILED
+                        if self.cancel is not None and self.cancel.cancelled:
+                            node.state = CANCELLED
+                        elif self.fail_fast and self.cancel is not None:
+                            self.cancel.cancel(f"fail-fast: {node.name} failed")
+                        self._skip_dependents(node.name, finished)
+                    else:
+                        node.state = DONE
+                    if self.on_node_done:
+                        for n in finished:
+                            self.on_node_done(n)
+
+        path, path_s = self.graph.critical_path()
+        return BuildReport(
+            nodes=list(self.graph.nodes.values()),
+            critical_path=path,
+            critical_path_s=path_s,
+            wall_time_s=time.perf_counter() - t0,
+        )
+
+
+# =====================================================================
+#                    Projects -> BuildGraph
+# =====================================================================
+
+def project_node_name(project: Project) -> str:
+    return project.name or (Path(project.script).stem if project.script else "project")
+
+
+def _parse_depends_on(raw) -> List[str]:
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        raw = raw.replace(";", ",").split(",")
+    return [str(x).strip() for x in raw if str(x).strip()]
+
+
+def _is_under(path: str, base: str) -> bool:
+    if not path or not base:
+        return False
+    try:
+        Path(path).resolve().relative_to(Path(base).resolve())
+        return True
+    except Exception:
+        return False
+
+
+def build_project_graph(projects: List[Project], log_write: Callable[[str], None] = lambda s: None) -> BuildGraph:
+    """
+    Builds the DAG for the selected projects.
+
+    Edges come from:
+      - project.depends_on (names of other projects, list or comma separated string)
+      - PyArmor gen -> PyInstaller bundle: a project that includes the PyArmor runtime
+        waits for every selected PyArmor project whose dist dir contains its script/runtime.
+
+    Dependencies on projects that are not part of this batch are ignored (assumed built).
+    """
+    graph = BuildGraph()
+    names: Dict[int, str] = {}
+    for p in projects:
+        base = project_node_name(p)
+        name, n = base, 2
+        while name in graph.nodes:
+            name = f"{base}#{n}"
+            n += 1
+        graph.add_node(name, payload=p)
+        names[id(p)] = name
+
+    for p in projects:
+        me = names[id(p)]
+        for dep in _parse_depends_on(getattr(p, "depends_on", None)):
+            if dep == me:
+                log_write(f"--- WARNING: {me} depends on itself, ignored\n")
+            elif dep in graph.nodes:
+                graph.add_edge(dep, me)
+            else:
+                log_write(f"--- INFO: {me}: dependency '{dep}' not selected in this run, ignored\n")
+
+        if getattr(p, "include_pyarmor_runtime", False) and not getattr(p, "use_pyarmor", False):
+            for other in projects:
+                if other is p or not getattr(other, "use_pyarmor", False):
+                    continue
+                dist = getattr(other, "pyarmor_dist_dir", "") or ""
+                if _is_under(p.script, dist) or _is_under(getattr(p, "pyarmor_runtime_dir", ""), dist):
+                    graph.add_edge(names[id(other)], me)
+                    log_write(f"--- INFO: {me} waits for PyArmor project {names[id(other)]}\n")
+    return graph
@@ -1,10 +1,16 @@
 # simplex_api.py
 from __future__ import annotations
 import configparser
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
 import threading
 import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 # Accept a flexible set of boolean spellings (both EN/DE allowed for convenience).
 TRUTHY = {"1", "true", "on", "yes", "y", "an", "ein", "aktiv", "activ","start"}
@@ -20,9 +26,135 @@ def _to_bool(s: str | None) -> bool:
     # Fallback: non-empty string -> True
     return bool(s)
 
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of the file, None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# ---- Change notification backends ----
+# wait(timeout) returns True if the INI *may* have changed (the watcher then compares the
+# file signature before parsing), False on timeout without any event.
+
+class _PollWaiter:
+    """Fallback: wake up every poll_interval; only os.stat() happens per tick."""
+    name = "poll"
+
+    def __init__(self, path: Path, poll_interval: float):
+        self.poll_interval = max(0.05, float(poll_interval))
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(min(timeout, self.poll_interval))
+        return True
+
+    def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWaiter:
+    """Linux inotify on the INI's directory (editors often replace the file via rename)."""
+    name = "inotify"
+    _MASK = 0x2 | 0x8 | 0x80 | 0x100 | 0x200  # MODIFY, CLOSE_WRITE, MOVED_TO, CREATE, DELETE
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, path: Path, poll_interval: float):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._filename = path.name.encode()
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, str(path.parent).encode(), self._MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch failed for {path.parent}")
+
+    def _read_events(self) -> bool:
+        hit = False
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return hit
+            if not buf:
+                return hit
+            offset = 0
+            while offset + self._HEADER.size <= len(buf):
+                _, _, _, length = self._HEADER.unpack_from(buf, offset)
+                start = offset + self._HEADER.size
+                name = buf[start:start + length].rstrip(b"\0")
+                hit = hit or name == self._filename
+                offset = start + length
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(ready) and self._read_events()
+
+    def drain(self) -> None:
+        self._read_events()
+
+    def close(self) -> None:
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class _Win32Waiter:
+    """Windows FindFirstChangeNotificationW on the INI's directory (not filtered by file name)."""
+    name = "win32"
+    _FILTER = 0x1 | 0x8 | 0x10  # FILE_NAME, SIZE, LAST_WRITE
+
+    def __init__(self, path: Path, poll_interval: float):
+        self._k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._k32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        self._k32.FindNextChangeNotification.argtypes = [ctypes.c_void_p]
+        self._k32.FindCloseChangeNotification.argtypes = [ctypes.c_void_p]
+        self._k32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        self._k32.WaitForSingleObject.restype = ctypes.c_uint32
+        handle = self._k32.FindFirstChangeNotificationW(str(path.parent), False, self._FILTER)
+        if handle in (None, ctypes.c_void_p(-1).value):
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._handle = handle
+
+    def wait(self, timeout: float) -> bool:
+        if self._k32.WaitForSingleObject(self._handle, int(timeout * 1000)) != 0:  # WAIT_OBJECT_0
+            return False
+        self._k32.FindNextChangeNotification(self._handle)
+        return True
+
+    def drain(self) -> None:
+        while self._k32.WaitForSingleObject(self._handle, 0) == 0:
+            self._k32.FindNextChangeNotification(self._handle)
+
+    def close(self) -> None:
+        self._k32.FindCloseChangeNotification(self._handle)
+
+
+def make_change_waiter(path: Path, poll_interval: float = 1.0, backend: str = "auto"):
+    """inotify (Linux) or FindFirstChangeNotification (Windows), otherwise mtime/size polling."""
+    candidates = []
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        candidates.append(_InotifyWaiter)
+    if backend in ("auto", "win32") and os.name == "nt":
+        candidates.append(_Win32Waiter)
+    for cls in candidates:
+        try:
+            return cls(Path(path), poll_interval)
+        except (OSError, AttributeError):
+            pass  # z. B. Verzeichnis fehlt, inotify-Limit erreicht -> Polling
+    return _PollWaiter(Path(path), poll_interval)
+
+
 class SimplexAPIWatcher(threading.Thread):
     """
-    Periodically reads simplexAPI.ini and triggers GUI actions on rising edges (OFF->ON).
+    Watches simplexAPI.ini and triggers GUI actions on rising edges (OFF->ON).
     Supported flags (section [Simplex]):
       - Compile_all : triggers gui.compile_all()
       - Inspector   : opens the debug inspector via gui._open_debuginspector()
@@ -34,17 +166,27 @@ class SimplexAPIWatcher(threading.Thread):
       - AutoReset   : bool, if true rewrite flags back to OFF after a trigger
 
     Notes:
+      * Event-driven: inotify / FindFirstChangeNotification on the INI's directory, falling
+        back to polling (mtime/size every poll_interval). The INI is parsed only when its
+        signature changed and written only when a flag was actually reset.
       * All GUI interactions are scheduled via Tk's main thread using master.after(0, ...).
       * Any exceptions are surfaced in the GUI status bar but do not kill the watcher loop.
     """
     daemon = True
+    WAKE_S = 1.0        # max. Reaktionszeit auf stop(); beim Warten auf Events keine I/O
+    DEBOUNCE_S = 0.05   # Schreibvorgänge in mehreren Schritten zusammenfassen
 
-    def __init__(self, gui, ini_path: Path, poll_interval: float = 1.0):
+    def __init__(self, gui, ini_path: Path, poll_interval: float = 1.0, backend: str = "auto"):
         super().__init__(name="SimplexAPIWatcher")
         self.gui = gui
         self.ini_path = Path(ini_path)
         self.poll_interval = poll_interval
-        self._stop = threading.Event()
+        self.backend = backend
+        self.backend_name = ""
+        self.parse_count = 0
+        self.write_count = 0
+        self._stop_event = threading.Event()
+        self._seen: Optional[Tuple[int, int, int]] = None
         self._last = {
             "compile_all": False,
             "inspector": False,
@@ -52,76 +194,90 @@ class SimplexAPIWatcher(threading.Thread):
         }
 
     def stop(self):
-        """Request the watcher to stop on the next loop iteration."""
-        self._stop.set()
+        """Request the watcher to stop (takes effect within WAKE_S)."""
+        self._stop_event.set()
 
     def run(self):
-        """Main polling loop. Reads INI, checks flags, triggers actions on rising edges."""
-        while not self._stop.is_set():
-            try:
-                if self.ini_path.is_file():
-                    cfg = configparser.ConfigParser()
-                    cfg.optionxform = str  # keep case of keys
-                    cfg.read(self.ini_path, encoding="utf-8")
-
-                    section = "Simplex"
-                    get = lambda k, d=None: (cfg[section].get(k, d) if cfg.has_section(section) else d)
-
-                    # Optional: set Mode (A/B/C) before actions
-                    mode = (get("Mode") or "").strip().upper()
-                    if mode in {"A", "B", "C"} and mode != self.gui.compile_mode_var.get():
-                        self.gui.master.after(0, lambda m=mode: self._set_mode(m))
-
-                    # Optional: set ThreadCount
-                    tc = get("ThreadCount")
-                    if tc and tc.isdigit():
-                        val = max(1, min(int(tc), self.gui.max_threads))
-                        if val != int(self.gui.thread_count_var.get()):
-                            self.gui.master.after(0, lambda v=val: self.gui.thread_count_var.set(v))
-
-                    auto_reset = _to_bool(get("AutoReset", "true"))
-
-                    # Check actions with rising-edge detection (OFF -> ON)
-                    self._check_action(
-                        key="Compile_all",
-                        current=_to_bool(get("Compile_all")),
-                        trigger=self._trigger_compile_all,
-                        reset=lambda: self._reset_flag(cfg, section, "Compile_all") if auto_reset else None,
-                    )
-
-                    self._check_action(
-                        key="Inspector",
-                        current=_to_bool(get("Inspector")),
-                        trigger=self._trigger_inspector,
-                        reset=lambda: self._reset_flag(cfg, section, "Inspector") if auto_reset else None,
-                    )
-
-                    self._check_action(
-                        key="DeleteLogs",
-                        current=_to_bool(get("DeleteLogs")),
-                        trigger=self._trigger_delete_logs,
-                        reset=lambda: self._reset_flag(cfg, section, "DeleteLogs") if auto_reset else None,
-                    )
-
-                    # If AutoReset is enabled, write back potential flag changes
-                    if auto_reset and cfg.has_section(section):
-                        with open(self.ini_path, "w", encoding="utf-8") as f:
-                            cfg.write(f)
-
-                time.sleep(self.poll_interval)
-            except Exception as e:
-                # Report errors to the GUI status bar; keep the loop alive.
-                self.gui.master.after(0, lambda: self.gui.set_status(f"SimplexAPI error: {e}", hold_ms=2500))
-                time.sleep(self.poll_interval)
-
-    def _check_action(self, key: str, current: bool, trigger: Callable[[], None], reset: Callable[[], None] | None):
-        """Fire trigger on rising edge (last False -> current True)."""
+        """Wait for change notifications; parse and act only when the INI changed."""
+        waiter = make_change_waiter(self.ini_path, self.poll_interval, self.backend)
+        self.backend_name = waiter.name
+        try:
+            self._process_if_changed()
+            while not self._stop_event.is_set():
+                if not waiter.wait(self.WAKE_S):
+                    continue
+                if self._stop_event.wait(self.DEBOUNCE_S):
+                    break
+                waiter.drain()
+                self._process_if_changed()
+        finally:
+            waiter.close()
+
+    def _process_if_changed(self):
+        sig = _file_signature(self.ini_path)
+        if sig is None or sig == self._seen:
+            return
+        self._seen = sig
+        try:
+            cfg = configparser.ConfigParser()
+            cfg.optionxform = str  # keep case of keys
+            cfg.read(self.ini_path, encoding="utf-8")
+            self.parse_count += 1
+            self._apply(cfg)
+        except Exception as e:
+            # Report errors to the GUI status bar; keep the loop alive.
+            msg = f"SimplexAPI error: {e}"  # e existiert nicht mehr, wenn Tk den Callback ausführt
+            self.gui.master.after(0, lambda: self.gui.set_status(msg, hold_ms=2500))
+
+    def _apply(self, cfg: configparser.ConfigParser):
+        """Reads flags/options of a freshly parsed INI and fires the actions."""
+        section = "Simplex"
+        if not cfg.has_section(section):
+            return  # leer bzw. halb geschrieben: Flankenzustand nicht verändern
+        get = lambda k, d=None: cfg[section].get(k, d)
+
+        # Optional: set Mode (A/B/C) before actions
+        mode = (get("Mode") or "").strip().upper()
+        if mode in {"A", "B", "C"} and mode != self.gui.compile_mode_var.get():
+            self.gui.master.after(0, lambda m=mode: self._set_mode(m))
+
+        # Optional: set ThreadCount
+        tc = get("ThreadCount")
+        if tc and tc.isdigit():
+            val = max(1, min(int(tc), self.gui.max_threads))
+            if val != int(self.gui.thread_count_var.get()):
+                self.gui.master.after(0, lambda v=val: self.gui.thread_count_var.set(v))
+
+        auto_reset = _to_bool(get("AutoReset", "true"))
+        reset = (lambda key: self._reset_flag(cfg, section, key)) if auto_reset else None
+
+        # Check actions with rising-edge detection (OFF -> ON)
+        fired = [
+            self._check_action("Compile_all", _to_bool(get("Compile_all")), self._trigger_compile_all, reset),
+            self._check_action("Inspector", _to_bool(get("Inspector")), self._trigger_inspector, reset),
+            self._check_action("DeleteLogs", _to_bool(get("DeleteLogs")), self._trigger_delete_logs, reset),
+        ]
+
+        # Write back only if a flag was actually reset to OFF
+        if auto_reset and any(fired):
+            with open(self.ini_path, "w", encoding="utf-8") as f:
+                cfg.write(f)
+            self.write_count += 1
+            self._seen = _file_signature(self.ini_path)  # eigene Änderung nicht erneut parsen
+            for key in ("Compile_all", "Inspector", "DeleteLogs"):
+                self._last[key.lower()] = _to_bool(cfg[section].get(key))
+
+    def _check_action(self, key: str, current: bool, trigger: Callable[[], None],
+                      reset: Callable[[str], None] | None) -> bool:
+        """Fire trigger on rising edge (last False -> current True); True if a flag was reset."""
         last = self._last.get(key.lower(), False)
+        self._last[key.lower()] = current
         if current and not last:
             trigger()
             if reset:
-                reset()
-        self._last[key.lower()] = current
+                reset(key)
+                return True
+        return False
 
     def _set_mode(self, mode: str):
         """Apply compile mode in GUI safely on the Tk thread."""
@@ -152,4 +308,3 @@ class SimplexAPIWatcher(threading.Thread):
         if not cfg.has_section(section):
             cfg.add_section(section)
         cfg[section][key] = "OFF"
-
@@ -0,0 +1,167 @@
+# startupbench.py
+"""
+Kaltstart-Benchmark der GUI-Imports (python -X importtime in frischen Interpretern).
+
+    python -m AutoPyPlusPlus.startupbench                  # AutoPyPlusPlus.gui, 5 Läufe
+    python -m AutoPyPlusPlus.startupbench --record         # Ergebnis in die Historie (pro VERSION)
+    python -m AutoPyPlusPlus.startupbench --budget-ms 300  # Exit-Code 1, wenn der Median darüber liegt
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .buildcache import default_cache_dir
+
+DEFAULT_MODULE = "AutoPyPlusPlus.gui"
+
+
+def default_history_file() -> Path:
+    return default_cache_dir().parent / "startup_bench.jsonl"
+
+
+def current_version() -> str:
+    """Inhalt der VERSION-Datei im Repo (bzw. installierte Paketversion)."""
+    version_file = Path(__file__).resolve().parents[2] / "VERSION"
+    try:
+        return version_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        pass
+    try:
+        from importlib.metadata import version
+        return version("autoPyPlusPlus")
+    except Exception:
+        return "unknown"
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Zeilen "import time: self [us] | cumulative | name" -> [(name, self_us, cumulative_us)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Kopfzeile
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def measure_once(module: str, python: str = sys.executable) -> Dict[str, object]:
+    """Ein frischer Interpreter: Import-Zeit des Moduls (kumulativ), Wandzeit und Einzelzeiten."""
+    env = dict(os.environ)
+    package_parent = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = package_parent + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    total = next((cum for name, _, cum in rows if name == module), sum(s for _, s, _ in rows))
+    return {"import_us": total, "wall_s": wall, "rows": rows}
+
+
+def measure(module: str = DEFAULT_MODULE, runs: int = 5, python: str = sys.executable, top: int = 10) -> dict:
+    """Median über runs Kaltstarts plus die langsamsten Module (Eigenzeit, Median)."""
+    samples = [measure_once(module, python) for _ in range(max(1, runs))]
+    per_module: Dict[str, List[int]] = {}
+    for s in samples:
+        for name, self_us, _ in s["rows"]:
+            per_module.setdefault(name, []).append(self_us)
+    slowest = sorted(
+        ((name, statistics.median(v) / 1000.0) for name, v in per_module.items()),
+        key=lambda x: x[1], reverse=True,
+    )[:top]
+    imports = [s["import_us"] / 1000.0 for s in samples]
+    return {
+        "module": module,
+        "version": current_version(),
+        "python": sys.version.split()[0],
+        "runs": len(samples),
+        "median_ms": round(statistics.median(imports), 2),
+        "min_ms": round(min(imports), 2),
+        "wall_median_ms": round(statistics.median(s["wall_s"] for s in samples) * 1000.0, 2),
+        "modules_imported": len(samples[-1]["rows"]),
+        "slowest": [[name, round(ms, 2)] for name, ms in slowest],
+        "ts": round(time.time(), 3),
+    }
+
+
+def load_history(path: Path) -> List[dict]:
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    out = []
+    for line in lines:
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            pass
+    return out
+
+
+def record(result: dict, path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def previous_release(history: List[dict], result: dict) -> Optional[dict]:
+    """Letzter Eintrag für dasselbe Modul mit einer anderen Version."""
+    for entry in reversed(history):
+        if entry.get("module") == result["module"] and entry.get("version") != result["version"]:
+            return entry
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m AutoPyPlusPlus.startupbench", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--python", default=sys.executable, help="interpreter to measure")
+    ap.add_argument("--history", type=Path, default=None, help="JSON lines file (default: next to the build cache)")
+    ap.add_argument("--record", action="store_true", help="append the result to the history")
+    ap.add_argument("--budget-ms", type=float, default=None, help="fail if the median import time exceeds this")
+    ap.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = ap.parse_args(argv)
+
+    history_path = args.history or default_history_file()
+    result = measure(args.module, args.runs, args.python)
+    baseline = previous_release(load_history(history_path), result)
+
+    if args.json:
+        print(json.dumps(result, indent=1))
+    else:
+        print(f"{result['module']} {result['version']} (Python {result['python']}, {result['runs']} cold starts)")
+        print(f"  import time: median {result['median_ms']:.1f} ms, min {result['min_ms']:.1f} ms, "
+              f"process wall {result['wall_median_ms']:.1f} ms, {result['modules_imported']} modules")
+        if baseline:
+            delta = result["median_ms"] - baseline["median_ms"]
+            print(f"  vs {baseline['version']}: {baseline['median_ms']:.1f} ms ({delta:+.1f} ms)")
+        print("  slowest modules (self time):")
+        for name, ms in result["slowest"]:
+            print(f"    {ms:8.2f} ms  {name}")
+
+    if args.record:
+        record(result, history_path)
+    if args.budget_ms is not None and result["median_ms"] > args.budget_ms:
+        print(f"Startup budget exceeded: {result['median_ms']:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
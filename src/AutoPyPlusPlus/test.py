@@ -8,6 +8,15 @@ from AutoPyPlusPlus.CPB0000000 import CPB0000000
 from AutoPyPlusPlus.CPC0000000 import CPC0000000
 from AutoPyPlusPlus.CPD0000000 import CPD0000000
 from AutoPyPlusPlus.CPE0000000 import CPE0000000
+from AutoPyPlusPlus import extension_paths_loader
+
+
+@pytest.fixture(autouse=True)
+def fresh_toolchain_cache():
+    # Tests patchen shutil.which/INI-Pfade -> keine Ergebnisse aus anderen Tests wiederverwenden
+    extension_paths_loader.clear_toolchain_cache()
+    yield
+    extension_paths_loader.clear_toolchain_cache()
 
 # Universelle Project-Klasse für alle Compiler
 class Project:
@@ -97,6 +106,21 @@ class Project:
         for k, v in kwargs.items():
             setattr(self, k, v)
 
+def popen_from_run(fake_run):
+    """Backends streamen über process_runner (Popen); liefert fake_run-Ergebnisse als Pipe-Inhalt."""
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            res = fake_run(cmd, capture_output=True, text=True, check=False)
+            self.args = cmd
+            self.stdout = io.StringIO(res.stdout or "")
+            self.stderr = io.StringIO(res.stderr or "")
+            self.returncode = res.returncode
+        def wait(self, timeout=None):
+            return self.returncode
+        def kill(self):
+            pass
+    return FakePopen
+
 # ------------------ CPA (PyInstaller) ------------------
 def make_dummy_project_cpa(tmp_path):
     script_file = tmp_path / "testscript.py"
@@ -127,6 +151,25 @@ def test_build_command_cpa_minimal(tmp_path, monkeypatch):
     assert "--noconsole" in commands
     assert any(cmd.startswith("--distpath=") for cmd in commands)
 
+def test_pyinstaller_job_isolation_and_promote(tmp_path):
+    log_file = io.StringIO()
+    out = tmp_path / "dist"
+    job = CPA0000000._make_job_dir(out, "My App")
+    cmd = CPA0000000.isolate_command(["pyinstaller", "a.py", f"--distpath={out}"], job)
+    assert f"--distpath={job / 'dist'}" in cmd and f"--distpath={out}" not in cmd
+    assert f"--workpath={job / 'work'}" in cmd and f"--specpath={job / 'spec'}" in cmd
+    # vorhandener Ausgabeordner wird atomar ersetzt
+    (out / "MyApp").mkdir(parents=True)
+    (out / "MyApp" / "stale.txt").write_text("old")
+    (job / "dist" / "MyApp").mkdir()
+    (job / "dist" / "MyApp" / "MyApp.exe").write_text("new")
+    assert CPA0000000._promote(job / "dist", out, log_file) == [out / "MyApp"]
+    assert sorted(p.name for p in (out / "MyApp").iterdir()) == ["MyApp.exe"]
+    assert [p.name for p in out.iterdir()] == ["MyApp"]
+    (job / "spec" / "MyApp.spec").write_text("a = Analysis([])")
+    CPA0000000._promote_spec(job / "spec", tmp_path, log_file)  # überlebt das Aufräumen des Job-Ordners
+    assert (tmp_path / "MyApp.spec").read_text() == "a = Analysis([])"
+
 # ------------------ CPB (PyArmor) ------------------
 def make_dummy_project_cpb(tmp_path):
     script_file = tmp_path / "dummyscript.py"
@@ -157,7 +200,7 @@ def test_run_pyarmor_build_command(tmp_path, monkeypatch):
         fake.stderr = ""
         fake.returncode = 0
         return fake
-    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("subprocess.Popen", popen_from_run(fake_run))
     CPB0000000.run_pyarmor(project, log_file)
     out = log_file.getvalue()
     assert "Running PyArmor command:" in out
@@ -215,7 +258,7 @@ def test_run_nuitka_build_command(tmp_path, monkeypatch):
         fake.stderr = ""
         fake.returncode = 0
         return fake
-    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("subprocess.Popen", popen_from_run(fake_run))
     CPC0000000.run_nuitka(project, log_file)
     out = log_file.getvalue()
     assert "Nuitka-Befehl wird ausgeführt:" in out
@@ -276,7 +319,7 @@ def test_run_cython_build_command(tmp_path, monkeypatch):
         fake.stderr = ""
         fake.returncode = 0
         return fake
-    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("subprocess.Popen", popen_from_run(fake_run))
     CPD0000000.run_cython(project, log_file)
     out = log_file.getvalue()
     assert "Cython-Befehl wird ausgeführt:" in out
@@ -307,6 +350,7 @@ def make_dummy_project_cpe(tmp_path):
 def test_run_cpp_build_command(tmp_path, monkeypatch):
     log_file = io.StringIO()
     project = make_dummy_project_cpe(tmp_path)
+    project.cpp_incremental = False  # ein g++-Aufruf für alle Quellen
     monkeypatch.setattr(
         "AutoPyPlusPlus.CPE0000000.load_extensions_paths",
         lambda log: {}
@@ -331,9 +375,772 @@ def test_run_cpp_build_command(tmp_path, monkeypatch):
         fake.stderr = ""
         fake.returncode = 0
         return fake
-    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("subprocess.Popen", popen_from_run(fake_run))
     CPE0000000.run_cpp(project, log_file)
     out = log_file.getvalue()
     assert "C++-Befehl wird ausgeführt:" in out
     assert "C++ OK" in out
     assert "Fertig. Ausgabedatei:" in out
+
+# ------------------ Scheduler (DAG) ------------------
+from AutoPyPlusPlus.scheduler import BuildGraph, DagScheduler, DONE, SKIPPED
+
+def test_dag_scheduler_order_skip_and_critical_path():
+    graph = BuildGraph()
+    graph.add_node("armor")
+    graph.add_node("bundle", deps=["armor"])
+    graph.add_node("docs")
+    graph.add_node("broken")
+    graph.add_node("after_broken", deps=["broken"])
+    started = []
+
+    def worker(node):
+        if node.name == "bundle":
+            assert "armor" in started
+        started.append(node.name)
+        return "Error: boom" if node.name == "broken" else f"{node.name} done"
+
+    report = DagScheduler(graph, worker, max_workers=3).run()
+    states = {n.name: n.state for n in report.nodes}
+    assert states["bundle"] == DONE
+    assert states["after_broken"] == SKIPPED
+    assert "after_broken" not in started
+    assert report.critical_path[-1] in graph.nodes
+
+def test_dag_cycle_detected():
+    graph = BuildGraph()
+    graph.add_node("a", deps=["b"])
+    graph.add_node("b", deps=["a"])
+    with pytest.raises(ValueError):
+        graph.validate()
+
+# ------------------ Build-Cache ------------------
+from AutoPyPlusPlus.buildcache import BuildCache, compute_cache_key
+from AutoPyPlusPlus.project import Project as RealProject
+
+def test_build_cache_key_restore_and_lru(tmp_path):
+    src = tmp_path / "app.py"
+    src.write_text("import helper\n")
+    (tmp_path / "helper.py").write_text("X = 1\n")
+    proj = RealProject(script=str(src), name="app")
+    key1 = compute_cache_key(proj, ["nuitka"], {"nuitka": ["nuitka", "--onefile"]})
+    assert key1 == compute_cache_key(proj, ["nuitka"], {"nuitka": ["nuitka", "--onefile"]})
+    (tmp_path / "helper.py").write_text("X = 2\n")  # lokaler Import gehört zum Key
+    assert compute_cache_key(proj, ["nuitka"], {"nuitka": ["nuitka", "--onefile"]}) != key1
+
+    cache = BuildCache(root=tmp_path / "cache", max_mb=1)
+    artifact = tmp_path / "dist" / "app.bin"
+    artifact.parent.mkdir()
+    artifact.write_bytes(b"a" * 600_000)
+    cache.store("k1", [artifact])
+    artifact.unlink()
+    assert cache.restore("k1") and artifact.read_bytes() == b"a" * 600_000
+    other = tmp_path / "dist" / "other.bin"
+    other.write_bytes(b"b" * 600_000)
+    cache.store("k2", [other])  # > 1 MB -> ältester Eintrag fliegt raus
+    assert not cache.restore("k1")
+    assert cache.restore("k2")
+
+def test_build_cache_parallel_projects_sharing_dist(tmp_path, monkeypatch):
+    import threading
+    from AutoPyPlusPlus import compiler as comp
+    from AutoPyPlusPlus.process_runner import report_artifacts
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    both_running = threading.Barrier(2, timeout=5)  # beide Builds gleichzeitig in dist
+
+    def fake_stages(project, log_file, *args):
+        both_running.wait()
+        (dist / f"{project.name}.exe").write_text(project.name)
+        both_running.wait()
+        if project.name == "a":
+            report_artifacts("pyinstaller", dist / "a.exe")
+        return True
+
+    monkeypatch.setattr(comp, "_run_compile_stages", fake_stages)
+    monkeypatch.setattr(comp, "_cache_key", lambda project, routes: "key-" + project.name)
+    cache = BuildCache(root=tmp_path / "cache")
+    projects = [RealProject(script=str(tmp_path / f"{n}.py"), name=n) for n in ("a", "b")]
+    logs = {p.name: io.StringIO() for p in projects}
+    threads = [threading.Thread(target=comp.compile_single, args=(p, logs[p.name], "pyinstaller"), kwargs={"cache": cache})
+               for p in projects]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    entries = cache._load()["entries"]
+    assert [Path(f).name for f in entries["key-a"]["files"]] == ["a.exe"]  # b.exe gehört nicht dazu
+    assert "key-b" not in entries and "outputs unknown for: pyinstaller" in logs["b"].getvalue()
+
+# ------------------ Resource-Budget ------------------
+from AutoPyPlusPlus.resources import ResourceBudget
+
+def test_resource_budget_slots_and_nuitka_job_split():
+    projects = {f"n{i}": RealProject(script=f"n{i}.py", name=f"n{i}") for i in range(4)}
+    for p in projects.values():
+        p.nuitka_jobs = 16
+    projects.update({f"m{i}": RealProject(script=f"m{i}.py", name=f"m{i}") for i in range(8)})
+    graph = BuildGraph()
+    for name, p in projects.items():
+        graph.add_node(name, payload=p)
+    budget = ResourceBudget(
+        cpu_total=8, mem_total_mb=None, backend_slots={"nuitka": 2},
+        backends_of=lambda p: ["nuitka"] if p.name.startswith("n") else ["mpy"],
+    )
+    budget.expect(projects.values())
+    seen = {"nuitka": 0, "peak": 0}
+    lock = __import__("threading").Lock()
+
+    def worker(node):
+        if node.name.startswith("n"):
+            with lock:
+                seen["nuitka"] += 1
+                seen["peak"] = max(seen["peak"], seen["nuitka"])
+            assert node.grant == {"nuitka_jobs": 4}  # 8 Kerne / 2 Slots
+            __import__("time").sleep(0.02)
+            with lock:
+                seen["nuitka"] -= 1
+        return f"{node.name} done"
+
+    report = DagScheduler(graph, worker, max_workers=budget.max_concurrency(), resources=budget).run()
+    assert all(n.state == DONE for n in report.nodes)
+    assert seen["peak"] <= 2
+
+# ------------------ Streaming-Runner ------------------
+import sys
+from AutoPyPlusPlus.process_runner import build_context, run_streaming
+
+def test_run_streaming_prefix_tail_and_progress():
+    log_file = io.StringIO()
+    script = "import sys\nfor i in range(1, 5): print(f'[{i}/4] step')\nprint('oops', file=sys.stderr)"
+    seen = []
+    with build_context(prefix="proj", progress=seen.append):
+        res = run_streaming([sys.executable, "-c", script], log_file, tail_lines=2)
+    out = log_file.getvalue()
+    assert res.returncode == 0 and res.line_count == 5
+    assert res.stdout.splitlines() == ["[3/4] step", "[4/4] step"]
+    assert "[proj] [1/4] step" in out and "[proj] stderr: oops" in out
+    assert seen == [0.25, 0.5, 0.75, 1.0]
+
+# ------------------ LogHub (Per-Projekt-Sinks) ------------------
+import json
+from AutoPyPlusPlus.buildlog import LogHub
+
+def test_loghub_streams_prefixed_lines_and_writes_events(tmp_path):
+    log_path = tmp_path / "build.log"
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        hub = LogHub(log_file, str(log_path) + ".events.jsonl")
+        a, b = hub.sink("a"), hub.sink("b")
+        hub.begin("a"); hub.begin("b")
+        a.write("a1\n"); b.write("b1\n"); a.write("### ERROR: ka"); b.write("[12:00:00] [b] b2\n")
+        hub.sync()
+        live = log_path.read_text(encoding="utf-8")  # vor end(): schon im Log
+        a.write("putt\n")
+        hub.end("b", state="done")
+        hub.main.write("between\n")
+        hub.end("a", state="failed")
+        hub.close()
+    assert live.splitlines()[-3:] == ["[a] a1", "[b] b1", "[12:00:00] [b] b2"]
+    text = log_path.read_text(encoding="utf-8")
+    assert text.index("[b] b2") < text.index("[a] ### ERROR: kaputt") < text.index("between")
+    assert (tmp_path / "build.log.projects" / "a.log").read_text(encoding="utf-8") == "a1\n### ERROR: kaputt\n"
+    events = [json.loads(l) for l in (tmp_path / "build.log.events.jsonl").read_text().splitlines()]
+    assert {"project": "a", "kind": "error", "message": "kaputt"}.items() <= events[[e["kind"] for e in events].index("error")].items()
+    assert [e["project"] for e in events if e["kind"] == "end"] == ["b", "a"]
+
+def test_run_streaming_into_sink_skips_global_write_lock(tmp_path):
+    from AutoPyPlusPlus import process_runner
+    log_path = tmp_path / "build.log"
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        hub = LogHub(log_file)
+        with process_runner._write_lock:  # ein Sink darf den globalen Lock nicht brauchen
+            res = run_streaming([sys.executable, "-c", "print('hello')"], hub.sink("p"), timeout=30)
+        hub.close()
+    assert res.returncode == 0 and "hello" in log_path.read_text(encoding="utf-8")
+
+# ------------------ Abbruch / Timeouts ------------------
+import subprocess
+import threading
+import time
+from AutoPyPlusPlus.process_runner import BuildCancelled, CancelToken
+from AutoPyPlusPlus.scheduler import CANCELLED, FAILED
+
+def test_run_streaming_cancel_and_timeout_kill_process_tree():
+    # Kindprozess startet einen Enkel; beide müssen beendet werden
+    script = "import subprocess, sys, time\nsubprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\nprint('started', flush=True)\ntime.sleep(30)"
+    token = CancelToken()
+    threading.Timer(0.5, token.cancel, args=("stop",)).start()
+    t0 = time.monotonic()
+    with build_context(cancel=token), pytest.raises(BuildCancelled):
+        run_streaming([sys.executable, "-c", script], io.StringIO())
+    with build_context(timeouts={"nuitka": 0.5}), pytest.raises(subprocess.TimeoutExpired):
+        run_streaming([sys.executable, "-c", script], io.StringIO(), backend="nuitka")
+    assert time.monotonic() - t0 < 10
+
+def test_dag_fail_fast_cancels_queue():
+    graph = BuildGraph()
+    for name in ("bad", "b", "c"):
+        graph.add_node(name)
+    token = CancelToken()
+    report = DagScheduler(
+        graph, lambda n: "Error: boom" if n.name == "bad" else f"{n.name} done",
+        max_workers=1, cancel=token, fail_fast=True,
+    ).run()
+    states = {n.name: n.state for n in report.nodes}
+    assert states == {"bad": FAILED, "b": CANCELLED, "c": CANCELLED}
+    assert token.cancelled and "bad" in token.reason
+
+# ------------------ Retry-Policy ------------------
+from AutoPyPlusPlus.retry import RetryPolicy, run_with_retry, TRANSIENT, PERMANENT
+
+def test_retry_only_transient_failures():
+    policy = RetryPolicy(max_attempts=3, base_delay_s=0.0)
+    err = subprocess.CalledProcessError(1, ["pyinstaller"], stderr="PermissionError: [Errno 13] Permission denied in _append_data_to_exe")
+    assert policy.classify(err)[0] == TRANSIENT
+    assert policy.classify(ValueError("syntax error"))[0] == PERMANENT
+
+    calls, attempts, log = [], {}, io.StringIO()
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise err
+        return "ok"
+    assert run_with_retry("pyinstaller", flaky, policy, log.write, attempts) == "ok"
+    assert attempts == {"pyinstaller": 3} and "retry 1/2" in log.getvalue()
+
+    def broken():
+        calls.append(1)
+        raise ValueError("syntax error")
+    calls.clear()
+    with pytest.raises(ValueError):
+        run_with_retry("nuitka", broken, policy, log.write, attempts)
+    assert len(calls) == 1
+
+
+# ------------------ CPH (mpy-cross) ------------------
+from AutoPyPlusPlus.CPH0000000 import CPH0000000
+
+def _fake_mpy_cross(tmp_path):
+    tool = tmp_path / "mpy-cross"
+    tool.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        "a = sys.argv[1:]\n"
+        "src = open(a[-1]).read()\n"
+        "time.sleep(0.05 * src.count('#'))\n"
+        "if 'BAD' in src:\n"
+        "    sys.stderr.write('SyntaxError: BAD\\n'); sys.exit(1)\n"
+        "open(a[a.index('-o') + 1], 'w').write(' '.join(a))\n"
+    )
+    tool.chmod(0o755)
+    return tool
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shebang script as mpy-cross")
+def test_mpycross_incremental_only_rebuilds_stale(tmp_path):
+    src = tmp_path / "fw"
+    (src / "lib").mkdir(parents=True)
+    (src / "main.py").write_text("print(1)")
+    (src / "lib" / "drv.py").write_text("x = 1")
+    project = RealProject(script="", name="fw")
+    project.mpy_cross_path = str(_fake_mpy_cross(tmp_path))
+    project.mpy_compile_dir = str(src)
+    project.mpy_output_dir = str(tmp_path / "out")
+
+    def run():
+        log = io.StringIO()
+        CPH0000000.run_mpycross(project, log)
+        return log.getvalue()
+
+    assert "Compiled 2 file(s)" in run()
+    assert "Compiled 0 file(s) with mpy-cross, 2 up to date" in run()
+    (src / "lib" / "drv.py").write_text("x = 2")
+    assert "Compiled 1 file(s)" in run()
+    project.mpy_opt = 2  # Flags geändert -> alles neu
+    assert "Compiled 2 file(s)" in run()
+    assert "-O2" in (tmp_path / "out" / "main.mpy").read_text()
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shebang script as mpy-cross")
+def test_mpycross_parallel_ordered_log_and_aggregated_errors(tmp_path):
+    src = tmp_path / "fw"
+    src.mkdir()
+    # a ist am langsamsten, trotzdem steht es zuerst im Log
+    (src / "a.py").write_text("####")
+    (src / "b.py").write_text("BAD")
+    (src / "c.py").write_text("x = 1")
+    project = RealProject(script="", name="fw")
+    project.mpy_cross_path = str(_fake_mpy_cross(tmp_path))
+    project.mpy_compile_dir = str(src)
+    project.mpy_jobs = 3
+
+    log = io.StringIO()
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        CPH0000000.run_mpycross(project, log)
+    text = log.getvalue()
+    assert "on 3 worker(s)" in text and "failed for 1 of 3 file(s)" in text
+    pos = [text.index(f"mpy-cross compiling: {src / n}") for n in ("a.py", "b.py", "c.py")]
+    assert pos == sorted(pos)
+    assert "SyntaxError: BAD" in exc.value.stderr
+    assert (src / "a.mpy").is_file() and (src / "c.mpy").is_file()
+
+    (src / "b.py").write_text("y = 2")
+    log = io.StringIO()
+    CPH0000000.run_mpycross(project, log)
+    assert "Compiled 1 file(s) with mpy-cross, 2 up to date" in log.getvalue()
+
+
+# ------------------ Toolchain-Cache ------------------
+import os
+
+def test_extensions_paths_memoized_until_ini_changes(tmp_path, monkeypatch):
+    tools = tmp_path / "tools"
+    tools.mkdir()
+    (tools / "pyinstaller").write_text("")
+    (tools / "cython").write_text("")
+    ini = tmp_path / "extensions_path.ini"
+    ini.write_text(f"[paths]\npyinstaller = {tools / 'pyinstaller'}\ncython = {tools}\n")
+    monkeypatch.setattr(extension_paths_loader, "_INI_FILE", ini)
+    calls = []
+    real = extension_paths_loader._load_extensions_paths_uncached
+    monkeypatch.setattr(
+        extension_paths_loader, "_load_extensions_paths_uncached",
+        lambda path, log=None: calls.append(path) or real(path, log),
+    )
+
+    first = extension_paths_loader.load_extensions_paths(None)
+    log = io.StringIO()
+    assert extension_paths_loader.load_extensions_paths(log) == first
+    assert len(calls) == 1 and "cached" in log.getvalue()
+    # Verzeichnis-Eintrag wird zum Executable aufgelöst
+    assert first["cython"] == str(tools / "cython")
+
+    ini.write_text(f"[paths]\npyinstaller = {tools / 'pyinstaller'}\n")
+    os.utime(ini, ns=(time.time_ns() + 10**9,) * 2)
+    assert "cython" not in extension_paths_loader.load_extensions_paths(None)
+    assert len(calls) == 2
+
+
+# ------------------ Probe-Cache ------------------
+from AutoPyPlusPlus.probecache import ProbeCache
+
+def test_probe_cache_persists_and_tracks_interpreter(tmp_path):
+    exe = tmp_path / "python.exe"
+    exe.write_text("v1")
+    calls = []
+    def probe():
+        calls.append(1)
+        return {"ok": True, "version": "9.0"}
+
+    cache = ProbeCache(tmp_path / "probes.json")
+    assert cache.get(str(exe), "module:pyarmor.cli", probe) == ({"ok": True, "version": "9.0"}, False)
+    # neue Sitzung: aus der Datei
+    again = ProbeCache(tmp_path / "probes.json")
+    assert again.get(str(exe), "module:pyarmor.cli", probe)[1] is True
+    assert len(calls) == 1
+
+    exe.write_text("v2 (upgraded)")
+    assert again.get(str(exe), "module:pyarmor.cli", probe)[1] is False
+    assert len(calls) == 2
+
+    # fehlgeschlagene Proben werden nicht gespeichert
+    missing = lambda: calls.append(1) or {"ok": False}
+    for _ in range(2):
+        again.get(str(exe), "module:nuitka", missing, keep=lambda r: r["ok"])
+    assert len(calls) == 4
+
+
+# ------------------ Cython inkrementell ------------------
+from AutoPyPlusPlus.CPD0000000 import cython_dependencies
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shebang script as cython")
+def test_cython_incremental_tracks_pxd_pxi_and_directives(tmp_path):
+    pkg = tmp_path / "num"
+    (pkg / "core").mkdir(parents=True)
+    (pkg / "core" / "__init__.pxd").write_text("")
+    (pkg / "core" / "vec.pxd").write_text("cdef double dot(double a, double b)")
+    (pkg / "consts.pxi").write_text("DEF N = 3")
+    (pkg / "unused.pxd").write_text("")
+    pyx = pkg / "fast.pyx"
+    pyx.write_text('include "consts.pxi"\nfrom core cimport vec\ncimport libc.math\n')
+    deps = {p.name for p in cython_dependencies(pyx)}
+    assert deps == {"fast.pyx", "consts.pxi", "__init__.pxd", "vec.pxd"}
+
+    tool = tmp_path / "cython"
+    tool.write_text(f"#!{sys.executable}\nimport sys\na = sys.argv[1:]\nopen(a[a.index('-o') + 1], 'w').write(' '.join(a))\n")
+    tool.chmod(0o755)
+    project = RealProject(script=str(pyx), name="fast")
+    project.cython_path = str(tool)
+    project.cython_build_with_setup = False
+
+    def run():
+        log = io.StringIO()
+        CPD0000000.run_cython(project, log)
+        return "skipping cythonize" not in log.getvalue()
+
+    assert run() is True
+    assert run() is False
+    (pkg / "core" / "vec.pxd").write_text("cdef double dot(double a, double b) nogil")
+    assert run() is True
+    assert run() is False
+    project.cython_boundscheck = True
+    assert run() is True
+    project.cython_jobs = 7  # Grant des Resource-Budgets wechselt -> Stamp bleibt gültig
+    assert run() is False
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shebang script as cython")
+def test_cython_package_mode_parallel_and_aggregated_errors(tmp_path):
+    pkg = tmp_path / "num"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "sub" / "__init__.py").write_text("")
+    (pkg / "a.pyx").write_text("cimport num.sub.b")
+    (pkg / "sub" / "b.pyx").write_text("x = 1")
+    (pkg / "sub" / "b.pxd").write_text("")
+    (pkg / "sub" / "c.pyx").write_text("BAD")
+    tool = tmp_path / "cython"
+    tool.write_text(
+        f"#!{sys.executable}\nimport sys\na = sys.argv[1:]\n"
+        "if 'BAD' in open(a[-1]).read():\n    sys.stderr.write('c.pyx:1:0: undeclared name\\n'); sys.exit(1)\n"
+        "open(a[a.index('-o') + 1], 'w').write(' '.join(a))\n"
+    )
+    tool.chmod(0o755)
+    project = RealProject(script="", name="num")
+    project.cython_path = str(tool)
+    project.cython_package_dir = str(pkg)
+    project.cython_build_with_setup = False
+    project.cython_jobs = 3
+
+    root, modules = CPD0000000.package_modules(project, io.StringIO())
+    assert root == tmp_path and [m for m, _ in modules] == ["num.a", "num.sub.b", "num.sub.c"]
+
+    log = io.StringIO()
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        CPD0000000.run_cython(project, log)
+    assert "cythonize failed for 1 of 3 module(s)" in log.getvalue() and "num.sub.c" in log.getvalue()
+    assert "undeclared name" in exc.value.stderr
+
+    (pkg / "sub" / "c.pyx").write_text("y = 2")
+    log = io.StringIO()
+    CPD0000000.run_cython(project, log)
+    assert "3 Modul(e), 1 zu übersetzen" in log.getvalue()
+
+
+# ------------------ C++ inkrementell ------------------
+from AutoPyPlusPlus.CPE0000000 import get_extension_for_target, parse_depfile
+
+def test_parse_depfile_continuations_and_escaped_spaces():
+    text = "out/a.o: src/a.cpp src/my\\ dir/a.h \\\n  /usr/include/x.h\nsrc/a.h:\n"
+    assert parse_depfile(text) == ["src/a.cpp", "src/my dir/a.h", "/usr/include/x.h"]
+
+@pytest.mark.skipif(not shutil.which("g++"), reason="g++ not installed")
+def test_cpp_incremental_rebuilds_only_stale_objects(tmp_path):
+    (tmp_path / "a.h").write_text("int f();\n")
+    (tmp_path / "a.cpp").write_text('#include "a.h"\nint f() { return 3; }\n')
+    (tmp_path / "b.cpp").write_text("int g() { return 4; }\n")
+    (tmp_path / "main.cpp").write_text('#include "a.h"\nint main() { return f() == 3 ? 0 : 1; }\n')
+    project = RealProject(script="", name="demo")
+    project.cpp_path = shutil.which("g++")
+    project.cpp_compile_files = [str(tmp_path / n) for n in ("a.cpp", "b.cpp", "main.cpp")]
+    project.cpp_output_dir = str(tmp_path / "out")
+    project.cpp_jobs = 2
+    project.cpp_incremental = True
+    project.compiler_cache = "off"
+
+    def run():
+        log = io.StringIO()
+        CPE0000000.run_cpp(project, log)
+        return log.getvalue()
+
+    assert "3 of 3 translation unit(s) out of date" in run()
+    exe = tmp_path / "out" / ("demo" + get_extension_for_target("Executable", sys.platform))
+    assert subprocess.run([str(exe)]).returncode == 0
+    text = run()
+    assert "0 of 3 translation unit(s)" in text and "Link up to date" in text
+    time.sleep(0.01)
+    (tmp_path / "a.h").write_text("int f();\nint h();\n")
+    text = run()
+    assert "2 of 3 translation unit(s)" in text and "C++ stale: b.cpp" not in text
+    project.cpp_defines = ["FAST=1"]
+    assert "3 of 3 translation unit(s)" in run()
+
+
+# ------------------ Compiler-Cache ------------------
+from AutoPyPlusPlus import compilercache
+from AutoPyPlusPlus.compilercache import CompilerCacheSession, ObjectCache, parse_compile_args
+
+def test_parse_compile_args_only_single_source_compiles():
+    assert parse_compile_args(["-O2", "a.o", "b.o", "-o", "app"]) is None
+    parsed = parse_compile_args(["-O2", "-I", "inc", "-DX=1", "-c", "a.c", "-o", "a.o", "-MMD", "-MF", "a.d"])
+    assert parsed["source"] == "a.c" and parsed["output"] == "a.o"
+    # Include-Pfade/Defines wirken über den präprozessierten Quelltext, nicht über den Key
+    assert parsed["key_args"] == ["-O2"]
+    assert parsed["dep_args"] == ["-MMD", "-MF", "a.d", "-MT", "a.o"]
+
+@pytest.mark.skipif(not shutil.which("g++"), reason="g++ not installed")
+def test_local_compiler_cache_shares_objects_between_projects(tmp_path, monkeypatch):
+    cache = ObjectCache(tmp_path / "objcache")
+    monkeypatch.setattr(compilercache, "_shared", cache)
+    monkeypatch.setattr(compilercache, "which_tool", lambda *names: None)
+    session = CompilerCacheSession(cache)
+
+    def build(folder, flags=""):
+        (tmp_path / folder).mkdir(exist_ok=True)
+        src = tmp_path / folder / "vendor.cpp"
+        src.write_text("int twice(int x) { return 2 * x; }\nint main() { return twice(0); }\n")
+        project = RealProject(script="", name=folder)
+        project.cpp_path = shutil.which("g++")
+        project.cpp_compile_files = [str(src)]
+        project.cpp_compiler_flags = flags
+        project.cpp_incremental = True
+        log = io.StringIO()
+        CPE0000000.run_cpp(project, log)
+        return log.getvalue()
+
+    assert "Compiler cache hit" not in build("p1")
+    assert "Compiler cache hit" in build("p2")
+    assert session.totals() == {"local": (1, 1)}
+    build("p3", flags="-O0")
+    assert session.totals() == {"local": (1, 2)}
+
+
+@pytest.mark.skipif(not shutil.which("g++"), reason="g++ not installed")
+def test_cpp_precompiled_header_per_flag_set(tmp_path):
+    (tmp_path / "pch.h").write_text("#include <vector>\n#include <string>\n")
+    for n in ("a", "main"):
+        body = "int main() { return 0; }" if n == "main" else "std::vector<std::string> v;"
+        (tmp_path / f"{n}.cpp").write_text(body + "\n")
+    project = RealProject(script="", name="pchdemo")
+    project.cpp_path = shutil.which("g++")
+    project.cpp_compile_files = [str(tmp_path / "a.cpp"), str(tmp_path / "main.cpp")]
+    project.cpp_pch_header = str(tmp_path / "pch.h")
+    project.cpp_incremental = True
+    project.compiler_cache = "off"
+
+    def run():
+        log = io.StringIO()
+        CPE0000000.run_cpp(project, log)
+        return log.getvalue()
+
+    first = run()
+    assert "Precompiled Header wird gebaut" in first and "-include" in first
+    assert list((tmp_path / "build" / "apy-cpp" / "pchdemo" / "pch").glob("*/pch.h.gch"))
+    second = run()
+    assert "Precompiled Header aktuell" in second and "0 of 2 translation unit(s)" in second
+    time.sleep(0.01)
+    (tmp_path / "pch.h").write_text("#include <vector>\n#include <string>\n#include <map>\n")
+    third = run()
+    assert "Precompiled Header wird gebaut" in third and "2 of 2 translation unit(s)" in third
+    project.cpp_defines = ["FAST=1"]
+    assert "Precompiled Header wird gebaut" in run()
+    assert len(list((tmp_path / "build" / "apy-cpp" / "pchdemo" / "pch").iterdir())) == 2
+
+
+def test_gui_import_defers_editors_and_backends():
+    import subprocess, sys
+    pytest.importorskip("tkinter")
+    code = ("import sys, AutoPyPlusPlus.gui; "
+            "print(' '.join(m for m in sys.modules if m.startswith('AutoPyPlusPlus.')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=str(Path(__file__).resolve().parent.parent), check=True).stdout.split()
+    for deferred in ("projecteditor", "compiler", "CPA0000000", "CPE0000000", "debuginspector", "hashcheck"):
+        assert f"AutoPyPlusPlus.{deferred}" not in out
+
+
+def test_lazy_proxy_forwards_setattr_and_isinstance():
+    from AutoPyPlusPlus import compiler as comp
+    from AutoPyPlusPlus.CPA0000000 import CPA0000000
+    original = CPA0000000.__dict__["run_pyinstaller"]
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(comp.CPA0000000, "run_pyinstaller", lambda project, log: "fake")
+        assert CPA0000000.run_pyinstaller(None, None) == "fake"  # die echte Klasse ist gepatcht
+    assert CPA0000000.__dict__["run_pyinstaller"] is original  # staticmethod wiederhergestellt
+    assert isinstance(CPA0000000(), comp.CPA0000000) and issubclass(CPA0000000, comp.CPA0000000)
+
+
+def test_startupbench_parses_importtime_output():
+    from AutoPyPlusPlus.startupbench import parse_importtime
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   _io\n"
+              "import time:      2900 |      31000 | AutoPyPlusPlus.gui\n")
+    assert parse_importtime(stderr) == [("_io", 120, 120), ("AutoPyPlusPlus.gui", 2900, 31000)]
+
+
+def test_cli_build_writes_summary_and_exit_codes(tmp_path):
+    import json
+    from AutoPyPlusPlus import cli
+    from AutoPyPlusPlus.core import save_projects
+    project = RealProject(script=str(tmp_path / "app.py"), name="app")
+    project.compile_b_selected = True
+    save_projects([project], tmp_path / "p.apyscript")
+    summary = tmp_path / "summary.json"
+    argv = ["build", str(tmp_path / "p.apyscript"), "--mode", "A", "-q", "--no-config", "--summary", str(summary)]
+    assert cli.main(argv) == cli.EXIT_NOTHING
+    assert json.loads(summary.read_text(encoding="utf-8"))["projects"] == []
+    assert cli.main(["build", str(tmp_path / "missing.apyscript"), "-q", "--summary", str(summary)]) == cli.EXIT_USAGE
+    project.use_nuitka = True
+    assert cli.auto_compiler([project]) == "nuitka"
+
+
+@pytest.mark.parametrize("backend", ["auto", "poll"])
+def test_simplex_watcher_fires_once_and_writes_only_on_reset(tmp_path, backend):
+    from types import SimpleNamespace
+    from AutoPyPlusPlus.simplex_api import SimplexAPIWatcher
+    fired = []
+    var = lambda v: SimpleNamespace(get=lambda: v, set=lambda _v: None)
+    gui = SimpleNamespace(
+        master=SimpleNamespace(after=lambda ms, fn: fn()),
+        compile_mode_var=var("A"), thread_count_var=var(1), max_threads=4,
+        compile_all=lambda: fired.append(time.monotonic()), set_status=lambda *a, **k: None,
+    )
+    ini = tmp_path / "simplexAPI.ini"
+    ini.write_text("[Simplex]\nCompile_all = OFF\nAutoReset = ON\n", encoding="utf-8")
+    watcher = SimplexAPIWatcher(gui, ini, poll_interval=0.05, backend=backend)
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 2
+        while watcher.parse_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ini.write_text("[Simplex]\nCompile_all = ON\nAutoReset = ON\n", encoding="utf-8")
+        while not fired and time.monotonic() < deadline + 3:
+            time.sleep(0.01)
+        time.sleep(0.3)
+        assert len(fired) == 1
+        assert watcher.write_count == 1 and watcher.parse_count == 2
+        assert "Compile_all = OFF" in ini.read_text(encoding="utf-8")
+    finally:
+        watcher.stop()
+        watcher.join(3)
+    assert not watcher.is_alive()
+
+
+def test_logtail_reads_only_appended_bytes(tmp_path):
+    from AutoPyPlusPlus.logtail import LogTail
+    log = tmp_path / "compile_x.log"
+    log.write_bytes("line 1\r\nline 2 ä".encode("utf-8")[:-1])  # halbes UTF-8-Zeichen
+    tail = LogTail(log)
+    assert tail.read_new() == ("line 1\nline 2 ", 1, False)
+    assert not tail.changed()
+    with open(log, "ab") as f:
+        f.write("ä".encode("utf-8")[1:] + b" done\r")
+    assert tail.read_new() == ("ä done", 2, False)
+    with open(log, "ab") as f:
+        f.write(b"\nline 3\n")
+    assert tail.read_new() == ("\nline 3\n", 2, False)
+    log.write_text("new\n", encoding="utf-8")  # gekürzt -> von vorn
+    assert tail.read_new() == ("new\n", 1, True)
+
+
+def test_single_pass_highlighter_matches_per_pattern_scan():
+    import re
+    from AutoPyPlusPlus.loghighlight import KEYWORD_PATTERNS, Highlighter, synthetic_log
+    text = synthetic_log(300) + "Monkeypatch is not monkeypatch\n  E   assert 1\nab2024-01-02 2024-01-02\n"
+    result = Highlighter().scan(text, first_line=10)
+    for tag in ("warning", "info", "debug", "pytest_monkey", "success", "successfully", "failed", "pytest_fail"):
+        expected = [
+            (f"{i}.{m.start()}", f"{i}.{m.end()}")
+            for i, line in enumerate(text.splitlines(), 10)
+            for m in re.finditer(KEYWORD_PATTERNS[tag][0], line)
+        ]
+        flat = result.ranges.get(tag, [])
+        assert list(zip(flat[::2], flat[1::2])) == expected, tag
+    last = 10 + text.count("\n") - 1
+    assert result.ranges["value"][-2:] == [f"{last}.13", f"{last}.23"]
+    assert [f"{last - 1}.0", f"{last - 1}.end"] == result.ranges["pytest_trace"][-2:]
+    assert all(re.search(r"(?i)failed|error|not found", text.splitlines()[i - 10]) for i in result.error_lines)
+
+def test_line_index_windows_search_and_tail(tmp_path):
+    from AutoPyPlusPlus.logindex import LineIndex, compile_bytes_query
+    log = tmp_path / "compile_x.log"
+    lines = [f"line {i}" + (" ERROR" if i % 50 == 7 else "") for i in range(1000)]
+    log.write_bytes("\r\n".join(lines[:600]).encode("utf-8"))  # offene letzte Zeile
+    index = LineIndex(log)
+    index.CHUNK_BYTES = 256  # viele Blöcke
+    assert not index.refresh()
+    assert len(index) == 600 and index.complete_lines == 599
+    with open(log, "ab") as f:
+        f.write(("\r\n" + "\r\n".join(lines[600:]) + "\r\n").encode("utf-8"))
+    assert index.changed() and not index.refresh()
+    assert len(index) == index.complete_lines == 1000
+    assert index.lines(0, 2) == ["line 0", "line 1"]
+    assert index.lines(595, 603) == lines[595:603]
+    assert index.line_of(index.line_start(777)) == 777
+    rx = compile_bytes_query("error", regex=False, case_sensitive=False)
+    assert index.search(rx, 8) == 57
+    assert index.search(rx, 57, backwards=True) == 7
+    assert index.search(rx, 958) is None
+    log.write_text("new\n", encoding="utf-8")
+    assert index.refresh() and index.lines(0, 5) == ["new"]
+    index.close()
+
+def test_loghub_writes_line_index_sidecar(tmp_path):
+    from AutoPyPlusPlus.buildlog import LogHub, index_path_for
+    from AutoPyPlusPlus.logindex import LineIndex, read_sidecar
+    from AutoPyPlusPlus.loghighlight import Highlighter
+    log_path = tmp_path / "compile_x.log"
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write("Starting compilation\n")  # vor dem LogHub geschrieben
+        hub = LogHub(log, None, index_path_for(log))
+        hub.begin("alpha")
+        sink = hub.sink("alpha")
+        sink.write("compile_single START\n")
+        sink.event("stage", stage="nuitka")
+        sink.write("nuitka run\nerror C2065: 'x' undeclared\n" * 40)
+        hub.end("alpha", state="failed")
+        hub.main.write("--- compile_projects() END: 1 errors ---\n")
+        hub.close()
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write("after the build\n")
+
+    text = log_path.read_text(encoding="utf-8")
+    lines = text.split("\n")
+    sidecar = read_sidecar(index_path_for(log))
+    assert sidecar.lines == len(lines) - 2  # letzte Zeile kam nach dem LogHub
+    assert sidecar.errors == Highlighter().scan(text).error_lines
+    (section,) = sidecar.sections
+    assert (section["section"], section["state"]) == ("alpha", "failed")
+    assert lines[section["start"] - 1] == "===== [alpha] ====="
+    assert lines[section["end"] - 1] == "===== [alpha] end ====="
+    assert [(name, lines[i - 1]) for name, i in section["stages"]] == [("nuitka", "[alpha] nuitka run")]
+
+    index = LineIndex(log_path)
+    assert index.load_sidecar() is not None
+    index.refresh()  # indiziert nur den Rest
+    assert len(index) == len(lines) - 1 and index.lines(len(lines) - 2, len(lines)) == ["after the build"]
+    index.close()
+    log_path.write_text("replaced\n", encoding="utf-8")
+    assert LineIndex(log_path).load_sidecar() is None
+
+def test_log_search_index_incremental_and_first_seen(tmp_path):
+    from AutoPyPlusPlus.logsearch import LogSearchIndex
+    old = tmp_path / "compile_app_20250101_0900.log"
+    new = tmp_path / "compile_app_20250302_1000.log"
+    old.write_text("Starting compilation\nlink @ ok\n", encoding="utf-8")
+    new.write_text("[10:00:01] error C1083: Cannot open include file: 'io.h'\n", encoding="utf-8")
+    index = LogSearchIndex(tmp_path, tmp_path / "idx.sqlite3")
+    assert index.update() == 3
+    assert [(Path(h.path).name, h.line) for h in index.search("cannot open INCLUDE")] == [(new.name, 1)]
+    assert index.search("open cannot") == []  # alle Begriffe, aber nicht der Suchtext
+
+    with open(old, "a", encoding="utf-8") as f:
+        f.write("fatal error C1083: Cannot open include file: 'x.h'\npartial")
+    assert index.update() == 1  # nur die neue, abgeschlossene Zeile
+    first = index.first_seen("error c108")  # Wortanfang
+    assert (Path(first.path).name, first.line) == (old.name, 3)
+    assert len(index.search("C1083")) == 2
+
+    old.unlink()
+    index.update()
+    assert [Path(h.path).name for h in index.search("C1083")] == [new.name]
+    assert index.stats()["logs"] == 1
+    index.close()
+
+def test_log_search_index_line_longer_than_chunk(tmp_path, monkeypatch):
+    from AutoPyPlusPlus import logsearch
+    monkeypatch.setattr(logsearch, "_CHUNK_BYTES", 64)
+    log = tmp_path / "compile_app_20250101_0900.log"
+    long_line = "scons " + " ".join(f"-Iinclude{i}" for i in range(40)) + " gcc_marker\n"
+    log.write_text("first\n" + long_line + "after the long line\n", encoding="utf-8")
+    index = logsearch.LogSearchIndex(tmp_path, tmp_path / "idx.sqlite3")
+    assert index.update() == 3
+    assert [h.line for h in index.search("gcc_marker")] == [2]
+    assert [h.line for h in index.search("after the long")] == [3]
+    index.close()